@@ -0,0 +1,114 @@
+# assignment/assignment.py
+
+from cost_matrix.cost_matrix import SparseCosts
+from instrumentation.instrumentation import record_counters
+from transport_solution.transport_solution import TransportSolution
+
+INF = float('inf')
+
+
+def assignment_method(costs, supply, demand):
+    """
+    Resuelve de forma exacta un problema de transporte con ofertas y demandas
+    enteras pequeñas como un problema de asignación: cada unidad de oferta es una
+    fila y cada unidad de demanda una columna de una matriz cuadrada (ver
+    transport_core.is_assignment_instance), que se resuelve con el método húngaro
+    de caminos de aumento más cortos en O(N³), con N la oferta total. Las
+    unidades que van del mismo proveedor al mismo consumidor se suman, así que el
+    resultado no tiene asignaciones nulas.
+
+    Parámetros:
+        costs (list of list of float o SparseCosts): Matriz de costos; las rutas
+            que faltan en una SparseCosts no se usan.
+        supply (list of int): Oferta de cada proveedor.
+        demand (list of int): Demanda de cada consumidor (el total igual al de la oferta).
+
+    Retorna:
+        allocations (TransportSolution): Asignaciones; se itera como tuplas ((proveedor, consumidor), cantidad).
+    """
+    if sum(supply) != sum(demand):
+        raise ValueError("La oferta y la demanda no están balanceadas.")
+    row_units = [i for i, s in enumerate(supply) for _ in range(s)]
+    col_units = [j for j, d in enumerate(demand) for _ in range(d)]
+    # Fila de costos expandida de cada proveedor (las unidades de un proveedor la comparten)
+    rows = {}
+    for i in set(row_units):
+        if isinstance(costs, SparseCosts):
+            row = [INF] * len(demand)
+            for j, c in zip(*costs.row(i)):
+                row[j] = c
+        else:
+            row = costs[i]
+        rows[i] = [row[j] for j in col_units]
+    assigned_column, steps = hungarian([rows[i] for i in row_units])
+
+    quantities = {}
+    for unit, k in enumerate(assigned_column):
+        cell = (row_units[unit], col_units[k])
+        quantities[cell] = quantities.get(cell, 0) + 1
+    record_counters(iterations=steps, cells_examined=steps * len(col_units))
+    return TransportSolution.from_allocations(sorted(quantities.items()), len(supply), len(demand))
+
+def hungarian(cost_rows):
+    """
+    Método húngaro en su versión de caminos de aumento más cortos con potenciales,
+    O(n²·m), sobre una matriz de n filas y m >= n columnas: cada fila se agrega
+    con una búsqueda tipo Dijkstra sobre los costos reducidos. Las celdas con
+    costo infinito no se usan.
+
+    Retorna (columna asignada a cada fila, pasos de búsqueda de camino).
+    """
+    num_rows = len(cost_rows)
+    num_cols = len(cost_rows[0]) if num_rows else 0
+    if num_cols < num_rows:
+        raise ValueError("La matriz de asignación necesita al menos tantas columnas como filas.")
+    # Índices desde 1; la columna 0 es la raíz ficticia de cada búsqueda
+    u = [0] * (num_rows + 1)
+    v = [0] * (num_cols + 1)
+    owner = [0] * (num_cols + 1)  # owner[j]: fila asignada a la columna j (0 si ninguna)
+    way = [0] * (num_cols + 1)
+    steps = 0
+    for row in range(1, num_rows + 1):
+        owner[0] = row
+        j0 = 0
+        min_reduced = [INF] * (num_cols + 1)
+        used = [False] * (num_cols + 1)
+        while True:
+            steps += 1
+            used[j0] = True
+            i0 = owner[j0]
+            costs_i0 = cost_rows[i0 - 1]
+            u_i0 = u[i0]
+            delta = INF
+            j1 = 0
+            for j in range(1, num_cols + 1):
+                if not used[j]:
+                    current = costs_i0[j - 1] - u_i0 - v[j]
+                    if current < min_reduced[j]:
+                        min_reduced[j] = current
+                        way[j] = j0
+                    if min_reduced[j] < delta:
+                        delta = min_reduced[j]
+                        j1 = j
+            if delta == INF:
+                raise ValueError("El problema no es factible con las rutas permitidas.")
+            for j in range(num_cols + 1):
+                if used[j]:
+                    u[owner[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_reduced[j] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        # Invertir el camino de aumento
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+
+    assigned_column = [0] * num_rows
+    for j in range(1, num_cols + 1):
+        if owner[j]:
+            assigned_column[owner[j] - 1] = j - 1
+    return assigned_column, steps
@@ -0,0 +1,72 @@
+# assignment/test_assignment.py
+
+import itertools
+import random
+
+import pytest
+
+from assignment.assignment import assignment_method, hungarian
+from benchmarks.instance_generators import forbid_routes, small_instance
+from cost_matrix.cost_matrix import SparseCosts
+from instrumentation.instrumentation import measure_solve
+from transport_core.transport_core import calculate_cost, get_method, is_assignment_instance, solve_method
+
+
+def test_hungarian_matches_brute_force():
+    rng = random.Random(1)
+    for _ in range(200):
+        rows = rng.randint(1, 5)
+        cols = rng.randint(rows, 6)
+        cost_rows = [[rng.randint(0, 30) for _ in range(cols)] for _ in range(rows)]
+        assigned_column, _ = hungarian(cost_rows)
+        assert len(set(assigned_column)) == rows
+        best = min(sum(cost_rows[r][c] for r, c in enumerate(columns))
+                   for columns in itertools.permutations(range(cols), rows))
+        assert sum(cost_rows[r][c] for r, c in enumerate(assigned_column)) == best
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_network_simplex(seed):
+    rng = random.Random(seed)
+    network_simplex = get_method("network_simplex")
+    modified_distribution = get_method("modified_distribution")
+    for _ in range(150):
+        costs, supply, demand = small_instance(rng, max_quantity=4)
+        alloc = assignment_method(costs, supply, demand)
+        assert alloc.row_totals() == supply
+        assert alloc.col_totals() == demand
+        assert all(quantity > 0 for _, quantity in alloc)
+        cost = calculate_cost(alloc, costs)
+        assert cost == calculate_cost(network_simplex(costs, supply, demand), costs)
+        assert cost == calculate_cost(modified_distribution(costs, supply, demand), costs)
+
+
+def test_sparse_matches_network_simplex():
+    rng = random.Random(8)
+    network_simplex = get_method("network_simplex")
+    for _ in range(300):
+        dense, supply, demand = small_instance(rng, max_quantity=4)
+        costs = SparseCosts.from_dense(forbid_routes(rng, dense))
+        try:
+            expected = calculate_cost(network_simplex(costs, supply, demand), costs)
+        except ValueError:
+            with pytest.raises(ValueError):
+                assignment_method(costs, supply, demand)
+            continue
+        alloc = assignment_method(costs, supply, demand)
+        assert all(costs.get(i, j) is not None for (i, j), _ in alloc)
+        assert calculate_cost(alloc, costs) == expected
+
+
+def test_measure_solve_records_solver():
+    costs = [[4, 1, 3], [2, 0, 5], [3, 2, 2]]
+    supply, demand = [1, 1, 1], [1, 1, 1]
+    assert is_assignment_instance(supply, demand)
+    for method in ("network_simplex", "modified_distribution"):
+        result = measure_solve(method, costs, supply, demand)
+        assert result["stats"]["method"] == method
+        assert result["stats"]["solver"] == "assignment"
+        assert result["cost"] == solve_method(method, costs, supply, demand)["cost"] == 5
+    result = measure_solve("network_simplex", costs, [10, 10, 10], [10, 10, 10])
+    assert result["stats"]["solver"] == "network_simplex"
+    assert measure_solve("vogel", costs, supply, demand)["stats"]["solver"] == "vogel"
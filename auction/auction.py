@@ -0,0 +1,323 @@
+# auction/auction.py
+
+import heapq
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from operator import add
+
+from cost_matrix.cost_matrix import SparseCosts
+from instrumentation.instrumentation import record_counters
+from transport_solution.transport_solution import TransportSolution
+
+# Tolerancia relativa para considerar asignada toda la oferta con cantidades fraccionarias
+EPSILON = 1e-9
+
+INF = float('inf')
+
+DEFAULT_EPSILON_FACTOR = 5
+# Proveedores por lote de pujas cuando la fase de pujas se reparte entre procesos
+DEFAULT_BATCH_SIZE = 256
+
+
+def auction_method(costs, supply, demand):
+    """
+    Implementación del Método de Subasta con escalado de épsilon para el Problema de Transporte.
+
+    Parámetros:
+        costs (list of list of float o SparseCosts): Matriz de costos.
+        supply (list of float): Oferta de cada proveedor.
+        demand (list of float): Demanda de cada consumidor.
+
+    Retorna:
+        allocations (TransportSolution): Asignaciones; se itera como tuplas ((proveedor, consumidor), cantidad).
+    """
+    return auction_solve(costs, supply, demand)["alloc"]
+
+def auction_solve(costs, supply, demand, epsilon_factor=DEFAULT_EPSILON_FACTOR, initial_epsilon=None,
+                  final_epsilon=None, workers=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Resuelve el problema de transporte con el algoritmo de subasta (Bertsekas) y
+    escalado de épsilon.
+
+    Cada consumidor j tiene un precio p_j por unidad. En cada ronda, todos los
+    proveedores con oferta sin asignar pujan a la vez (estilo Jacobi): el
+    proveedor i elige el consumidor j de menor c_ij + p_j y ofrece pagar p_j más
+    la diferencia con su segunda mejor opción más épsilon. Cada consumidor se
+    queda con las pujas más altas hasta cubrir su demanda y devuelve el resto; su
+    precio es la menor puja aceptada cuando está lleno. Al terminar una fase toda
+    asignación cumple c_ij + p_j <= min_k (c_ik + p_k) + épsilon; la fase
+    siguiente conserva los precios y las asignaciones que siguen cumpliendo esa
+    condición con el nuevo épsilon (epsilon_factor veces menor) y devuelve las
+    demás a sus proveedores. Con costos enteros la última fase usa épsilon < 1/(m + n),
+    que garantiza el óptimo; con costos fraccionarios la solución está a lo sumo
+    a (oferta total)·final_epsilon del óptimo.
+
+    Las pujas de una ronda no dependen entre sí: se calculan por lotes de
+    batch_size proveedores y, con workers > 1, los lotes se reparten entre
+    procesos (conviene solo con matrices grandes, porque cada ronda envía los
+    precios a los procesos).
+
+    Parámetros:
+        costs (list of list of float o SparseCosts): Matriz de costos.
+        supply (list of float): Oferta de cada proveedor.
+        demand (list of float): Demanda de cada consumidor.
+        epsilon_factor (float): Razón entre dos épsilon consecutivos (mayor que 1).
+        initial_epsilon (float, opcional): Épsilon de la primera fase (por defecto,
+            la mitad del rango de costos).
+        final_epsilon (float, opcional): Épsilon de la última fase.
+        workers (int, opcional): Procesos para la fase de pujas (por defecto, ninguno).
+        batch_size (int): Proveedores por lote de pujas.
+
+    Retorna:
+        dict: "alloc" (TransportSolution), "u" y "v" (potenciales, con costo reducido
+        c_ij - u_i - v_j >= 0 y v_j = -p_j), "prices", "epsilon_schedule" (épsilon de
+        cada fase) y "phases" (por fase: "epsilon", "rounds", "bids", "reassigned"
+        con la cantidad devuelta a los proveedores, y "round_bids", las pujas de cada ronda).
+    """
+    num_supply, num_demand = len(supply), len(demand)
+    total_supply = sum(supply)
+    if abs(total_supply - sum(demand)) > EPSILON * max(1, abs(total_supply)):
+        raise ValueError("La oferta y la demanda no están balanceadas.")
+    if epsilon_factor <= 1:
+        raise ValueError("epsilon_factor debe ser mayor que 1.")
+    integral = all(isinstance(x, int) for x in supply) and all(isinstance(x, int) for x in demand)
+    tolerance = 0 if integral else EPSILON * max(1, abs(total_supply))
+
+    all_lines = _cost_lines(costs, num_supply, num_demand)
+    # Un consumidor sin demanda rechazaría todas las pujas sin subir su precio: no entra en la subasta
+    lines = _positive_demand_lines(all_lines, demand, tolerance)
+    low = min((min(values) for _, values in all_lines if len(values)), default=0)
+    high = max((max(values) for _, values in all_lines if len(values)), default=0)
+    cost_range = high - low
+    integer_costs = all(float(c).is_integer() for _, values in all_lines for c in values)
+    if final_epsilon is None:
+        final_epsilon = 1 / (num_supply + num_demand + 1) if integer_costs else 1e-6 * max(1, cost_range)
+    if initial_epsilon is None:
+        initial_epsilon = max(cost_range / 2, final_epsilon)
+    schedule = _epsilon_schedule(initial_epsilon, final_epsilon, epsilon_factor)
+
+    prices = [0.0] * num_demand
+    phases = []
+    executor = None
+    if workers is not None and workers > 1 and num_supply > batch_size:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(lines,))
+    held = None
+    try:
+        for epsilon in schedule:
+            held, phase = _auction_phase(lines, supply, demand, prices, epsilon, cost_range,
+                                         tolerance, executor, batch_size, held)
+            phases.append(phase)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    allocations = TransportSolution(num_supply, num_demand, integral)
+    for j, bids in enumerate(held):
+        # Un proveedor puede tener varias pujas aceptadas en el mismo consumidor
+        amounts = {}
+        for _, i, amount in bids:
+            amounts[i] = amounts.get(i, 0) + amount
+        for i in sorted(amounts):
+            if amounts[i] > tolerance:
+                allocations.append(i, j, amounts[i])
+    u = [min(_reduced_totals(columns, values, prices), default=0.0) for columns, values in lines]
+    # Precio de los consumidores sin demanda: el menor que deja sus costos reducidos no negativos
+    for j, d in enumerate(demand):
+        if d <= tolerance:
+            prices[j] = 0.0
+    for i, (columns, values) in enumerate(all_lines):
+        for j, c in (enumerate(values) if columns is None else zip(columns, values)):
+            if demand[j] <= tolerance and u[i] - c > prices[j]:
+                prices[j] = u[i] - c
+    record_counters(iterations=sum(phase["rounds"] for phase in phases),
+                    cells_examined=sum(phase["cells_examined"] for phase in phases))
+    return {
+        "alloc": allocations,
+        "u": u,
+        "v": [-p for p in prices],
+        "prices": prices,
+        "epsilon_schedule": schedule,
+        "phases": phases,
+    }
+
+def _cost_lines(costs, num_supply, num_demand):
+    """(columnas, costos) de cada proveedor; columns es None en una matriz densa."""
+    if isinstance(costs, SparseCosts):
+        return [(list(indices), list(data)) for indices, data in map(costs.row, range(num_supply))]
+    lines = []
+    for i in range(num_supply):
+        row = costs[i]
+        lines.append((None, [float(c) for c in row]))
+    return lines
+
+def _positive_demand_lines(lines, demand, tolerance):
+    """Las líneas de costos sin las columnas de los consumidores con demanda nula."""
+    if all(d > tolerance for d in demand):
+        return lines
+    keep = [j for j, d in enumerate(demand) if d > tolerance]
+    kept = set(keep)
+    filtered = []
+    for columns, values in lines:
+        if columns is None:
+            filtered.append((keep, [values[j] for j in keep]))
+        else:
+            pairs = [(j, c) for j, c in zip(columns, values) if j in kept]
+            filtered.append(([j for j, _ in pairs], [c for _, c in pairs]))
+    return filtered
+
+def _epsilon_schedule(initial_epsilon, final_epsilon, factor):
+    schedule = [initial_epsilon]
+    while schedule[-1] > final_epsilon:
+        schedule.append(max(schedule[-1] / factor, final_epsilon))
+    return schedule
+
+def _auction_phase(lines, supply, demand, prices, epsilon, cost_range, tolerance, executor, batch_size,
+                   held=None):
+    """
+    Una fase de la subasta con épsilon fijo, a partir de las pujas aceptadas en la
+    fase anterior (held) o de ninguna. Modifica prices. Retorna (held, estadísticas),
+    con held[j] la lista de pujas aceptadas [precio, proveedor, cantidad] del consumidor j.
+    """
+    num_demand = len(demand)
+    phase = {"epsilon": epsilon, "rounds": 0, "bids": 0, "reassigned": 0, "cells_examined": 0, "round_bids": []}
+    if held is None:
+        held = [[] for _ in range(num_demand)]
+        filled = [0] * num_demand
+        unassigned = list(supply)
+    else:
+        held, filled, unassigned = _keep_consistent(lines, supply, prices, epsilon, held, phase)
+    # Un proveedor sin segunda opción sube el precio como si la tuviera a cost_range + épsilon
+    single_gap = cost_range + epsilon
+    # Cota de la subida de precios en una fase; superarla indica rutas insuficientes
+    price_limit = max(prices, default=0) + 2 * (len(supply) + num_demand) * (cost_range + epsilon) + 1
+
+    # Proveedores con oferta sin asignar; solo cambian los que pujan y los rechazados
+    active = {i for i, amount in enumerate(unassigned) if amount > tolerance}
+    while active:
+        bidders = sorted(active)
+        active.clear()
+        bids = _compute_bids(lines, prices, [(i, unassigned[i]) for i in bidders], epsilon, single_gap,
+                             executor, batch_size)
+        phase["rounds"] += 1
+        phase["bids"] += len(bids)
+        phase["round_bids"].append(len(bids))
+        phase["cells_examined"] += sum(len(lines[i][1]) for i in bidders)
+
+        incoming = {}
+        for i, j, price, amount in bids:
+            if j is None:
+                raise ValueError(f"El proveedor {i} no tiene rutas permitidas.")
+            if price > price_limit:
+                raise ValueError("El problema no es factible con las rutas permitidas.")
+            incoming.setdefault(j, []).append([price, i, amount])
+        for i in bidders:
+            unassigned[i] = 0
+
+        for j, new_bids in incoming.items():
+            # Lo que el proveedor ya tenía en j pasa a su nueva puja, para que no se desplace a sí mismo
+            raised = {bid[1]: bid[0] for bid in new_bids}
+            for bid in held[j]:
+                if bid[1] in raised:
+                    bid[0] = raised[bid[1]]
+            bids_j = held[j] + new_bids
+            total = filled[j] + sum(bid[2] for bid in new_bids)
+            if total <= demand[j] + tolerance:
+                held[j] = bids_j
+                filled[j] = total
+            else:
+                # Orden estable: a igual precio se conservan las pujas que ya tenía
+                bids_j.sort(key=lambda bid: -bid[0])
+                capacity = demand[j]
+                kept = []
+                for bid in bids_j:
+                    if capacity <= tolerance:
+                        rejected = bid[2]
+                    elif bid[2] <= capacity:
+                        kept.append(bid)
+                        capacity -= bid[2]
+                        continue
+                    else:
+                        rejected = bid[2] - capacity
+                        bid[2] = capacity
+                        kept.append(bid)
+                        capacity = 0
+                    unassigned[bid[1]] += rejected
+                    phase["reassigned"] += rejected
+                    if unassigned[bid[1]] > tolerance:
+                        active.add(bid[1])
+                held[j] = kept
+                filled[j] = demand[j]
+            if filled[j] >= demand[j] - tolerance and held[j]:
+                prices[j] = min(bid[0] for bid in held[j])
+    return held, phase
+
+def _keep_consistent(lines, supply, prices, epsilon, held, phase):
+    """
+    Conserva las pujas aceptadas cuya ruta sigue a menos de épsilon de la mejor
+    opción de su proveedor y devuelve el resto. Retorna (held, filled, unassigned).
+    """
+    best = [min(_reduced_totals(columns, values, prices), default=0.0) for columns, values in lines]
+    phase["cells_examined"] += sum(len(values) for _, values in lines)
+    unassigned = list(supply)
+    filled = []
+    kept_bids = []
+    for j, bids in enumerate(held):
+        kept = []
+        for bid in bids:
+            i = bid[1]
+            columns, values = lines[i]
+            c = values[j] if columns is None else values[bisect_left(columns, j)]
+            if c + prices[j] <= best[i] + epsilon:
+                kept.append(bid)
+                unassigned[i] -= bid[2]
+            else:
+                phase["reassigned"] += bid[2]
+        kept_bids.append(kept)
+        filled.append(sum(bid[2] for bid in kept))
+    return kept_bids, filled, unassigned
+
+def _compute_bids(lines, prices, bidders, epsilon, single_gap, executor, batch_size):
+    if executor is None:
+        return _bids_for(lines, prices, bidders, epsilon, single_gap)
+    batches = [bidders[k:k + batch_size] for k in range(0, len(bidders), batch_size)]
+    futures = [executor.submit(_worker_bids, prices, batch, epsilon, single_gap) for batch in batches]
+    bids = []
+    for future in futures:
+        bids.extend(future.result())
+    return bids
+
+def _bids_for(lines, prices, bidders, epsilon, single_gap):
+    """
+    Pujas (proveedor, consumidor, precio, cantidad) de un lote de pares
+    (proveedor, oferta sin asignar). Los costos más precios de cada fila se
+    calculan con map y los dos menores con heapq.nsmallest, ambos recorridos en C.
+    """
+    bids = []
+    for i, amount in bidders:
+        columns, values = lines[i]
+        totals = _reduced_totals(columns, values, prices)
+        if not totals:
+            bids.append((i, None, INF, amount))
+            continue
+        smallest = heapq.nsmallest(2, totals)
+        best = smallest[0]
+        k = totals.index(best)
+        j = k if columns is None else columns[k]
+        gap = smallest[1] - best if len(smallest) > 1 else single_gap
+        bids.append((i, j, prices[j] + gap + epsilon, amount))
+    return bids
+
+def _reduced_totals(columns, values, prices):
+    """c_ij + p_j para las rutas de un proveedor."""
+    if columns is None:
+        return list(map(add, values, prices))
+    return list(map(add, values, map(prices.__getitem__, columns)))
+
+_worker_lines = None
+
+def _init_worker(lines):
+    global _worker_lines
+    _worker_lines = lines
+
+def _worker_bids(prices, bidders, epsilon, single_gap):
+    return _bids_for(_worker_lines, prices, bidders, epsilon, single_gap)
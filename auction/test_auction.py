@@ -0,0 +1,63 @@
+# auction/test_auction.py
+
+import random
+
+import pytest
+
+from auction.auction import auction_method, auction_solve
+from benchmarks.instance_generators import forbid_routes, small_instance
+from cost_matrix.cost_matrix import SparseCosts
+from transport_core.transport_core import calculate_cost, get_method
+
+
+def test_zero_demand_does_not_hang():
+    costs = [[2, 1, 9, 3, 1, 3], [16, 16, 2, 18, 16, 18], [3, 3, 5, 17, 2, 16], [1, 11, 0, 1, 19, 20]]
+    supply, demand = [0, 3, 2, 1], [1, 2, 0, 1, 2, 0]
+    alloc = auction_method(costs, supply, demand)
+    assert calculate_cost(alloc, costs) == calculate_cost(get_method("network_simplex")(costs, supply, demand), costs)
+    result = auction_solve([[5, 1], [1, 5]], [1, 1], [2, 0])
+    assert list(result["alloc"]) == [((0, 0), 1), ((1, 0), 1)]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_network_simplex(seed):
+    rng = random.Random(seed)
+    network_simplex = get_method("network_simplex")
+    for _ in range(150):
+        costs, supply, demand = small_instance(rng)
+        alloc = auction_method(costs, supply, demand)
+        assert alloc.row_totals() == supply
+        assert alloc.col_totals() == demand
+        expected = calculate_cost(network_simplex(costs, supply, demand), costs)
+        assert calculate_cost(alloc, costs) == expected
+
+
+def test_sparse_matches_network_simplex():
+    rng = random.Random(7)
+    network_simplex = get_method("network_simplex")
+    for _ in range(300):
+        dense, supply, demand = small_instance(rng)
+        costs = SparseCosts.from_dense(forbid_routes(rng, dense))
+        try:
+            expected = calculate_cost(network_simplex(costs, supply, demand), costs)
+        except ValueError:
+            with pytest.raises(ValueError):
+                auction_method(costs, supply, demand)
+            continue
+        alloc = auction_method(costs, supply, demand)
+        assert all(costs.get(i, j) is not None for (i, j), _ in alloc)
+        assert calculate_cost(alloc, costs) == expected
+
+
+def test_fractional_quantities_within_epsilon():
+    rng = random.Random(11)
+    network_simplex = get_method("network_simplex")
+    for _ in range(100):
+        costs, supply, demand = small_instance(rng, zeros=False)
+        costs = [[c + 0.25 * rng.random() for c in row] for row in costs]
+        supply = [s / 2 for s in supply]
+        demand = [d / 2 for d in demand]
+        result = auction_solve(costs, supply, demand)
+        expected = calculate_cost(network_simplex(costs, supply, demand), costs)
+        slack = sum(supply) * result["epsilon_schedule"][-1] + 1e-6
+        assert calculate_cost(result["alloc"], costs) <= expected + slack
@@ -0,0 +1,347 @@
+# batch_solve/batch_solve.py
+
+import multiprocessing
+import os
+import queue
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+from instrumentation.instrumentation import measure_solve
+from result_cache.result_cache import instance_key
+from transport_core.transport_core import (
+    HEURISTIC_METHODS, METHODS, balance_instance, calculate_cost, get_method, solution_result
+)
+
+DEFAULT_METHODS = ("northwest_corner", "vogel", "minimum_cost", "sequential_steps")
+
+# Las matrices densas con al menos este número de celdas viajan por memoria compartida
+SHARED_MEMORY_MIN_CELLS = 4096
+
+# Cada cuánto (segundos) el portafolio revisa si algún proceso terminó sin responder
+PORTFOLIO_POLL_INTERVAL = 0.1
+
+
+def batch_solve(instances, methods=DEFAULT_METHODS, workers=None, cache=None):
+    """
+    Resuelve muchas instancias en un grupo de procesos.
+
+    Parámetros:
+        instances (iterable of tuple): Instancias (costs, supply, demand).
+        methods (list of str): Identificadores de METHODS a ejecutar en cada instancia.
+        workers (int, opcional): Número de procesos (por defecto, os.cpu_count()).
+        cache (ResultCache, opcional): Caché de resultados (ver BatchSolver).
+
+    Retorna:
+        generator: Un resultado por instancia, en el orden de entrada (ver BatchSolver.solve).
+    """
+    return BatchSolver(methods, workers, cache=cache).solve(instances)
+
+
+class BatchSolver:
+    """
+    Reparte instancias (costs, supply, demand) entre procesos y entrega los
+    resultados en el orden de entrada a medida que terminan.
+
+    Las matrices de costos densas grandes se copian una sola vez a un bloque de
+    memoria compartida como arreglo contiguo de float64 (int64 en modo entero),
+    en lugar de serializar listas anidadas. Como mucho max_pending instancias
+    están en vuelo a la vez, lo que acota la memoria compartida en uso.
+
+    Con una caché (ResultCache) el proceso principal busca cada (método, instancia)
+    antes de enviarla: solo se envían los métodos que faltan, y una instancia
+    que ya está completa en la caché no llega a los procesos.
+
+    Una instancia que falla (dimensiones que no coinciden, rutas prohibidas que la
+    hacen infactible, ...) no detiene el lote: en su lugar se entrega un resultado
+    con "error" y sin "results", y se sigue con las demás.
+    """
+    def __init__(self, methods=DEFAULT_METHODS, workers=None, max_pending=None, cache=None):
+        for method in methods:
+            if method not in METHODS:
+                raise ValueError(f"Método desconocido: {method}")
+        self.methods = tuple(methods)
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        self.cache = cache
+        self.instances = 0
+        self.solves = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self.solver_time = 0.0
+        self.elapsed = 0.0
+
+    def solve(self, instances):
+        """
+        Genera un diccionario por instancia con "index" (posición en la entrada) y
+        "results" ({método: resultado de measure_solve, con "time" = stats["wall_time"]}),
+        o "index" y "error" (el mensaje) si la instancia falló.
+        """
+        start = time.perf_counter()
+        pending = deque()
+        instances = iter(instances)
+        # Los procesos deben compartir el resource_tracker del principal (ver _attach)
+        resource_tracker.ensure_running()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                index = 0
+                for costs, supply, demand in instances:
+                    block = future = key = error = None
+                    cached = {}
+                    try:
+                        key, cached = self._lookup(costs, supply, demand)
+                        missing = tuple(method for method in self.methods if method not in cached)
+                        if missing:
+                            block, payload = _share_costs(costs)
+                            future = executor.submit(_solve_instance, payload, supply, demand, missing)
+                    except Exception as exc:
+                        _release(block)
+                        block, error = None, exc
+                    pending.append((index, block, future, key, cached, error))
+                    index += 1
+                    if len(pending) >= self.max_pending:
+                        yield self._collect(pending.popleft(), start)
+                while pending:
+                    yield self._collect(pending.popleft(), start)
+            finally:
+                for _, block, future, _, _, _ in pending:
+                    if future is not None:
+                        future.cancel()
+                    _release(block)
+
+    def _lookup(self, costs, supply, demand):
+        """Huella de la instancia y resultados ya guardados en la caché ({método: resultado})."""
+        if self.cache is None:
+            return None, {}
+        key = instance_key(costs, supply, demand)
+        if key is None:
+            return None, {}
+        cached = {}
+        for method in self.methods:
+            result = self.cache.get(method, key)
+            if result is not None:
+                cached[method] = result
+        return key, cached
+
+    def _collect(self, entry, start):
+        index, block, future, key, cached, error = entry
+        solved = {}
+        if future is not None:
+            try:
+                solved = future.result()
+            except Exception as exc:
+                error = exc
+            finally:
+                _release(block)
+        if error is not None:
+            self.instances += 1
+            self.errors += 1
+            self.elapsed = time.perf_counter() - start
+            return {"index": index, "error": str(error)}
+        if key is not None:
+            for method, result in solved.items():
+                self.cache.put(method, key, result)
+        self.instances += 1
+        self.solves += len(solved)
+        self.cache_hits += len(cached)
+        self.solver_time += sum(result["time"] for result in solved.values())
+        self.elapsed = time.perf_counter() - start
+        results = {method: cached[method] if method in cached else solved[method] for method in self.methods}
+        return {"index": index, "results": results}
+
+    def stats(self):
+        """Rendimiento agregado de las instancias entregadas hasta el momento."""
+        elapsed = self.elapsed or float('inf')
+        return {
+            "instances": self.instances,
+            "solves": self.solves,
+            "cache_hits": self.cache_hits,
+            "errors": self.errors,
+            "elapsed": self.elapsed,
+            "solver_time": self.solver_time,
+            "instances_per_second": self.instances / elapsed,
+            "solves_per_second": self.solves / elapsed,
+        }
+
+
+def portfolio_solve(costs, supply, demand, methods=HEURISTIC_METHODS, time_budget=None, workers=None,
+                    optimize=False, shortage_costs=None, surplus_costs=None):
+    """
+    Ejecuta varios métodos iniciales a la vez, cada uno en su propio proceso, y
+    retorna la solución más barata entre los que terminan dentro de time_budget
+    segundos. Al agotarse el tiempo los procesos que siguen en curso se terminan.
+
+    Parámetros:
+        costs, supply, demand: La instancia (las no balanceadas llevan un nodo ficticio, ver balance_instance).
+        methods (list of str): Identificadores de METHODS a ejecutar (por defecto, las heurísticas).
+        time_budget (float, opcional): Tiempo límite en segundos (por defecto, sin límite).
+        workers (int, opcional): Procesos simultáneos (por defecto, uno por método).
+        optimize (bool): Si es verdadero, la mejor solución es el punto de partida del
+            método MODI (ver modified_distribution_solve), que corre fuera del tiempo límite.
+
+    Retorna:
+        dict: Lo mismo que solve_method, más "method" (el método ganador), "pivots"
+        (pivotes del MODI, 0 sin optimize) y "starts" ({método: {"status", "cost",
+        "time"}}, con status "done", "error" o "timeout"; "error" lleva el mensaje).
+    """
+    for method in methods:
+        if method not in METHODS:
+            raise ValueError(f"Método desconocido: {method}")
+    num_supply, num_demand = len(supply), len(demand)
+    costs, supply, demand, dummy = balance_instance(costs, supply, demand, shortage_costs, surplus_costs)
+    starts = _run_portfolio(costs, list(supply), list(demand), list(methods), time_budget,
+                            workers or len(methods))
+
+    best_method = best_alloc = None
+    for method in methods:
+        start = starts[method]
+        if start["status"] == "done" and (best_method is None or start["cost"] < starts[best_method]["cost"]):
+            best_method, best_alloc = method, start.pop("alloc")
+        else:
+            start.pop("alloc", None)
+    if best_method is None:
+        raise ValueError("Ningún método terminó dentro del tiempo límite.")
+
+    pivots = 0
+    if optimize:
+        from modified_distribution.modified_distribution import modified_distribution_solve
+        optimized = modified_distribution_solve(costs, list(supply), list(demand), best_alloc)
+        best_alloc, pivots = optimized["alloc"], optimized["pivots"]
+    result = solution_result(best_alloc, costs, dummy, num_supply, num_demand, shortage_costs, surplus_costs)
+    result.update(method=best_method, pivots=pivots, starts=starts)
+    return result
+
+def _run_portfolio(costs, supply, demand, methods, time_budget, workers):
+    """Ejecuta los métodos en procesos con a lo sumo workers a la vez. Retorna {método: estado}."""
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    context = multiprocessing.get_context()
+    results = context.Queue()
+    resource_tracker.ensure_running()
+    block, payload = _share_costs(costs)
+    waiting = deque(methods)
+    running = {}
+    starts = {}
+    try:
+        while waiting or running:
+            while waiting and len(running) < workers:
+                method = waiting.popleft()
+                process = context.Process(target=_run_start, args=(results, method, payload, supply, demand),
+                                          daemon=True)
+                process.start()
+                running[method] = process
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                break
+            timeout = PORTFOLIO_POLL_INTERVAL if remaining is None else min(remaining, PORTFOLIO_POLL_INTERVAL)
+            try:
+                messages = [results.get(timeout=timeout)]
+            except queue.Empty:
+                # Un proceso que terminó ya dejó su respuesta en la cola; si no hay
+                # ninguna después de vaciarla, el proceso murió sin responder
+                exited = [method for method, process in running.items() if process.exitcode is not None]
+                messages = _drain(results)
+                answered = {message[0] for message in messages}
+                for method in exited:
+                    if method not in answered:
+                        messages.append((method, "error", "El proceso terminó sin responder.", None))
+            for method, status, value, elapsed in messages:
+                running.pop(method).join()
+                if status == "done":
+                    alloc, cost = value
+                    starts[method] = {"status": status, "cost": cost, "time": elapsed, "alloc": alloc}
+                else:
+                    starts[method] = {"status": status, "error": value, "time": elapsed}
+    finally:
+        for process in running.values():
+            process.terminate()
+        for process in running.values():
+            process.join()
+        results.close()
+        results.join_thread()
+        _release(block)
+    return {method: starts.get(method, {"status": "timeout", "time": None}) for method in methods}
+
+def _drain(results):
+    messages = []
+    while True:
+        try:
+            messages.append(results.get_nowait())
+        except queue.Empty:
+            return messages
+
+def _run_start(results, method, payload, supply, demand):
+    start = time.perf_counter()
+    try:
+        costs = _load_costs(payload)
+        alloc = get_method(method)(costs, supply, demand)
+        value = (alloc, calculate_cost(alloc, costs))
+        status = "done"
+    except Exception as exc:
+        value = str(exc)
+        status = "error"
+    results.put((method, status, value, time.perf_counter() - start))
+
+def _share_costs(costs):
+    """
+    Prepara la matriz para enviarla a un proceso. Retorna (bloque, carga), donde el
+    bloque de memoria compartida es None si la matriz se serializa directamente.
+    """
+    if not isinstance(costs, list) or not costs:
+        return None, ("object", costs)
+    rows, cols = len(costs), len(costs[0])
+    if rows * cols < SHARED_MEMORY_MIN_CELLS:
+        return None, ("object", costs)
+    # Las filas enteras (modo entero, ver prepare_instance) viajan como int64
+    typecode = 'q' if all(isinstance(row, array) and row.typecode == 'q' for row in costs) else 'd'
+    block = shared_memory.SharedMemory(create=True, size=8 * rows * cols)
+    try:
+        view = block.buf.cast(typecode)
+        try:
+            for i, row in enumerate(costs):
+                if len(row) != cols:
+                    raise ValueError("Todas las filas deben tener el mismo número de columnas.")
+                view[i * cols:(i + 1) * cols] = row if typecode == 'q' else array('d', row)
+        finally:
+            view.release()
+    except BaseException:
+        _release(block)
+        raise
+    return block, ("shared", block.name, rows, cols, typecode)
+
+def _release(block):
+    if block is not None:
+        block.close()
+        block.unlink()
+
+def _load_costs(payload):
+    if payload[0] == "object":
+        return payload[1]
+    _, name, rows, cols, typecode = payload
+    block = _attach(name)
+    try:
+        view = block.buf.cast(typecode)
+        costs = [array(typecode, view[i * cols:(i + 1) * cols]) for i in range(rows)]
+        view.release()
+    finally:
+        block.close()
+    return costs
+
+def _attach(name):
+    # El proceso principal es el dueño del bloque. Antes de Python 3.13 abrirlo lo
+    # registra de nuevo en el resource_tracker, que es el mismo del principal y
+    # lo olvida cuando este llama a unlink.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+def _solve_instance(payload, supply, demand, methods):
+    costs = _load_costs(payload)
+    results = {}
+    for method in methods:
+        result = measure_solve(method, costs, supply, demand)
+        result["time"] = result["stats"]["wall_time"]
+        results[method] = result
+    return results
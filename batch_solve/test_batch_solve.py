@@ -0,0 +1,82 @@
+# batch_solve/test_batch_solve.py
+
+import random
+import time
+
+import pytest
+
+from batch_solve.batch_solve import BatchSolver, batch_solve, portfolio_solve
+from benchmarks.instance_generators import small_instance, uniform_instance
+from cost_matrix.cost_matrix import SparseCosts
+from result_cache.result_cache import ResultCache
+from transport_core import transport_core
+from transport_core.transport_core import prepare_instance, solve_method
+
+METHODS = ("northwest_corner", "vogel")
+
+
+def test_results_in_input_order():
+    rng = random.Random(5)
+    # Instancias grandes (memoria compartida, también en modo entero) mezcladas con chicas
+    instances = []
+    for k in range(8):
+        if k % 3 == 0:
+            instance = uniform_instance(80, 70, seed=k)
+            instances.append(prepare_instance(*instance) if k % 2 else instance)
+        else:
+            instances.append(small_instance(rng))
+    records = list(batch_solve(instances, METHODS, workers=2))
+    assert [record["index"] for record in records] == list(range(len(instances)))
+    for record, instance in zip(records, instances):
+        for method in METHODS:
+            assert record["results"][method]["cost"] == solve_method(method, *instance)["cost"]
+
+
+def test_cache_hits_skip_the_workers():
+    instances = [uniform_instance(10, 12, seed=k) for k in range(3)]
+    cache = ResultCache()
+    first = list(BatchSolver(METHODS, workers=2, cache=cache).solve(instances))
+    solver = BatchSolver(METHODS, workers=2, cache=cache)
+    second = list(solver.solve(instances))
+    assert solver.stats()["cache_hits"] == len(instances) * len(METHODS)
+    assert solver.stats()["solves"] == 0
+    assert [r["results"]["vogel"]["cost"] for r in second] == [r["results"]["vogel"]["cost"] for r in first]
+
+
+def test_failing_instance_does_not_stop_the_batch():
+    good = uniform_instance(6, 5, seed=1)
+    ragged = ([[1, 2], [3]], [1, 2], [2, 1])
+    ragged_shared = ([[1.0] * 80 for _ in range(79)] + [[1.0] * 79], [80] * 80, [80] * 80)
+    # Ninguna ruta llega al consumidor 1
+    infeasible = (SparseCosts.from_dense([[1, None], [2, None]]), [1, 1], [1, 1])
+    instances = [good, ragged, good, ragged_shared, infeasible, good]
+    solver = BatchSolver(METHODS, workers=2)
+    records = list(solver.solve(instances))
+    assert [record["index"] for record in records] == list(range(len(instances)))
+    assert [("error" in record) for record in records] == [False, True, False, True, True, False]
+    expected = solve_method("vogel", *good)["cost"]
+    assert all(records[k]["results"]["vogel"]["cost"] == expected for k in (0, 2, 5))
+    assert solver.stats()["errors"] == 3
+
+
+def _slow_method(costs, supply, demand):
+    time.sleep(30)
+
+
+def test_portfolio_stops_at_the_time_budget(monkeypatch):
+    monkeypatch.setitem(transport_core.METHODS, "slow", ("batch_solve.test_batch_solve", "_slow_method"))
+    instance = uniform_instance(8, 9, seed=3)
+    start = time.perf_counter()
+    result = portfolio_solve(*instance, methods=("slow", "northwest_corner", "vogel"), time_budget=2)
+    assert time.perf_counter() - start < 10
+    assert result["starts"]["slow"]["status"] == "timeout"
+    assert result["starts"]["vogel"]["status"] == "done"
+    best = min(("northwest_corner", "vogel"), key=lambda method: solve_method(method, *instance)["cost"])
+    assert result["method"] == best
+    assert result["cost"] == solve_method(best, *instance)["cost"]
+
+
+def test_portfolio_without_finished_methods_fails(monkeypatch):
+    monkeypatch.setitem(transport_core.METHODS, "slow", ("batch_solve.test_batch_solve", "_slow_method"))
+    with pytest.raises(ValueError):
+        portfolio_solve(*uniform_instance(4, 4, seed=1), methods=("slow",), time_budget=0.5)
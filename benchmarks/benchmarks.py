@@ -0,0 +1,202 @@
+"""
+Banco de pruebas de rendimiento de los métodos del Problema de Transporte.
+
+Para cada generador y tamaño mide el tiempo de pared (mínimo de varias
+repeticiones), la memoria máxima reservada (tracemalloc, en una ejecución
+aparte para no distorsionar el tiempo) y el costo de la solución frente al
+mejor conocido: el óptimo del simplex de red cuando la instancia no supera
+--optimal-max-cells, o si no el menor costo encontrado por los métodos.
+Los resultados se escriben en JSON para comparar versiones:
+
+    python benchmarks/benchmarks.py --sizes 10,100,1000 --output actual.json
+    python benchmarks/benchmarks.py --compare base.json actual.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+if __name__ == "__main__":
+    # Al ejecutar el archivo directamente, la raíz del repositorio reemplaza a este
+    # directorio en sys.path (si no, "benchmarks" sería este mismo módulo)
+    sys.path[0] = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks.instance_generators import GENERATORS
+from transport_core.transport_core import calculate_cost, get_method
+from transport_solution.transport_solution import TransportSolution
+
+DEFAULT_SIZES = (10, 100, 1000)
+FULL_SIZES = (10, 50, 100, 500, 1000, 2000, 5000)
+
+BENCHMARK_METHODS = ("northwest_corner", "minimum_cost", "vogel", "sequential_steps", "modi_step", "calculate_cost")
+
+# Paso MODI y cálculo del óptimo: costo por pivote proporcional a m·n
+DEFAULT_MODI_MAX_CELLS = 250_000
+DEFAULT_OPTIMAL_MAX_CELLS = 1_000_000
+
+
+def run_benchmarks(generators=tuple(GENERATORS), sizes=DEFAULT_SIZES, methods=BENCHMARK_METHODS,
+                   seed=0, repeat=3, measure_memory=True,
+                   modi_max_cells=DEFAULT_MODI_MAX_CELLS, optimal_max_cells=DEFAULT_OPTIMAL_MAX_CELLS):
+    """
+    Ejecuta el banco de pruebas y retorna una lista de registros, uno por
+    (generador, tamaño, método), con "wall_time", "peak_memory", "cost",
+    "feasible" (si la solución cubre toda la oferta y la demanda), "best_known"
+    y "gap" (costo / mejor conocido - 1, None si la solución no es factible).
+    """
+    records = []
+    for generator in generators:
+        for size in sizes:
+            costs, supply, demand = GENERATORS[generator](size, size, seed=seed)
+            case = {"generator": generator, "rows": size, "cols": size, "seed": seed}
+            cells = size * size
+
+            # El paso MODI y calculate_cost parten de la solución de Vogel
+            prior = get_method("vogel")(costs, supply.copy(), demand.copy())
+            case_records = []
+            for method in methods:
+                if method == "modi_step" and cells > modi_max_cells:
+                    continue
+                function, args = _benchmark_call(method, costs, supply, demand, prior)
+                wall_time, result = _time_call(function, args, repeat)
+                peak_memory = _peak_memory(function, args) if measure_memory else None
+                record = dict(case, method=method, wall_time=wall_time, peak_memory=peak_memory)
+                if method == "calculate_cost":
+                    record["cost"] = result
+                    record["feasible"] = _is_feasible(prior, supply, demand)
+                else:
+                    alloc = result["alloc"] if method == "modi_step" else result
+                    record["cost"] = calculate_cost(alloc, costs)
+                    record["feasible"] = _is_feasible(alloc, supply, demand)
+                case_records.append(record)
+
+            feasible_costs = [record["cost"] for record in case_records if record["feasible"]]
+            if cells <= optimal_max_cells:
+                optimal = get_method("network_simplex")(costs, supply.copy(), demand.copy())
+                feasible_costs.append(calculate_cost(optimal, costs))
+            best_known = min(feasible_costs, default=None)
+            for record in case_records:
+                record["best_known"] = best_known
+                if not record["feasible"] or best_known is None:
+                    record["gap"] = None
+                else:
+                    record["gap"] = record["cost"] / best_known - 1 if best_known else 0.0
+            records.extend(case_records)
+    return records
+
+def _is_feasible(allocations, supply, demand, tolerance=1e-6):
+    if not isinstance(allocations, TransportSolution):
+        allocations = TransportSolution.from_allocations(allocations, len(supply), len(demand))
+    row_totals = allocations.row_totals()
+    col_totals = allocations.col_totals()
+    return (all(abs(t - s) <= tolerance for t, s in zip(row_totals, supply))
+            and all(abs(t - d) <= tolerance for t, d in zip(col_totals, demand)))
+
+def _benchmark_call(method, costs, supply, demand, prior):
+    if method == "modi_step":
+        from modified_distribution.modified_distribution import modified_distribution_solve
+        return modified_distribution_solve, (costs, supply, demand, prior)
+    if method == "calculate_cost":
+        return calculate_cost, (prior, costs)
+    return get_method(method), (costs, supply, demand)
+
+def _time_call(function, args, repeat):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def _peak_memory(function, args):
+    """Bytes máximos reservados durante una llamada, por encima de lo ya reservado."""
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        function(*args)
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+def write_results(records, path):
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": records,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+
+def compare_results(baseline_path, current_path, threshold=0.10):
+    """
+    Compara dos archivos de resultados y retorna las filas (clave, tiempo base,
+    tiempo actual, razón) cuyo tiempo empeoró más que threshold.
+    """
+    def load(path):
+        with open(path, encoding="utf-8") as f:
+            results = json.load(f)["results"]
+        return {(r["generator"], r["rows"], r["cols"], r["seed"], r["method"]): r for r in results}
+
+    baseline = load(baseline_path)
+    current = load(current_path)
+    regressions = []
+    for key, record in current.items():
+        if key in baseline and baseline[key]["wall_time"] > 0:
+            ratio = record["wall_time"] / baseline[key]["wall_time"]
+            if ratio > 1 + threshold:
+                regressions.append((key, baseline[key]["wall_time"], record["wall_time"], ratio))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banco de pruebas de los métodos de transporte.")
+    parser.add_argument("--generators", default=",".join(GENERATORS))
+    parser.add_argument("--sizes", default=None, help="Tamaños separados por comas (instancias n×n).")
+    parser.add_argument("--full", action="store_true", help="Usar todos los tamaños, de 10×10 a 5000×5000.")
+    parser.add_argument("--methods", default=",".join(BENCHMARK_METHODS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="No medir la memoria máxima.")
+    parser.add_argument("--modi-max-cells", type=int, default=DEFAULT_MODI_MAX_CELLS)
+    parser.add_argument("--optimal-max-cells", type=int, default=DEFAULT_OPTIMAL_MAX_CELLS)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "ACTUAL"),
+                        help="Comparar dos archivos de resultados en lugar de ejecutar.")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        regressions = compare_results(args.compare[0], args.compare[1], args.threshold)
+        for key, before, after, ratio in regressions:
+            print(f"{'/'.join(map(str, key))}: {before:.4f}s -> {after:.4f}s (x{ratio:.2f})")
+        return 1 if regressions else 0
+
+    if args.sizes:
+        sizes = [int(size) for size in args.sizes.split(",")]
+    else:
+        sizes = FULL_SIZES if args.full else DEFAULT_SIZES
+    records = run_benchmarks(
+        generators=args.generators.split(","),
+        sizes=sizes,
+        methods=args.methods.split(","),
+        seed=args.seed,
+        repeat=args.repeat,
+        measure_memory=not args.no_memory,
+        modi_max_cells=args.modi_max_cells,
+        optimal_max_cells=args.optimal_max_cells,
+    )
+    for r in records:
+        memory = "-" if r["peak_memory"] is None else f"{r['peak_memory'] / 1024:.0f} KiB"
+        gap = "no factible" if r["gap"] is None else f"gap {r['gap']:.2%}"
+        print(f"{r['generator']:>10} {r['rows']:>5}x{r['cols']:<5} {r['method']:>16} "
+              f"{r['wall_time']:9.4f}s {memory:>12}  {gap}")
+    write_results(records, args.output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+# benchmarks/instance_generators.py
+
+import math
+import random
+
+from cost_matrix.cost_matrix import SparseCosts
+
+
+def uniform_instance(rows, cols, seed=0, max_cost=100):
+    """Costos enteros uniformes en [1, max_cost]."""
+    rng = random.Random(seed)
+    costs = [[rng.randint(1, max_cost) for _ in range(cols)] for _ in range(rows)]
+    supply, demand = _balanced_quantities(rng, rows, cols)
+    return costs, supply, demand
+
+def euclidean_instance(rows, cols, seed=0, size=1000):
+    """Proveedores y consumidores en un cuadrado; el costo es la distancia euclídea."""
+    rng = random.Random(seed)
+    sources = [(rng.uniform(0, size), rng.uniform(0, size)) for _ in range(rows)]
+    destinations = [(rng.uniform(0, size), rng.uniform(0, size)) for _ in range(cols)]
+    costs = [[round(math.dist(p, q), 2) for q in destinations] for p in sources]
+    supply, demand = _balanced_quantities(rng, rows, cols)
+    return costs, supply, demand
+
+def clustered_instance(rows, cols, seed=0, clusters=5, size=1000, spread=30):
+    """Como euclidean_instance, pero los nodos se agrupan alrededor de unos pocos centros."""
+    rng = random.Random(seed)
+    centers = [(rng.uniform(0, size), rng.uniform(0, size)) for _ in range(clusters)]
+
+    def point():
+        cx, cy = rng.choice(centers)
+        return (rng.gauss(cx, spread), rng.gauss(cy, spread))
+
+    sources = [point() for _ in range(rows)]
+    destinations = [point() for _ in range(cols)]
+    costs = [[round(math.dist(p, q), 2) for q in destinations] for p in sources]
+    supply, demand = _balanced_quantities(rng, rows, cols)
+    return costs, supply, demand
+
+def degenerate_instance(rows, cols, seed=0, max_cost=10):
+    """
+    Ofertas y demandas cuyas sumas parciales coinciden a menudo, de modo que las
+    heurísticas agotan fila y columna a la vez; pocos costos distintos (muchos empates).
+    """
+    rng = random.Random(seed)
+    costs = [[rng.randint(1, max_cost) for _ in range(cols)] for _ in range(rows)]
+    unit = 10
+    total = unit * math.lcm(rows, cols)
+    supply = [total // rows] * rows
+    demand = [total // cols] * cols
+    return costs, supply, demand
+
+def sparse_instance(rows, cols, seed=0, density=0.05, max_cost=100):
+    """
+    Matriz SparseCosts con aproximadamente density de rutas permitidas. Siempre incluye
+    la escalera de la esquina noroeste, así que la instancia es factible.
+    """
+    rng = random.Random(seed)
+    supply, demand = _balanced_quantities(rng, rows, cols)
+    allowed = set()
+    i = j = 0
+    remaining_supply, remaining_demand = supply[0], demand[0]
+    while i < rows and j < cols:
+        allowed.add((i, j))
+        alloc = min(remaining_supply, remaining_demand)
+        remaining_supply -= alloc
+        remaining_demand -= alloc
+        if remaining_supply == 0 and i + 1 < rows:
+            i += 1
+            remaining_supply = supply[i]
+        elif remaining_demand == 0 and j + 1 < cols:
+            j += 1
+            remaining_demand = demand[j]
+        else:
+            break
+    extra = int(density * rows * cols)
+    for _ in range(extra):
+        allowed.add((rng.randrange(rows), rng.randrange(cols)))
+    arcs = ((i, j, rng.randint(1, max_cost)) for (i, j) in sorted(allowed))
+    return SparseCosts.from_arcs(rows, cols, arcs), supply, demand
+
+def _balanced_quantities(rng, rows, cols, low=1, high=100):
+    """Ofertas enteras aleatorias y demandas enteras con la misma suma."""
+    supply = [rng.randint(low, high) for _ in range(rows)]
+    total = sum(supply)
+    weights = [rng.random() + 0.1 for _ in range(cols)]
+    scale = total / sum(weights)
+    demand = [int(w * scale) for w in weights]
+    for k in range(total - sum(demand)):
+        demand[k % cols] += 1
+    return supply, demand
+
+def small_instance(rng, max_size=6, max_cost=20, max_quantity=9, zeros=True):
+    """
+    Instancia balanceada chica para las pruebas, a partir de un random.Random:
+    entre 1 y max_size proveedores y consumidores, costos enteros en [0, max_cost]
+    (muchos empates si max_cost es chico) y, si zeros, ofertas y demandas nulas
+    con probabilidad 1/2. La diferencia de totales se suma a un nodo al azar.
+    """
+    m, n = rng.randint(1, max_size), rng.randint(1, max_size)
+    costs = [[rng.randint(0, max_cost) for _ in range(n)] for _ in range(m)]
+
+    def quantity():
+        if zeros and rng.random() < 0.5:
+            return 0
+        return rng.randint(1, max_quantity)
+
+    supply = [quantity() for _ in range(m)]
+    demand = [quantity() for _ in range(n)]
+    difference = sum(supply) - sum(demand)
+    if difference > 0:
+        demand[rng.randrange(n)] += difference
+    else:
+        supply[rng.randrange(m)] -= difference
+    return costs, supply, demand
+
+def forbid_routes(rng, costs, allowed=0.7):
+    """Copia de una matriz densa con cada ruta prohibida (None) con probabilidad 1 - allowed."""
+    return [[c if rng.random() < allowed else None for c in row] for row in costs]
+
+GENERATORS = {
+    "uniform": uniform_instance,
+    "euclidean": euclidean_instance,
+    "clustered": clustered_instance,
+    "degenerate": degenerate_instance,
+    "sparse": sparse_instance,
+}
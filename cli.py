@@ -0,0 +1,151 @@
+"""
+Línea de comandos sin interfaz gráfica para el Problema de Transporte.
+
+Lee instancias de archivos JSON o CSV (o de la entrada estándar) y escribe una
+línea JSON por cada instancia y método con las asignaciones y el costo total.
+Las instancias no balanceadas se resuelven con un nodo ficticio; la diferencia
+se reporta en "unmet_demand" (por consumidor) y "unused_supply" (por proveedor).
+
+Formatos de entrada:
+    JSON: un objeto {"costs": [[...]], "supply": [...], "demand": [...]}, una lista
+          de objetos o un objeto por línea. Un costo null es una ruta prohibida.
+    CSV:  la misma disposición que la tabla de la interfaz: una fila por proveedor
+          con sus costos y la oferta al final, y una última fila con las demandas.
+          Una celda vacía o "-" es una ruta prohibida. Se aceptan comas, punto y
+          coma o tabuladores como separador.
+    XLSX: la misma disposición que el CSV, en la primera hoja del libro.
+
+Con --portfolio los métodos corren a la vez en procesos separados y solo se
+escribe la mejor solución (método "portfolio", con el ganador en "best_method"),
+opcionalmente optimizada con MODI (--optimize).
+
+Con --cache-dir los resultados se guardan en disco indexados por el contenido
+de la instancia, y una instancia repetida (en esta u otra ejecución) no se
+vuelve a resolver.
+
+Con --decompose cada región de rutas permitidas que no se conecta con las demás
+se resuelve como una instancia aparte (ver decomposition), en paralelo si es grande.
+
+Ejemplos:
+    python cli.py instancia.json --methods vogel,minimum_cost
+    python cli.py instancia.json --portfolio --time-budget 5 --optimize
+"""
+import argparse
+import json
+import sys
+from functools import partial
+
+# Solo se importa transport_core, que no carga ningún método: el portafolio (procesos),
+# la descomposición, la caché y la lectura de tablas se importan en la rama que los usa
+from transport_core.transport_core import (
+    METHODS, HEURISTIC_METHODS, build_costs, parse_cost, parse_number, prepare_instance, solve_method
+)
+
+def make_instance(costs, supply, demand):
+    if len(costs) != len(supply) or any(len(row) != len(demand) for row in costs):
+        raise ValueError("Las dimensiones de costos, oferta y demanda no coinciden.")
+    return prepare_instance(build_costs(costs), supply, demand)
+
+def read_json(text):
+    text = text.strip()
+    if not text:
+        return []
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        # Un objeto por línea
+        data = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(data, dict):
+        data = [data]
+    return [make_instance(item["costs"], item["supply"], item["demand"]) for item in data]
+
+def read_table_instance(rows):
+    from table_io.table_io import split_table
+    cost_rows, supply, demand = split_table(rows)
+    costs = [[parse_cost(cell) for cell in row] for row in cost_rows]
+    return [make_instance(costs, [parse_number(s) for s in supply], [parse_number(d) for d in demand])]
+
+def read_csv(text):
+    from table_io.table_io import parse_delimited
+    return read_table_instance(parse_delimited(text))
+
+def read_instances(path, input_format):
+    if input_format == "xlsx" or (input_format == "auto" and path.lower().endswith(".xlsx")):
+        from table_io.table_io import read_xlsx
+        return read_table_instance(read_xlsx(path))
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    if input_format == "auto":
+        input_format = "csv" if path.lower().endswith(".csv") else "json"
+    if input_format == "csv":
+        return read_csv(text)
+    return read_json(text)
+
+def make_record(index, path, method, result):
+    return {
+        "instance": index,
+        "input": path,
+        "method": method,
+        "cost": result["cost"],
+        "alloc": [[i, j, alloc] for ((i, j), alloc) in result["alloc"]],
+        "unmet_demand": result["unmet_demand"],
+        "unused_supply": result["unused_supply"],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve problemas de transporte sin interfaz gráfica.")
+    parser.add_argument("inputs", nargs="*", default=["-"],
+                        help="Archivos JSON o CSV con instancias ('-' para la entrada estándar).")
+    parser.add_argument("--methods", default=",".join(HEURISTIC_METHODS),
+                        help="Métodos separados por comas: " + ", ".join(METHODS) + ".")
+    parser.add_argument("--format", dest="input_format", choices=("auto", "json", "csv", "xlsx"), default="auto",
+                        help="Formato de entrada (por defecto, según la extensión; JSON para la entrada estándar).")
+    parser.add_argument("--portfolio", action="store_true",
+                        help="Ejecutar los métodos en paralelo y escribir solo la mejor solución.")
+    parser.add_argument("--time-budget", type=float, default=None,
+                        help="Tiempo límite en segundos del portafolio.")
+    parser.add_argument("--optimize", action="store_true",
+                        help="Optimizar con MODI la mejor solución del portafolio.")
+    parser.add_argument("--decompose", action="store_true",
+                        help="Resolver por separado las componentes conexas de rutas permitidas.")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Directorio de la caché de resultados en disco.")
+    args = parser.parse_args(argv)
+
+    methods = [method.strip() for method in args.methods.split(",") if method.strip()]
+    for method in methods:
+        if method not in METHODS:
+            parser.error(f"Método desconocido: {method}")
+
+    if args.decompose:
+        from decomposition.decomposition import solve_decomposed
+        solve = solve_decomposed
+    else:
+        solve = solve_method
+    if args.cache_dir:
+        from result_cache.result_cache import ResultCache
+        solve = partial(ResultCache(directory=args.cache_dir).solve, solver=solve,
+                        variant="decomposed" if args.decompose else None)
+    out = sys.stdout
+    index = 0
+    for path in args.inputs:
+        for costs, supply, demand in read_instances(path, args.input_format):
+            if args.portfolio:
+                from batch_solve.batch_solve import portfolio_solve
+                result = portfolio_solve(costs, supply, demand, methods, args.time_budget, optimize=args.optimize)
+                record = make_record(index, path, "portfolio", result)
+                record["best_method"] = result["method"]
+                record["pivots"] = result["pivots"]
+                out.write(json.dumps(record) + "\n")
+            else:
+                for method in methods:
+                    result = solve(method, costs, supply, demand)
+                    out.write(json.dumps(make_record(index, path, method, result)) + "\n")
+            index += 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
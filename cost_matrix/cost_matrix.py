@@ -0,0 +1,663 @@
+# cost_matrix/cost_matrix.py
+
+import math
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from itertools import chain
+
+from transport_solution.transport_solution import TransportSolution
+
+INF = float('inf')
+
+# Celdas que LazyCosts conserva en caché por defecto (8 bytes por costo más el índice)
+DEFAULT_CACHE_CELLS = 1_000_000
+EARTH_RADIUS_KM = 6371.0088
+
+# Formato binario de MappedCosts: cabecera de 32 bytes (firma, tipo de dato, filas,
+# columnas) seguida de la matriz en orden de filas, little-endian, 8 bytes por celda
+MAPPED_MAGIC = b"TPCOSTS1"
+_MAPPED_HEADER = struct.Struct("<8s4sQQ4x")
+
+
+class SparseCosts:
+    """
+    Matriz de costos dispersa en formato CSR: solo se guardan las rutas permitidas.
+
+    Los arcos de la fila i ocupan las posiciones indptr[i]..indptr[i+1]-1 de
+    indices (consumidor, en orden creciente) y data (costo). costs[i][j]
+    devuelve el costo de la ruta o infinito si la ruta está prohibida, de modo
+    que el código que indexa una matriz densa sigue funcionando.
+    """
+    def __init__(self, num_rows, num_cols, indptr, indices, data):
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self._csc = None
+
+    @classmethod
+    def from_dense(cls, costs, forbidden=(None, INF)):
+        """Construye la matriz a partir de una lista de listas; las celdas en forbidden se omiten."""
+        indptr = array('q', [0])
+        indices = array('q')
+        data = array('d')
+        num_cols = 0
+        for row in costs:
+            num_cols = len(row)
+            for j, c in enumerate(row):
+                if c not in forbidden:
+                    indices.append(j)
+                    data.append(c)
+            indptr.append(len(indices))
+        return cls(len(indptr) - 1, num_cols, indptr, indices, data)
+
+    @classmethod
+    def from_arcs(cls, num_rows, num_cols, arcs):
+        """Construye la matriz a partir de tuplas (proveedor, consumidor, costo)."""
+        rows = [[] for _ in range(num_rows)]
+        for i, j, c in arcs:
+            rows[i].append((j, c))
+        indptr = array('q', [0])
+        indices = array('q')
+        data = array('d')
+        for row in rows:
+            row.sort()
+            for j, c in row:
+                indices.append(j)
+                data.append(c)
+            indptr.append(len(indices))
+        return cls(num_rows, num_cols, indptr, indices, data)
+
+    def with_dummy_row(self, penalties):
+        """Otra matriz con una fila más (origen ficticio) que llega a todos los consumidores."""
+        indptr = array('q', self.indptr)
+        indptr.append(self.nnz + self.num_cols)
+        indices = self.indices + array('q', range(self.num_cols))
+        data = self.data + array('d', penalties)
+        return SparseCosts(self.num_rows + 1, self.num_cols, indptr, indices, data)
+
+    def with_dummy_column(self, penalties):
+        """Otra matriz con una columna más (destino ficticio) que llega desde todos los proveedores."""
+        indptr = array('q', [0])
+        indices = array('q')
+        data = array('d')
+        for i in range(self.num_rows):
+            lo, hi = self.indptr[i], self.indptr[i + 1]
+            indices.extend(self.indices[lo:hi])
+            indices.append(self.num_cols)
+            data.extend(self.data[lo:hi])
+            data.append(penalties[i])
+            indptr.append(len(indices))
+        return SparseCosts(self.num_rows, self.num_cols + 1, indptr, indices, data)
+
+    def with_data(self, data):
+        """Otra matriz con las mismas rutas permitidas y los valores de data."""
+        return SparseCosts(self.num_rows, self.num_cols, self.indptr, self.indices, array('d', data))
+
+    @property
+    def shape(self):
+        return (self.num_rows, self.num_cols)
+
+    @property
+    def nnz(self):
+        return len(self.indices)
+
+    def __len__(self):
+        return self.num_rows
+
+    def __getitem__(self, i):
+        return _SparseRow(self, i)
+
+    def get(self, i, j, default=None):
+        """Costo de la ruta (i, j), o default si la ruta está prohibida."""
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        k = bisect_left(self.indices, j, lo, hi)
+        if k < hi and self.indices[k] == j:
+            return self.data[k]
+        return default
+
+    def position(self, i, j):
+        """Posición del arco (i, j) en indices/data, o -1 si la ruta está prohibida."""
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        k = bisect_left(self.indices, j, lo, hi)
+        if k < hi and self.indices[k] == j:
+            return k
+        return -1
+
+    def row(self, i):
+        """Consumidores permitidos y costos de la fila i."""
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        return self.indices[lo:hi], self.data[lo:hi]
+
+    def column(self, j):
+        """Proveedores permitidos y costos de la columna j."""
+        col_indptr, col_indices, col_data = self.columns()
+        lo, hi = col_indptr[j], col_indptr[j + 1]
+        return col_indices[lo:hi], col_data[lo:hi]
+
+    def columns(self):
+        """Representación CSC (indptr, proveedores, costos), calculada una vez en O(arcos)."""
+        if self._csc is None:
+            counts = [0] * (self.num_cols + 1)
+            for j in self.indices:
+                counts[j + 1] += 1
+            for j in range(self.num_cols):
+                counts[j + 1] += counts[j]
+            col_indptr = array('q', counts)
+            nnz = self.nnz
+            col_indices = array('q', bytes(8 * nnz))
+            col_data = array('d', bytes(8 * nnz))
+            fill = counts[:-1]
+            for i in range(self.num_rows):
+                for k in range(self.indptr[i], self.indptr[i + 1]):
+                    j = self.indices[k]
+                    col_indices[fill[j]] = i
+                    col_data[fill[j]] = self.data[k]
+                    fill[j] += 1
+            self._csc = (col_indptr, col_indices, col_data)
+        return self._csc
+
+    def arcs(self):
+        """Itera las rutas permitidas como tuplas (proveedor, consumidor, costo) en orden de filas."""
+        indptr, indices, data = self.indptr, self.indices, self.data
+        for i in range(self.num_rows):
+            for k in range(indptr[i], indptr[i + 1]):
+                yield i, indices[k], data[k]
+
+
+class _SparseRow:
+    """Vista de una fila que se indexa como una lista densa (infinito en rutas prohibidas)."""
+    __slots__ = ("matrix", "i")
+
+    def __init__(self, matrix, i):
+        self.matrix = matrix
+        self.i = i
+
+    def __len__(self):
+        return self.matrix.num_cols
+
+    def __getitem__(self, j):
+        return self.matrix.get(self.i, j, INF)
+
+    def __iter__(self):
+        indices, data = self.matrix.row(self.i)
+        dense = [INF] * self.matrix.num_cols
+        for j, c in zip(indices, data):
+            dense[j] = c
+        return iter(dense)
+
+
+class DummyCosts:
+    """
+    Vista de una matriz densa con un nodo ficticio virtual, para problemas no
+    balanceados: un origen ficticio (dummy="row", una fila más con los costos de
+    penalización por consumidor) o un destino ficticio (dummy="column", una
+    columna más con la penalización por proveedor). La matriz original no se
+    copia; costs[i][j] resuelve la celda ficticia al indexar.
+    """
+    __slots__ = ("costs", "dummy", "penalties", "num_rows")
+
+    def __init__(self, costs, dummy, penalties):
+        if dummy not in ("row", "column"):
+            raise ValueError(f"Nodo ficticio desconocido: {dummy}")
+        self.costs = costs
+        self.dummy = dummy
+        self.penalties = penalties
+        self.num_rows = len(costs)
+
+    def __len__(self):
+        return self.num_rows + 1 if self.dummy == "row" else self.num_rows
+
+    @property
+    def out_of_core(self):
+        return getattr(self.costs, "out_of_core", False)
+
+    def __getitem__(self, i):
+        if self.dummy == "row":
+            if i == self.num_rows or i == -1:
+                return self.penalties
+            return self.costs[i]
+        return _DummyColumnRow(self.costs[i], self.penalties[i])
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class _DummyColumnRow:
+    """Fila de DummyCosts con la celda del destino ficticio al final."""
+    __slots__ = ("row", "size", "penalty")
+
+    def __init__(self, row, penalty):
+        self.row = row
+        self.size = len(row)
+        self.penalty = penalty
+
+    def __len__(self):
+        return self.size + 1
+
+    def __getitem__(self, j):
+        if j == self.size or j == -1:
+            return self.penalty
+        return self.row[j]
+
+    def __iter__(self):
+        return chain(self.row, (self.penalty,))
+
+
+class MappedCosts:
+    """
+    Matriz de costos densa en disco, abierta con mmap. costs[i] es una vista
+    (memoryview) de la fila i sin copiarla y costs.column(j) una vista con paso
+    de la columna j, así que los métodos leen la matriz por filas o columnas y la
+    memoria residente queda a cargo de la caché de páginas del sistema.
+
+    El archivo se escribe con write_mapped_costs. Mientras existan vistas de filas
+    obtenidas de la matriz, close() no puede liberar el mapeo.
+    """
+    # Los métodos que lo consultan evitan copias de la matriz completa
+    out_of_core = True
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, typecode, num_rows, num_cols = _MAPPED_HEADER.unpack_from(self._map)
+            typecode = typecode.rstrip(b"\0").decode("ascii")
+            if magic != MAPPED_MAGIC or typecode not in ("d", "q"):
+                raise ValueError(f"{path} no es una matriz de costos en disco.")
+            if sys.byteorder != "little":
+                raise ValueError("Las matrices en disco solo se pueden abrir en equipos little-endian.")
+            end = _MAPPED_HEADER.size + 8 * num_rows * num_cols
+            if len(self._map) < end:
+                raise ValueError(f"{path} está truncado.")
+        except (ValueError, struct.error):
+            self._file.close()
+            raise
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.typecode = typecode
+        self._view = memoryview(self._map)[_MAPPED_HEADER.size:end].cast(typecode)
+
+    @property
+    def shape(self):
+        return (self.num_rows, self.num_cols)
+
+    def __len__(self):
+        return self.num_rows
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.num_rows
+        if not 0 <= i < self.num_rows:
+            raise IndexError(i)
+        cols = self.num_cols
+        return self._view[i * cols:(i + 1) * cols]
+
+    def __iter__(self):
+        return (self[i] for i in range(self.num_rows))
+
+    def column(self, j):
+        """Vista de la columna j (con paso; cada celda está en una fila distinta del archivo)."""
+        return self._view[j::self.num_cols]
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        # Otro proceso vuelve a mapear el archivo en lugar de recibir la matriz
+        return self.path
+
+    def __setstate__(self, path):
+        self.__init__(path)
+
+
+def write_mapped_costs(path, rows, typecode="d"):
+    """
+    Escribe filas de costos (cualquier iterable de secuencias, que se consume una
+    fila a la vez) en el formato de MappedCosts. typecode es "d" (float64) o "q"
+    (int64, modo entero). Retorna (filas, columnas).
+    """
+    if typecode not in ("d", "q"):
+        raise ValueError(f"Tipo de dato no soportado: {typecode}")
+    num_rows = 0
+    num_cols = None
+    with open(path, "wb") as f:
+        f.write(bytes(_MAPPED_HEADER.size))
+        for row in rows:
+            data = array(typecode, row)
+            if num_cols is None:
+                num_cols = len(data)
+            elif len(data) != num_cols:
+                raise ValueError("Todas las filas deben tener el mismo número de columnas.")
+            if sys.byteorder != "little":
+                data.byteswap()
+            f.write(data.tobytes())
+            num_rows += 1
+        num_cols = num_cols or 0
+        f.seek(0)
+        f.write(_MAPPED_HEADER.pack(MAPPED_MAGIC, typecode.encode("ascii"), num_rows, num_cols))
+    return num_rows, num_cols
+
+
+class LazyCosts:
+    """
+    Matriz de costos calculada a pedido: costs[i][j] evalúa function(i, j) la
+    primera vez y la guarda en una caché LRU de a lo sumo cache_size celdas, así
+    que los métodos que leen pocas celdas (esquina noroeste, pasos secuenciales,
+    el costo total) nunca calculan la matriz completa.
+
+    Recorrer una fila (for c in costs[i]) la evalúa en bloque con row_function(i),
+    si se da, y la guarda entera en la caché como una sola entrada de num_cols
+    celdas; column_values(j) hace lo mismo por columnas con column_function(j),
+    sin guardarla. Las filas se calculan de nuevo al salir de la caché, por eso
+    out_of_core es verdadero y el método de Vogel usa la variante de memoria O(m + n).
+    """
+    out_of_core = True
+
+    def __init__(self, num_rows, num_cols, function, row_function=None, column_function=None,
+                 cache_size=DEFAULT_CACHE_CELLS):
+        if cache_size < 0:
+            raise ValueError("El tamaño de la caché no puede ser negativo.")
+        self.num_rows = num_rows
+        self.num_cols = num_cols
+        self.function = function
+        self.row_function = row_function
+        self.column_function = column_function
+        self.cache_size = cache_size
+        self._clear_cache()
+
+    @classmethod
+    def from_coordinates(cls, sources, destinations, metric="euclidean", scale=1, cache_size=DEFAULT_CACHE_CELLS):
+        """
+        Costos a partir de las coordenadas de proveedores y consumidores: scale por
+        la distancia entre sources[i] y destinations[j]. metric es "euclidean",
+        "manhattan", "haversine" (puntos (latitud, longitud) en grados, distancia
+        en km) o una función de dos puntos.
+        """
+        sources = [tuple(p) for p in sources]
+        destinations = [tuple(q) for q in destinations]
+        if callable(metric):
+            distance = metric
+        elif metric in METRICS:
+            distance = METRICS[metric]
+        else:
+            raise ValueError(f"Métrica desconocida: {metric}")
+        if distance is haversine:
+            # Las coordenadas se convierten una sola vez; las filas usan los valores ya convertidos
+            source_points = [_radians_point(p) for p in sources]
+            destination_points = [_radians_point(q) for q in destinations]
+            distance = _haversine_radians
+        else:
+            source_points, destination_points = sources, destinations
+
+        def function(i, j):
+            return scale * distance(source_points[i], destination_points[j])
+
+        def row_function(i):
+            p = source_points[i]
+            return array('d', [scale * distance(p, q) for q in destination_points])
+
+        def column_function(j):
+            q = destination_points[j]
+            return array('d', [scale * distance(p, q) for p in source_points])
+
+        return cls(len(sources), len(destinations), function, row_function, column_function, cache_size)
+
+    @property
+    def shape(self):
+        return (self.num_rows, self.num_cols)
+
+    def __len__(self):
+        return self.num_rows
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.num_rows
+        if not 0 <= i < self.num_rows:
+            raise IndexError(i)
+        return _LazyRow(self, i)
+
+    def __iter__(self):
+        return (_LazyRow(self, i) for i in range(self.num_rows))
+
+    def cell(self, i, j):
+        """Costo de la ruta (i, j), desde la caché si ya se calculó."""
+        cache = self._cache
+        row = cache.get(i)
+        if row is not None:
+            self.hits += 1
+            cache.move_to_end(i)
+            return row[j]
+        key = (i, j)
+        value = cache.get(key)
+        if value is not None:
+            self.hits += 1
+            cache.move_to_end(key)
+            return value
+        self.misses += 1
+        self.evaluations += 1
+        value = self.function(i, j)
+        self._store(key, value, 1)
+        return value
+
+    def row_values(self, i):
+        """Costos de la fila i, calculados en bloque si no están en la caché."""
+        row = self._cache.get(i)
+        if row is not None:
+            self.hits += 1
+            self._cache.move_to_end(i)
+            return row
+        self.misses += 1
+        self.evaluations += self.num_cols
+        if self.row_function is not None:
+            row = self.row_function(i)
+        else:
+            function = self.function
+            row = [function(i, j) for j in range(self.num_cols)]
+        self._store(i, row, self.num_cols)
+        return row
+
+    def column_values(self, j):
+        """Costos de la columna j, calculados en bloque (las columnas no se guardan en la caché)."""
+        self.evaluations += self.num_rows
+        if self.column_function is not None:
+            return self.column_function(j)
+        function = self.function
+        return [function(i, j) for i in range(self.num_rows)]
+
+    def _store(self, key, value, size):
+        if size > self.cache_size:
+            return
+        cache = self._cache
+        cache[key] = value
+        self._cached_cells += size
+        while self._cached_cells > self.cache_size:
+            old_key, old_value = cache.popitem(last=False)
+            self._cached_cells -= 1 if isinstance(old_key, tuple) else len(old_value)
+
+    def cache_info(self):
+        """Estadísticas de la caché: aciertos, fallos, celdas evaluadas y celdas guardadas."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evaluations": self.evaluations,
+            "cached_cells": self._cached_cells,
+            "cache_size": self.cache_size,
+        }
+
+    def _clear_cache(self):
+        self._cache = OrderedDict()  # fila i (bloque) o celda (i, j) -> costo
+        self._cached_cells = 0
+        self.hits = 0
+        self.misses = 0
+        self.evaluations = 0
+
+    def clear_cache(self):
+        self._clear_cache()
+
+    def __getstate__(self):
+        # La caché no viaja a otros procesos
+        state = self.__dict__.copy()
+        del state["_cache"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._clear_cache()
+
+
+class _LazyRow:
+    """Fila de LazyCosts: indexar evalúa una celda y recorrerla evalúa la fila en bloque."""
+    __slots__ = ("matrix", "i")
+
+    def __init__(self, matrix, i):
+        self.matrix = matrix
+        self.i = i
+
+    def __len__(self):
+        return self.matrix.num_cols
+
+    def __getitem__(self, j):
+        if j < 0:
+            j += self.matrix.num_cols
+        if not 0 <= j < self.matrix.num_cols:
+            raise IndexError(j)
+        return self.matrix.cell(self.i, j)
+
+    def __iter__(self):
+        return iter(self.matrix.row_values(self.i))
+
+    def tolist(self):
+        return list(self.matrix.row_values(self.i))
+
+
+def manhattan(p, q):
+    return sum(abs(a - b) for a, b in zip(p, q))
+
+def haversine(p, q):
+    """Distancia en km sobre la superficie terrestre entre dos puntos (latitud, longitud) en grados."""
+    return _haversine_radians(_radians_point(p), _radians_point(q))
+
+def _radians_point(p):
+    lat, lon = math.radians(p[0]), math.radians(p[1])
+    return (lat, lon, math.cos(lat))
+
+def _haversine_radians(p, q):
+    h = math.sin((q[0] - p[0]) / 2) ** 2 + p[2] * q[2] * math.sin((q[1] - p[1]) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+METRICS = {
+    "euclidean": math.dist,
+    "manhattan": manhattan,
+    "haversine": haversine,
+}
+
+
+def with_dummy(costs, dummy, penalties):
+    """
+    Agrega un origen (dummy="row") o destino (dummy="column") ficticio a costs:
+    una vista DummyCosts si la matriz es densa, o una nueva SparseCosts (O(arcos))
+    si es dispersa.
+    """
+    if isinstance(costs, SparseCosts):
+        if dummy == "row":
+            return costs.with_dummy_row(penalties)
+        return costs.with_dummy_column(penalties)
+    return DummyCosts(costs, dummy, penalties)
+
+def complete_flow(costs, flow, supply_remaining, demand_remaining):
+    """
+    Completa un flujo {(i, j): cantidad} sobre las rutas permitidas de una
+    SparseCosts cuando un recorrido voraz quedó bloqueado con oferta y demanda
+    pendientes: busca caminos de aumento (BFS desde los proveedores con oferta,
+    avanzando por rutas permitidas y retrocediendo por celdas con cantidad) y
+    mueve cantidad por ellos hasta agotar la oferta o la demanda pendiente. Modifica flow,
+    supply_remaining y demand_remaining.
+
+    Lanza ValueError si, con oferta y demanda balanceadas, las rutas permitidas no
+    admiten un plan factible.
+    """
+    integral = all(isinstance(x, int) for x in chain(supply_remaining, demand_remaining))
+    tolerance = 0 if integral else 1e-9 * max(1, sum(supply_remaining) + sum(q for q in flow.values()))
+    # Proveedores con cantidad en cada consumidor (aristas de retroceso)
+    senders = {}
+    for (i, j), quantity in flow.items():
+        if quantity > tolerance:
+            senders.setdefault(j, set()).add(i)
+    while True:
+        sources = [i for i, s in enumerate(supply_remaining) if s > tolerance]
+        if not sources or not any(d > tolerance for d in demand_remaining):
+            # Con oferta y demanda no balanceadas queda pendiente lo que sobra de una de ellas
+            return flow
+        reached_by = {}  # consumidor -> proveedor desde el que se llegó
+        came_from = dict.fromkeys(sources)  # proveedor -> consumidor del que se retrocedió
+        queue = deque(sources)
+        target = None
+        while queue and target is None:
+            i = queue.popleft()
+            for j in costs.row(i)[0]:
+                if j in reached_by:
+                    continue
+                reached_by[j] = i
+                if demand_remaining[j] > tolerance:
+                    target = j
+                    break
+                for k in senders.get(j, ()):
+                    if k not in came_from:
+                        came_from[k] = j
+                        queue.append(k)
+        if target is None:
+            if abs(sum(supply_remaining) - sum(demand_remaining)) > tolerance:
+                return flow  # Sin balancear no se exige agotar ambas
+            raise ValueError("El problema no es factible con las rutas permitidas.")
+
+        forward, backward = [], []
+        j = target
+        while True:
+            i = reached_by[j]
+            forward.append((i, j))
+            j = came_from[i]
+            if j is None:
+                break
+            backward.append((i, j))
+        amount = min(supply_remaining[i], demand_remaining[target], *(flow[cell] for cell in backward))
+        for cell in forward:
+            flow[cell] = flow.get(cell, 0) + amount
+            senders.setdefault(cell[1], set()).add(cell[0])
+        for cell in backward:
+            flow[cell] -= amount
+            if flow[cell] <= tolerance:
+                senders[cell[1]].discard(cell[0])
+        supply_remaining[i] -= amount
+        demand_remaining[target] -= amount
+
+def complete_allocations(costs, allocations, supply_remaining, demand_remaining):
+    """
+    Retorna allocations si no quedó oferta o demanda pendiente o, si una matriz
+    SparseCosts bloqueó el recorrido, el plan completado con complete_flow (sin las
+    celdas que quedan vacías). Lanza ValueError si no hay plan factible.
+    """
+    pending = any(s > 0 for s in supply_remaining) and any(d > 0 for d in demand_remaining)
+    if not pending or not isinstance(costs, SparseCosts):
+        return allocations
+    flow = {}
+    for cell, quantity in allocations:
+        flow[cell] = flow.get(cell, 0) + quantity
+    complete_flow(costs, flow, list(supply_remaining), list(demand_remaining))
+    return TransportSolution.from_allocations(
+        ((cell, quantity) for cell, quantity in sorted(flow.items()) if quantity > 0),
+        allocations.num_supply, allocations.num_demand)
@@ -0,0 +1,53 @@
+# cost_matrix/test_cost_matrix.py
+
+import random
+
+import pytest
+
+from benchmarks.instance_generators import forbid_routes, small_instance
+from cost_matrix.cost_matrix import SparseCosts, complete_flow
+from transport_core.transport_core import build_costs, get_method, solve_method
+
+HEURISTICS = ("northwest_corner", "minimum_cost", "sequential_steps", "vogel", "modified_distribution")
+
+
+@pytest.mark.parametrize("method", HEURISTICS)
+def test_blocked_greedy_walk_is_completed(method):
+    costs = build_costs([[1, 1], [1, None]])
+    result = solve_method(method, costs, [5, 5], [5, 5])
+    assert sorted(result["alloc"]) == [((0, 1), 5), ((1, 0), 5)]
+    assert result["cost"] == 10
+
+
+@pytest.mark.parametrize("method", HEURISTICS)
+def test_sparse_plans_are_feasible_or_rejected(method):
+    rng = random.Random(3)
+    network_simplex = get_method("network_simplex")
+    function = get_method(method)
+    for _ in range(300):
+        dense, supply, demand = small_instance(rng)
+        costs = SparseCosts.from_dense(forbid_routes(rng, dense, allowed=0.6))
+        try:
+            network_simplex(costs, supply, demand)
+        except ValueError:
+            with pytest.raises(ValueError):
+                function(costs, supply, demand)
+            continue
+        alloc = function(costs, supply, demand)
+        assert alloc.row_totals() == supply
+        assert alloc.col_totals() == demand
+        assert all(costs.get(i, j) is not None for (i, j), quantity in alloc if quantity)
+
+
+def test_complete_flow_reroutes_through_assigned_cells():
+    # (0, 0) tiene que devolver cantidad para que el proveedor 1 llegue al consumidor 0
+    costs = SparseCosts.from_dense([[1, 1], [1, None]])
+    flow = {(0, 0): 5}
+    complete_flow(costs, flow, [0, 5], [0, 5])
+    assert {cell: q for cell, q in flow.items() if q} == {(0, 1): 5, (1, 0): 5}
+
+
+def test_complete_flow_rejects_infeasible_routes():
+    costs = SparseCosts.from_dense([[1, 1], [None, 1]])
+    with pytest.raises(ValueError):
+        complete_flow(costs, {(0, 0): 5}, [0, 5], [5, 0])
@@ -0,0 +1,162 @@
+# decomposition/decomposition.py
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from cost_matrix.cost_matrix import INF, SparseCosts
+from transport_core.transport_core import METHODS, calculate_cost, is_balanced, solve_method
+from transport_solution.transport_solution import TransportSolution
+
+# Las componentes con al menos este número de rutas se resuelven en otro proceso;
+# las más chicas cuestan menos que enviarlas
+PARALLEL_MIN_ARCS = 10_000
+
+
+def connected_components(costs, num_supply, num_demand):
+    """
+    Componentes conexas del grafo bipartito de rutas permitidas (las celdas de una
+    matriz densa con None o infinito, y las que faltan en una SparseCosts, no son
+    rutas). Retorna una lista de (proveedores, consumidores, rutas), con los
+    índices en orden creciente y rutas el número de rutas de la componente, en
+    el orden del menor nodo de cada una. Un proveedor o consumidor sin rutas
+    forma su propia componente.
+    """
+    parent = list(range(num_supply + num_demand))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    arcs = [0] * num_supply
+    for i in range(num_supply):
+        for j in _allowed_columns(costs, i):
+            arcs[i] += 1
+            a, b = find(i), find(num_supply + j)
+            if a != b:
+                parent[b] = a
+
+    components = {}
+    for node in range(num_supply + num_demand):
+        rows, cols, count = components.setdefault(find(node), ([], [], [0]))
+        if node < num_supply:
+            rows.append(node)
+            count[0] += arcs[node]
+        else:
+            cols.append(node - num_supply)
+    return [(rows, cols, count[0]) for rows, cols, count in components.values()]
+
+def _allowed_columns(costs, i):
+    if isinstance(costs, SparseCosts):
+        return costs.row(i)[0]
+    return [j for j, c in enumerate(costs[i]) if c is not None and c != INF]
+
+def component_instance(costs, rows, cols):
+    """
+    Submatriz de costs con los proveedores rows y consumidores cols: una SparseCosts
+    si tiene rutas prohibidas, o si no filas densas del mismo tipo que las originales.
+    """
+    if isinstance(costs, SparseCosts):
+        position = {j: k for k, j in enumerate(cols)}
+        arcs = []
+        for new_i, i in enumerate(rows):
+            indices, data = costs.row(i)
+            arcs.extend((new_i, position[j], c) for j, c in zip(indices, data))
+        return SparseCosts.from_arcs(len(rows), len(cols), arcs)
+    block = []
+    for i in rows:
+        row = costs[i]
+        values = [row[j] for j in cols]
+        block.append(array(row.typecode, values) if isinstance(row, array) else values)
+    if any(c is None or c == INF for values in block for c in values):
+        return SparseCosts.from_dense(block)
+    return block
+
+def solve_decomposed(method, costs, supply, demand, shortage_costs=None, surplus_costs=None, workers=None):
+    """
+    Resuelve cada componente conexa de rutas permitidas como una instancia aparte
+    (ver connected_components) y reúne las asignaciones con los índices originales.
+    Cada componente se balancea por separado: la demanda que sus proveedores no
+    alcanzan a cubrir queda insatisfecha aunque sobre oferta en otra región.
+    Las componentes con al menos PARALLEL_MIN_ARCS rutas se reparten entre workers
+    procesos (por defecto, os.cpu_count()); las demás se resuelven en este.
+
+    Retorna:
+        dict: Lo mismo que solve_method, más "components", una lista con
+        "supply_nodes" y "demand_nodes" (índices originales), "balanced" y "cost"
+        por componente.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Método desconocido: {method}")
+    num_supply, num_demand = len(supply), len(demand)
+    components = connected_components(costs, num_supply, num_demand)
+
+    tasks = []
+    for rows, cols, arcs in components:
+        sub_supply = [supply[i] for i in rows]
+        sub_demand = [demand[j] for j in cols]
+        info = {"supply_nodes": rows, "demand_nodes": cols,
+                "balanced": is_balanced(sub_supply, sub_demand), "cost": 0}
+        if arcs:
+            args = (method, component_instance(costs, rows, cols), sub_supply, sub_demand,
+                    None if shortage_costs is None else [shortage_costs[j] for j in cols],
+                    None if surplus_costs is None else [surplus_costs[i] for i in rows])
+        else:
+            args = None  # Nodo aislado: todo lo que tenga queda sin asignar
+        tasks.append((info, arcs, args))
+
+    parallel = [k for k, (_, arcs, _) in enumerate(tasks) if arcs >= PARALLEL_MIN_ARCS]
+    workers = workers or os.cpu_count() or 1
+    results = [None] * len(tasks)
+    futures = {}
+    executor = None
+    if len(parallel) > 1 and workers > 1:
+        executor = ProcessPoolExecutor(max_workers=min(len(parallel), workers))
+    try:
+        if executor is not None:
+            futures = {k: executor.submit(solve_method, *tasks[k][2]) for k in parallel}
+        # Las componentes chicas se resuelven aquí mientras los procesos trabajan
+        for k, (_, _, args) in enumerate(tasks):
+            if args is not None and k not in futures:
+                results[k] = solve_method(*args)
+        for k, future in futures.items():
+            results[k] = future.result()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    integral = all(isinstance(x, int) for x in supply) and all(isinstance(x, int) for x in demand)
+    alloc = TransportSolution(num_supply, num_demand, integral)
+    unmet_demand = [0] * num_demand
+    unused_supply = [0] * num_supply
+    penalty_cost = 0
+    for (info, _, _), result in zip(tasks, results):
+        rows, cols = info["supply_nodes"], info["demand_nodes"]
+        if result is None:
+            for i in rows:
+                unused_supply[i] = supply[i]
+            for j in cols:
+                unmet_demand[j] = demand[j]
+            if shortage_costs is not None:
+                penalty_cost += sum(demand[j] * shortage_costs[j] for j in cols)
+            if surplus_costs is not None:
+                penalty_cost += sum(supply[i] * surplus_costs[i] for i in rows)
+            continue
+        for ((i, j), quantity) in result["alloc"]:
+            alloc.append(rows[i], cols[j], quantity)
+        for k, quantity in enumerate(result["unmet_demand"]):
+            unmet_demand[cols[k]] = quantity
+        for k, quantity in enumerate(result["unused_supply"]):
+            unused_supply[rows[k]] = quantity
+        penalty_cost += result["penalty_cost"]
+        info["cost"] = result["cost"]
+    return {
+        "alloc": alloc,
+        "cost": calculate_cost(alloc, costs),
+        "unmet_demand": unmet_demand,
+        "unused_supply": unused_supply,
+        "penalty_cost": penalty_cost,
+        "components": [info for info, _, _ in tasks],
+    }
@@ -0,0 +1,84 @@
+# decomposition/test_decomposition.py
+
+import random
+
+import pytest
+
+from benchmarks.instance_generators import small_instance
+from cost_matrix.cost_matrix import SparseCosts
+from decomposition import decomposition
+from decomposition.decomposition import connected_components, solve_decomposed
+from transport_core.transport_core import solve_method
+
+
+def block_instance(rng, blocks):
+    """Instancia con blocks regiones sin rutas entre sí, con las filas y columnas mezcladas."""
+    parts = [small_instance(rng, max_size=5, zeros=False) for _ in range(blocks)]
+    num_supply = sum(len(supply) for _, supply, _ in parts)
+    num_demand = sum(len(demand) for _, _, demand in parts)
+    row_order = list(range(num_supply))
+    col_order = list(range(num_demand))
+    rng.shuffle(row_order)
+    rng.shuffle(col_order)
+    costs = [[None] * num_demand for _ in range(num_supply)]
+    supply, demand = [0] * num_supply, [0] * num_demand
+    i0 = j0 = 0
+    for block_costs, block_supply, block_demand in parts:
+        for i, row in enumerate(block_costs):
+            supply[row_order[i0 + i]] = block_supply[i]
+            for j, c in enumerate(row):
+                costs[row_order[i0 + i]][col_order[j0 + j]] = c
+        for j, quantity in enumerate(block_demand):
+            demand[col_order[j0 + j]] = quantity
+        i0 += len(block_supply)
+        j0 += len(block_demand)
+    return SparseCosts.from_dense(costs), supply, demand
+
+
+@pytest.mark.parametrize("seed", range(15))
+def test_matches_the_monolithic_optimum(seed):
+    rng = random.Random(seed)
+    costs, supply, demand = block_instance(rng, rng.randint(1, 4))
+    expected = solve_method("network_simplex", costs, supply, demand)
+    for method in ("modified_distribution", "network_simplex"):
+        result = solve_decomposed(method, costs, supply, demand)
+        assert result["cost"] == expected["cost"]
+        assert result["alloc"].row_totals() == supply
+        assert result["alloc"].col_totals() == demand
+        assert sum(info["cost"] for info in result["components"]) == result["cost"]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_parallel_components_match_the_serial_solve(monkeypatch, seed):
+    rng = random.Random(seed)
+    costs, supply, demand = block_instance(rng, 3)
+    serial = solve_decomposed("vogel", costs, supply, demand)
+    monkeypatch.setattr(decomposition, "PARALLEL_MIN_ARCS", 1)
+    parallel = solve_decomposed("vogel", costs, supply, demand, workers=2)
+    assert parallel["cost"] == serial["cost"]
+    assert sorted(parallel["alloc"]) == sorted(serial["alloc"])
+
+
+def test_each_component_is_balanced_separately():
+    # Dos regiones: {0} -> {0} con sobrante y {1} -> {1} con faltante
+    costs = SparseCosts.from_dense([[2, None], [None, 3]])
+    result = solve_decomposed("vogel", costs, [5, 1], [3, 4], shortage_costs=[0, 10], surplus_costs=[1, 0])
+    assert result["alloc"] == [((0, 0), 3), ((1, 1), 1)]
+    assert result["unused_supply"] == [2, 0]
+    assert result["unmet_demand"] == [0, 3]
+    assert result["penalty_cost"] == 2 * 1 + 3 * 10
+    assert [info["balanced"] for info in result["components"]] == [False, False]
+
+
+def test_isolated_nodes_keep_their_quantities():
+    costs = SparseCosts.from_dense([[1, None], [None, None]])
+    result = solve_decomposed("vogel", costs, [2, 4], [2, 3], shortage_costs=[0, 5])
+    assert result["unused_supply"] == [0, 4]
+    assert result["unmet_demand"] == [0, 3]
+    assert result["penalty_cost"] == 15
+    assert len(connected_components(costs, 2, 2)) == 3
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        solve_decomposed("simplex", [[1]], [1], [1])
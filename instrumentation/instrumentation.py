@@ -0,0 +1,122 @@
+# instrumentation/instrumentation.py
+
+import threading
+import time
+import tracemalloc
+
+from transport_core.transport_core import balance_instance, dispatch_method, get_method, solution_result
+
+# Contadores que reportan los métodos (ver record_counters)
+COUNTERS = ("iterations", "pivots", "cells_examined")
+
+_state = threading.local()
+
+# tracemalloc es global al proceso: las mediciones de memoria activas (en cualquier
+# hilo) se cuentan para que solo la primera reinicie el máximo y la última lo detenga
+_tracing_lock = threading.Lock()
+_tracing_active = 0
+_tracing_started = False
+
+
+def record_counters(**counters):
+    """
+    Suma contadores a la medición en curso en este hilo, si hay alguna. Los métodos
+    la llaman una sola vez al terminar, con los totales que llevan en variables
+    locales, así que fuera de una medición no cuesta nada:
+    "iterations" (pasos del método), "pivots" (pivotes del simplex o del MODI) y
+    "cells_examined" (celdas de la matriz de costos leídas o recorridas).
+    """
+    stats = getattr(_state, "counters", None)
+    if stats is not None:
+        for name, value in counters.items():
+            stats[name] = stats.get(name, 0) + value
+
+
+class Measurement:
+    """
+    Mide el bloque with: tiempo de pared y de CPU del hilo, memoria máxima
+    reservada (solo con trace_memory, porque tracemalloc hace más lento el
+    cálculo) y los contadores que reporten los métodos ejecutados dentro.
+    Las mediciones se pueden anidar; los contadores van a la más interna.
+
+    tracemalloc guarda un solo máximo para todo el proceso. Si otra medición de
+    memoria ya está activa (anidada o en otro hilo) el máximo no se reinicia, así
+    que "peak_memory" es una cota superior que incluye lo que reserve la otra.
+
+        with Measurement() as measurement:
+            alloc = vogel_approximation_method(costs, supply, demand)
+        measurement.stats["cells_examined"]
+    """
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stats = None
+
+    def __enter__(self):
+        self._outer = getattr(_state, "counters", None)
+        self._counters = _state.counters = dict.fromkeys(COUNTERS, 0)
+        if self.trace_memory:
+            global _tracing_active, _tracing_started
+            with _tracing_lock:
+                if _tracing_active == 0:
+                    if not tracemalloc.is_tracing():
+                        tracemalloc.start()
+                        _tracing_started = True
+                    tracemalloc.reset_peak()
+                _tracing_active += 1
+                self._memory_baseline = tracemalloc.get_traced_memory()[0]
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        cpu_time = time.thread_time() - self._cpu_start
+        wall_time = time.perf_counter() - self._wall_start
+        peak_memory = None
+        if self.trace_memory:
+            global _tracing_active, _tracing_started
+            with _tracing_lock:
+                peak_memory = max(0, tracemalloc.get_traced_memory()[1] - self._memory_baseline)
+                _tracing_active -= 1
+                if _tracing_active == 0 and _tracing_started:
+                    tracemalloc.stop()
+                    _tracing_started = False
+        _state.counters = self._outer
+        self.stats = dict(self._counters, wall_time=wall_time, cpu_time=cpu_time, peak_memory=peak_memory)
+        return False
+
+
+def degenerate_allocations(alloc, num_supply, num_demand):
+    """
+    Celdas básicas que faltan en una solución básica de la instancia balanceada:
+    m + n - 1 menos las asignaciones positivas (una por cada vez que una
+    asignación agotó a la vez una fila y una columna).
+    """
+    positive = sum(1 for _, quantity in alloc if quantity > 0)
+    return max(0, num_supply + num_demand - 1 - positive)
+
+def measure_solve(method, costs, supply, demand, shortage_costs=None, surplus_costs=None,
+                  trace_memory=False, hook=None):
+    """
+    Igual que solve_method, con la medición del método en result["stats"]:
+    "method", "solver" (el método que se ejecutó de verdad, ver dispatch_method),
+    "wall_time" y "cpu_time" (segundos), "peak_memory" (bytes, o None
+    sin trace_memory), "iterations", "pivots", "cells_examined", "allocations"
+    (rutas de la instancia balanceada) y "degenerate" (ver degenerate_allocations).
+    Si se da, hook(stats) se llama al terminar.
+    """
+    num_supply, num_demand = len(supply), len(demand)
+    costs, supply, demand, dummy = balance_instance(costs, supply, demand, shortage_costs, surplus_costs)
+    solver = dispatch_method(method, supply, demand)
+    function = get_method(solver)
+    with Measurement(trace_memory) as measurement:
+        alloc = function(costs, list(supply), list(demand))
+    stats = measurement.stats
+    stats["method"] = method
+    stats["solver"] = solver
+    stats["allocations"] = len(alloc)
+    stats["degenerate"] = degenerate_allocations(alloc, len(supply), len(demand))
+    if hook is not None:
+        hook(stats)
+    result = solution_result(alloc, costs, dummy, num_supply, num_demand, shortage_costs, surplus_costs)
+    result["stats"] = stats
+    return result
@@ -0,0 +1,65 @@
+# instrumentation/test_instrumentation.py
+
+import threading
+import tracemalloc
+
+from instrumentation.instrumentation import Measurement, measure_solve, record_counters
+
+BLOCK = 2_000_000
+
+
+def test_nested_memory_measurements():
+    with Measurement(trace_memory=True) as outer:
+        data = bytearray(BLOCK)
+        del data
+        with Measurement(trace_memory=True) as inner:
+            record_counters(iterations=3)
+        # La interna no reinicia el máximo de la externa ni detiene el rastreo
+        assert tracemalloc.is_tracing()
+        record_counters(iterations=1)
+    assert not tracemalloc.is_tracing()
+    assert outer.stats["peak_memory"] >= BLOCK // 2
+    # Los contadores van a la medición más interna
+    assert inner.stats["iterations"] == 3
+    assert outer.stats["iterations"] == 1
+
+
+def test_overlapping_measurements_in_threads():
+    # a empieza y termina mientras b está activa; b reserva después de que a termina
+    a_started, a_finished = threading.Event(), threading.Event()
+    b_started = threading.Event()
+    peaks = {}
+
+    def first():
+        with Measurement(trace_memory=True) as measurement:
+            a_started.set()
+            b_started.wait()
+        peaks["a"] = measurement.stats["peak_memory"]
+        a_finished.set()
+
+    def second():
+        a_started.wait()
+        with Measurement(trace_memory=True) as measurement:
+            b_started.set()
+            a_finished.wait()
+            data = bytearray(BLOCK)
+            del data
+        peaks["b"] = measurement.stats["peak_memory"]
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not tracemalloc.is_tracing()
+    assert peaks["a"] >= 0
+    assert peaks["b"] >= BLOCK // 2
+
+
+def test_measure_solve_stats():
+    result = measure_solve("vogel", [[4, 1], [2, 3]], [5, 5], [4, 6], trace_memory=True)
+    stats = result["stats"]
+    assert stats["method"] == stats["solver"] == "vogel"
+    assert stats["allocations"] == len(result["alloc"])
+    assert stats["cells_examined"] > 0 and stats["peak_memory"] >= 0
+    assert not tracemalloc.is_tracing()
@@ -1,29 +1,63 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import string
+from tkinter import ttk, messagebox, filedialog
 import platform  # Para detectar el sistema operativo
-
-# Importar los métodos existentes
-from northwest_corner.northwest_corner import northwest_corner_method
-from vogel_approximation.vogel_approximation import vogel_approximation_method
-from minimum_cost.minimum_cost import minimum_cost_method
-
-# Importar los nuevos métodos
-from sequential_steps.sequential_steps import sequential_steps_method
-from modified_distribution.modified_distribution import modified_distribution_method_with_prior  # Actualizado
-
-def calculate_cost(allocations, costs):
-    total = 0
-    for ((i, j), alloc) in allocations:
-        total += alloc * costs[i][j]
-    return total
-
-def index_to_letter(index):
-    if index < 26:
-        return string.ascii_uppercase[index]
-    else:
-        # Para índices >=26, usar letras dobles como AA, AB, etc.
-        return string.ascii_uppercase[index // 26 - 1] + string.ascii_uppercase[index % 26]
+import zipfile
+from functools import partial
+from itertools import chain, islice
+
+# Núcleo sin interfaz gráfica compartido con la línea de comandos (cli.py)
+from transport_core.transport_core import (
+    HEURISTIC_METHODS, METHOD_LABELS, balance_instance, build_costs, calculate_cost, index_to_letter,
+    parse_cost, parse_number, prepare_instance, split_dummy
+)
+from modified_distribution.modified_distribution import (  # Optimizador MODI (u-v)
+    modified_distribution_resolve, modified_distribution_solve
+)
+from instrumentation.instrumentation import Measurement, degenerate_allocations, measure_solve  # Métricas por método
+from result_cache.result_cache import default_cache, instance_key  # Resultados de instancias ya resueltas
+from solve_worker.solve_worker import SolveWorker  # Cálculos fuera del bucle de Tk
+from table_io.table_io import read_table, split_table  # Importación de CSV/XLSX
+from virtual_grid.virtual_grid import VirtualGrid  # Tabla que solo dibuja lo visible
+
+# Intervalo con que la interfaz revisa el avance del cálculo en segundo plano
+POLL_INTERVAL_MS = 50
+# Filas que se insertan en una tabla de resultados antes de ceder el control a Tk
+ROWS_PER_CHUNK = 500
+# Hasta este número de celdas se mide la memoria máxima de cada método (tracemalloc lo hace más lento)
+TRACE_MEMORY_MAX_CELLS = 250_000
+
+def solve_modified_distribution(balanced, num_supply, num_demand, prior_alloc, previous):
+    """
+    Resuelve Distribución Modificada sobre la instancia balanceada (el nodo ficticio
+    se completa desde prior_alloc), re-optimizando desde previous si tiene la misma
+    forma. Se ejecuta en el hilo de SolveWorker, sin tocar widgets.
+    Retorna (resultado completo, resultado para la tabla de métodos).
+    """
+    costs, supply, demand, dummy = balanced
+    shape = (num_supply, num_demand, dummy)
+    with Measurement(len(supply) * len(demand) <= TRACE_MEMORY_MAX_CELLS) as measurement:
+        if previous is not None and previous["shape"] == shape:
+            # Re-optimizar desde la base anterior tras editar oferta, demanda o costos
+            md_result = modified_distribution_resolve(costs, list(supply), list(demand), previous)
+        else:
+            md_result = modified_distribution_solve(costs, list(supply), list(demand), prior_alloc)
+    md_result["shape"] = shape
+    stats = measurement.stats
+    stats["method"] = "modified_distribution"
+    stats["solver"] = "modified_distribution"
+    stats["allocations"] = len(md_result["alloc"])
+    stats["degenerate"] = degenerate_allocations(md_result["alloc"], len(supply), len(demand))
+    md_alloc, unmet_demand, unused_supply = split_dummy(md_result["alloc"], dummy, num_supply, num_demand)
+    summary = {
+        "alloc": md_alloc,
+        "cost": calculate_cost(md_alloc, costs),
+        "unmet_demand": unmet_demand,
+        "unused_supply": unused_supply,
+        "pivots": md_result["pivots"],
+        "reduced_costs": md_result["reduced_costs"],
+        "stats": stats
+    }
+    return md_result, summary
 
 class ScrollableFrame(ttk.Frame):
     """
@@ -131,7 +165,8 @@ class TransportationProblemGUI:
         self.num_demand = tk.IntVar(value=4)
         ttk.Entry(self.input_frame, textvariable=self.num_demand, width=5).grid(row=1, column=1, sticky=tk.W, padx=5)
 
-        ttk.Button(self.input_frame, text="Crear Tabla", command=self.create_tables).grid(row=2, column=0, columnspan=2, pady=5)
+        ttk.Button(self.input_frame, text="Crear Tabla", command=self.create_tables).grid(row=2, column=0, pady=5)
+        ttk.Button(self.input_frame, text="Importar CSV/XLSX", command=self.import_table).grid(row=2, column=1, pady=5)
 
         # Frame para botones de métodos (empaquetado único en la parte superior)
         self.methods_buttons_frame = ttk.Frame(master)
@@ -152,6 +187,16 @@ class TransportationProblemGUI:
         self.btn_seq_steps.pack(side="left", padx=5)        # Nuevo botón
         self.btn_mod_dist.pack(side="left", padx=5)         # Nuevo botón
 
+        # Avance del cálculo en segundo plano
+        self.status_frame = ttk.Frame(master)
+        self.status_frame.pack(padx=10, pady=5)
+        self.status = tk.StringVar(value="")
+        self.progress = ttk.Progressbar(self.status_frame, length=200, mode="determinate")
+        self.progress.pack(side="left", padx=5)
+        ttk.Label(self.status_frame, textvariable=self.status, width=55).pack(side="left", padx=5)
+        self.cancel_button = ttk.Button(self.status_frame, text="Cancelar", command=self.cancel_worker, state="disabled")
+        self.cancel_button.pack(side="left", padx=5)
+
         # Frame para tablas
         self.tables_frame = ttk.Frame(master)
         self.tables_frame.pack(padx=10, pady=10, anchor='center')  # Centrar la tabla
@@ -163,13 +208,23 @@ class TransportationProblemGUI:
         # Inicializar variables para resultados
         self.methods_results = {}
         self.prior_method_for_md = None  # Variable para almacenar el método previo seleccionado
+        self.md_previous = {}  # Último resultado de Distribución Modificada por método previo
+        self.worker = None  # SolveWorker en curso
+        self.worker_on_done = None
+        # Vistas de resultados: se construyen una vez por resolución y se reutilizan
+        self.results_view = None  # Marco con la comparación y la matriz de costos compartida
+        self.tree_summary = None  # Tabla "Comparación de Métodos"
+        self.summary_items = {}  # Fila de cada método en tree_summary
+        self.methods_container = None
+        self.method_views = {}  # Sección ya construida de cada método
+        self.visible_method_view = None
 
     def create_tables(self):
+        self.cancel_worker()
+        self.reset_results_view()
         # Limpiar tablas anteriores
         for widget in self.tables_frame.winfo_children():
             widget.destroy()
-        for widget in self.results_frame.winfo_children():
-            widget.destroy()
 
         self.num_supply_val = self.num_supply.get()
         self.num_demand_val = self.num_demand.get()
@@ -178,106 +233,138 @@ class TransportationProblemGUI:
         table_container = ttk.Frame(self.tables_frame)
         table_container.pack()
 
-        # Configurar el ancho mínimo de la columna 0 para mostrar "Demanda" completamente
-        table_container.grid_columnconfigure(0, minsize=200)  # Incrementado a 200
-
-        # Crear tabla de costos
-        ttk.Label(table_container, text="Costos").grid(row=0, column=1, padx=5, pady=5, sticky=tk.W)
-        self.costs_entries = []
-        for i in range(self.num_supply_val):
-            row_entries = []
-            for j in range(self.num_demand_val):
-                e = ttk.Entry(table_container, width=10)  # Aumentar ancho para mejor visualización
-                e.grid(row=i+1, column=j+1, padx=2, pady=2)
-                row_entries.append(e)
-            self.costs_entries.append(row_entries)
-
-        # Crear entradas de oferta
-        ttk.Label(table_container, text="Oferta").grid(row=0, column=self.num_demand_val + 1, padx=5, pady=5, sticky=tk.W)
-        self.supply_entries = []
-        for i in range(self.num_supply_val):
-            e = ttk.Entry(table_container, width=10)
-            e.grid(row=i+1, column=self.num_demand_val + 1, padx=2, pady=2)
-            self.supply_entries.append(e)
-
-        # Crear entradas de demanda
-        ttk.Label(table_container, text="Demanda").grid(row=self.num_supply_val + 1, column=0, padx=5, pady=5, sticky=tk.W)
-        self.demand_entries = []
-        for j in range(self.num_demand_val):
-            e = ttk.Entry(table_container, width=10)
-            e.grid(row=self.num_supply_val + 1, column=j+1, padx=2, pady=2)
-            self.demand_entries.append(e)
+        # Tabla virtual de costos, oferta (última columna) y demanda (última fila):
+        # solo se dibujan las celdas visibles
+        self.grid_table = VirtualGrid(table_container, self.num_supply_val, self.num_demand_val)
+        self.grid_table.pack(fill="both", expand=True)
+        self.grid_table.bind("<<GridResized>>", lambda event: self.sync_table_size())
 
         # Botón para resolver
-        ttk.Button(table_container, text="Resolver", command=self.solve).grid(row=self.num_supply_val + 2, column=0, columnspan=self.num_demand_val + 2, pady=10)
+        ttk.Button(table_container, text="Resolver", command=self.solve).pack(pady=10)
+
+    def import_table(self):
+        """Carga la tabla completa desde un archivo CSV o XLSX con la disposición de la tabla."""
+        path = filedialog.askopenfilename(
+            title="Importar tabla",
+            filetypes=[("Tablas", "*.csv *.tsv *.txt *.xlsx"), ("Todos los archivos", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            cost_rows, supply, demand = split_table(read_table(path))
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as error:
+            messagebox.showerror("Error al importar", str(error))
+            return
+        self.num_supply.set(len(supply))
+        self.num_demand.set(len(demand))
+        self.create_tables()
+        self.grid_table.set_table(cost_rows, supply, demand)
+
+    def sync_table_size(self):
+        # Pegar un bloque más grande agranda la tabla
+        self.num_supply.set(self.grid_table.num_supply)
+        self.num_demand.set(self.grid_table.num_demand)
+        self.num_supply_val = self.grid_table.num_supply
+        self.num_demand_val = self.grid_table.num_demand
 
     def solve(self):
         try:
-            # Obtener costos
-            costs = []
-            for row in self.costs_entries:
-                cost_row = []
-                for e in row:
-                    val = float(e.get())
-                    cost_row.append(val)
-                costs.append(cost_row)
-            self.costs = costs  # Almacenar costos para uso posterior
+            # Obtener costos (una celda vacía o "-" es una ruta prohibida)
+            self.grid_table.finish_edit()
+            cost_rows = self.grid_table.cost_rows()
+            costs = build_costs([[parse_cost(text) for text in row] for row in cost_rows])
             # Obtener oferta
-            supply = []
-            for e in self.supply_entries:
-                val = float(e.get())
-                supply.append(val)
-            self.supply = supply  # Almacenar oferta para uso posterior
+            supply_text = self.grid_table.supply()
+            supply = [parse_number(text) for text in supply_text]
             # Obtener demanda
-            demand = []
-            for e in self.demand_entries:
-                val = float(e.get())
-                demand.append(val)
-            self.demand = demand  # Almacenar demanda para uso posterior
-            # Verificar balance
-            if sum(supply) != sum(demand):
-                messagebox.showerror("Error", "La oferta y la demanda no están balanceadas.")
-                return
-            # Resolver métodos
-            nc_alloc = northwest_corner_method(costs, supply.copy(), demand.copy())
-            v_alloc = vogel_approximation_method(costs, supply.copy(), demand.copy())
-            mc_alloc = minimum_cost_method(costs, supply.copy(), demand.copy())
-            ss_alloc = sequential_steps_method(costs, supply.copy(), demand.copy())
-            # Nota: No resolver Distribución Modificada aquí
-
-            # Calcular costos
-            nc_cost = calculate_cost(nc_alloc, costs)
-            v_cost = calculate_cost(v_alloc, costs)
-            mc_cost = calculate_cost(mc_alloc, costs)
-            ss_cost = calculate_cost(ss_alloc, costs)
-            # Nota: Distribución Modificada se resolverá cuando el usuario la seleccione
-
-            # Guardar resultados
-            self.methods_results = {
-                "Esquina Noroeste": {
-                    "alloc": nc_alloc,
-                    "cost": nc_cost
-                },
-                "Vogel": {
-                    "alloc": v_alloc,
-                    "cost": v_cost
-                },
-                "Costo Mínimo": {
-                    "alloc": mc_alloc,
-                    "cost": mc_cost
-                },
-                "Pasos Secuenciales": {
-                    "alloc": ss_alloc,
-                    "cost": ss_cost
-                }
-                # "Distribución Modificada" se agregará posteriormente
-            }
-
-            # Mostrar resultados del método Esquina Noroeste por defecto
-            self.display_method("Esquina Noroeste")
-
+            demand_text = self.grid_table.demand()
+            demand = [parse_number(text) for text in demand_text]
+            # Modo entero cuando los valores lo permiten
+            costs, supply, demand = prepare_instance(costs, supply, demand)
+            # Si no está balanceada, un origen o destino ficticio absorbe la diferencia
+            balanced = balance_instance(costs, supply, demand)
         except ValueError:
             messagebox.showerror("Error", "Por favor, ingresa valores numéricos válidos.")
+            return
+
+        self.table_text = (cost_rows, supply_text, demand_text)  # Textos tal como se resolvieron
+        self.num_supply_val, self.num_demand_val = len(supply), len(demand)
+        self.costs = costs  # Almacenar costos para uso posterior
+        self.supply = supply  # Almacenar oferta para uso posterior
+        self.demand = demand  # Almacenar demanda para uso posterior
+        self.balanced = balanced
+
+        # Limpiar resultados anteriores (las entradas cambiaron); cada método aparece al terminar
+        self.methods_results = {}
+        self.reset_results_view()
+
+        # Resolver métodos en segundo plano
+        # Nota: Distribución Modificada se resolverá cuando el usuario la seleccione
+        # Si nada cambió desde un cálculo anterior, los resultados salen de la caché
+        trace_memory = len(supply) * len(demand) <= TRACE_MEMORY_MAX_CELLS
+        solver = partial(measure_solve, trace_memory=trace_memory)
+        key = []  # La huella se calcula una sola vez, en el hilo del SolveWorker
+
+        def solve_cached(method):
+            if not key:
+                key.append(instance_key(costs, supply, demand))
+            return default_cache().solve(method, costs, supply, demand, key=key[0], solver=solver)
+
+        tasks = [(METHOD_LABELS[method], solve_cached, (method,)) for method in HEURISTIC_METHODS]
+        self.start_worker(tasks, self.on_heuristic_solved)
+
+    def on_heuristic_solved(self, method_name, result):
+        self.methods_results[method_name] = result
+        if self.results_view is None:
+            # El primer método en terminar (Esquina Noroeste) se muestra por defecto
+            self.display_method(method_name)
+        else:
+            self.update_summary_row(method_name)
+
+    def start_worker(self, tasks, on_done):
+        """Ejecuta tasks en un SolveWorker; on_done(nombre, resultado) se llama en el hilo de Tk."""
+        self.cancel_worker()
+        self.worker = SolveWorker(tasks)
+        self.worker_on_done = on_done
+        self.progress.configure(maximum=len(tasks), value=0)
+        self.cancel_button.configure(state="normal")
+        self.worker.start()
+        self.master.after(POLL_INTERVAL_MS, self.poll_worker, self.worker)
+
+    def poll_worker(self, worker):
+        if worker is not self.worker:
+            # Cancelado o reemplazado por otro cálculo
+            return
+        for message in worker.poll():
+            kind = message[0]
+            if kind == "started":
+                _, name, index, total = message
+                self.status.set(f"Resolviendo {name}... ({index + 1}/{total})")
+            elif kind == "done":
+                _, name, result = message
+                self.advance_progress()
+                self.worker_on_done(name, result)
+            elif kind == "error":
+                _, name, error = message
+                self.advance_progress()
+                messagebox.showerror(f"Error en {name}", str(error))
+            elif kind == "finished":
+                self.worker = None
+                self.cancel_button.configure(state="disabled")
+                self.status.set("Listo.")
+                return
+        self.master.after(POLL_INTERVAL_MS, self.poll_worker, worker)
+
+    def advance_progress(self):
+        self.progress.configure(value=float(self.progress.cget("value")) + 1)
+
+    def cancel_worker(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+            self.cancel_button.configure(state="disabled")
+            # El método en curso no se interrumpe: termina en segundo plano y se descarta
+            self.status.set("Cancelado (el método en curso termina en segundo plano).")
 
     def display_method(self, method_name):
         if not self.methods_results:
@@ -285,57 +372,128 @@ class TransportationProblemGUI:
             return
 
         if method_name == "Distribución Modificada":
+            if self.worker is not None:
+                messagebox.showinfo("Resolviendo", "Espera a que termine el cálculo en curso o cancélalo.")
+                return
             self.prior_method_for_md = self.prompt_prior_method()
             if not self.prior_method_for_md:
                 # El usuario canceló la selección
                 return
-            prior_alloc = self.methods_results[self.prior_method_for_md]["alloc"]
-            try:
-                # Ejecutar Distribución Modificada con el método previo seleccionado
-                md_alloc = modified_distribution_method_with_prior(
-                    self.costs, self.supply.copy(), self.demand.copy(), prior_alloc
-                )
-                md_cost = calculate_cost(md_alloc, self.costs)
-                # Guardar el resultado de Distribución Modificada
-                self.methods_results["Distribución Modificada"] = {
-                    "alloc": md_alloc,
-                    "cost": md_cost
-                }
-            except ValueError as ve:
-                messagebox.showerror("Error en Distribución Modificada", str(ve))
+            if self.prior_method_for_md not in self.methods_results:
+                messagebox.showerror("Error", "El método previo no tiene resultado.")
                 return
-            self.current_method.set("Distribución Modificada")
-        else:
-            self.current_method.set(method_name)
-
-        # Limpiar resultados anteriores
+            prior_alloc = self.methods_results[self.prior_method_for_md]["alloc"]
+            # Ejecutar Distribución Modificada con el método previo seleccionado
+            previous = self.md_previous.get(self.prior_method_for_md)
+            args = (self.balanced, len(self.supply), len(self.demand), prior_alloc, previous)
+            self.start_worker([("Distribución Modificada", solve_modified_distribution, args)],
+                              self.on_modified_distribution_solved)
+            return
+        if method_name not in self.methods_results:
+            messagebox.showinfo("Resolviendo", f"{method_name} aún se está resolviendo.")
+            return
+        self.current_method.set(method_name)
+        self.show_method(method_name)
+
+    def on_modified_distribution_solved(self, method_name, result):
+        md_result, summary = result
+        self.md_previous[self.prior_method_for_md] = md_result
+        # Guardar el resultado de Distribución Modificada; su vista anterior ya no vale
+        self.methods_results[method_name] = summary
+        self.invalidate_method_view(method_name)
+        if self.results_view is not None:
+            self.update_summary_row(method_name)
+        self.current_method.set(method_name)
+        self.show_method(method_name)
+
+    def reset_results_view(self):
+        """Descarta todas las vistas de resultados (al cambiar las entradas)."""
         for widget in self.results_frame.winfo_children():
             widget.destroy()
+        self.results_view = None
+        self.tree_summary = None
+        self.summary_items = {}
+        self.methods_container = None
+        self.method_views = {}
+        self.visible_method_view = None
+
+    def invalidate_method_view(self, method_name):
+        view = self.method_views.pop(method_name, None)
+        if view is not None:
+            if view is self.visible_method_view:
+                self.visible_method_view = None
+            view.destroy()
+
+    def show_method(self, method_name):
+        if self.results_view is None:
+            self.build_results_view()
+        view = self.method_views.get(method_name)
+        if view is None:
+            view = self.method_views[method_name] = self.build_method_view(method_name)
+        if view is not self.visible_method_view:
+            if self.visible_method_view is not None:
+                self.visible_method_view.pack_forget()
+            view.pack(padx=10, pady=10, fill="x", expand=True)
+            self.visible_method_view = view
+
+    def update_summary_row(self, method_name):
+        result = self.methods_results[method_name]
+        stats = result["stats"]
+        memory = "-" if stats["peak_memory"] is None else f"{stats['peak_memory'] / 1024:.0f}"
+        values = [method_name, result["cost"], len(result["alloc"]),
+                  f"{stats['wall_time'] * 1000:.1f}", f"{stats['cpu_time'] * 1000:.1f}", memory,
+                  stats["iterations"], stats["pivots"], stats["cells_examined"], stats["degenerate"]]
+        item = self.summary_items.get(method_name)
+        if item is None:
+            self.summary_items[method_name] = self.tree_summary.insert('', tk.END, values=values)
+        else:
+            self.tree_summary.item(item, values=values)
+
+    def insert_rows_lazily(self, tree, rows, chunk_size=ROWS_PER_CHUNK):
+        """
+        Inserta las filas del iterable rows en tree por bloques de chunk_size, cediendo
+        el control al bucle de Tk entre bloques. Se detiene si el árbol se destruye.
+        """
+        rows = iter(rows)
 
+        def insert_chunk():
+            if not tree.winfo_exists():
+                return
+            inserted = 0
+            for values in islice(rows, chunk_size):
+                tree.insert('', tk.END, values=values)
+                inserted += 1
+            if inserted == chunk_size:
+                self.master.after(1, insert_chunk)
+
+        insert_chunk()
+
+    def build_results_view(self):
+        """Construye el marco compartido: comparación de métodos y matriz de costos de entrada."""
         # Crear ScrollableFrame
         scrollable_frame = ScrollableFrame(self.results_frame)
         scrollable_frame.pack(fill="both", expand=True)
+        self.results_view = scrollable_frame
 
         # Crear tabla comparativa de costos y rutas
         summary_frame = ttk.Frame(scrollable_frame.scrollable_frame)
         summary_frame.pack(padx=10, pady=10, anchor='w')
 
-        cols_summary = ["Método", "Costo Total", "Rutas Utilizadas"]
-        data_summary = []
-        for method, result in self.methods_results.items():
-            data_summary.append([method, result["cost"], len(result["alloc"])])
+        cols_summary = ["Método", "Costo Total", "Rutas Utilizadas", "Tiempo (ms)", "CPU (ms)",
+                        "Memoria pico (KiB)", "Iteraciones", "Pivotes", "Celdas examinadas", "Degeneradas"]
 
         ttk.Label(summary_frame, text="Comparación de Métodos", font=('Helvetica', 14, 'bold')).grid(row=0, column=0, columnspan=3, pady=5)
 
         tree_summary = ttk.Treeview(summary_frame, columns=cols_summary, show='headings', height=5)
         for col in cols_summary:
             tree_summary.heading(col, text=col)
-            tree_summary.column(col, anchor=tk.CENTER, width=150)
-        for row in data_summary:
-            tree_summary.insert('', tk.END, values=row)
+            tree_summary.column(col, anchor=tk.CENTER, width=150 if col in cols_summary[:3] else 110)
         tree_summary.grid(row=1, column=0, columnspan=3, pady=5)
+        self.tree_summary = tree_summary  # Los métodos que terminen después se agregan aquí
+        for method in self.methods_results:
+            self.update_summary_row(method)
 
-        # Crear marco para la matriz de costos con Demanda y Oferta
+        # Crear marco para la matriz de costos con Demanda y Oferta (compartido por los métodos)
         cost_matrix_frame = ttk.LabelFrame(scrollable_frame.scrollable_frame, text="Matriz de Costos")
         cost_matrix_frame.pack(padx=10, pady=10, anchor='w')
 
@@ -356,20 +514,21 @@ class TransportationProblemGUI:
                 tree_cost.column(col, anchor=tk.CENTER, width=80)
         tree_cost.pack(padx=5, pady=5, fill="x")
 
-        # Insertar filas con Oferta
-        for i, row in enumerate([ [entry.get() for entry in row] for row in self.costs_entries]):
-            tree_cost.insert('', tk.END, values=[sources_labels[i]] + row + [self.supply_entries[i].get()])
+        # Insertar filas con Oferta y una fila para Demanda
+        cost_rows, supply_text, demand_text = self.table_text
+        rows = ([sources_labels[i]] + row + [supply_text[i]] for i, row in enumerate(cost_rows))
+        self.insert_rows_lazily(tree_cost, chain(rows, [["Demanda"] + demand_text + [""]]))
 
-        # Insertar una fila para Demanda
-        tree_cost.insert('', tk.END, values=["Demanda"] + [entry.get() for entry in self.demand_entries] + [""])
+        # Crear marco para las asignaciones detalladas de cada método
+        self.methods_container = ttk.Frame(scrollable_frame.scrollable_frame)
+        self.methods_container.pack(padx=10, pady=10, anchor='w')
 
-        # Crear marco para las asignaciones detalladas
-        allocations_frame = ttk.Frame(scrollable_frame.scrollable_frame)
-        allocations_frame.pack(padx=10, pady=10, anchor='w')
+    def build_method_view(self, method_name):
+        """Construye (sin mostrar) la sección de un método: asignaciones y matriz de costos."""
+        result = self.methods_results[method_name]
 
         # Crear sección para el método seleccionado
-        method_section = ttk.LabelFrame(allocations_frame, text=method_name)
-        method_section.pack(padx=10, pady=10, fill="x", expand=True)
+        method_section = ttk.LabelFrame(self.methods_container, text=method_name)
 
         # Crear dos subframes dentro de cada método: uno para Asignaciones Detalladas y otro para Matriz de Costos
         detail_frame = ttk.Frame(method_section)
@@ -393,27 +552,34 @@ class TransportationProblemGUI:
         sources_labels = [index_to_letter(i) for i in range(self.num_supply_val)]
         destinations_labels = [index_to_letter(j) for j in range(self.num_demand_val)]
 
-        total_method_cost = 0
-        for step, ((i, j), alloc_qty) in enumerate(self.methods_results[method_name]["alloc"], start=1):
-            cost_unit = float(self.costs_entries[i][j].get())
-            cost_total = alloc_qty * cost_unit
-            total_method_cost += cost_total
-            tree_alloc.insert('', tk.END, values=(step, sources_labels[i], destinations_labels[j], alloc_qty, cost_unit, cost_total))
-        tree_alloc.pack(padx=5, pady=5, fill="both", expand=True)
+        # Los costos ya están convertidos en self.costs; las filas se generan al insertarlas
+        costs = self.costs
+        alloc_rows = (
+            (step, sources_labels[i], destinations_labels[j], alloc_qty, costs[i][j], alloc_qty * costs[i][j])
+            for step, ((i, j), alloc_qty) in enumerate(result["alloc"], start=1)
+        )
+        self.insert_rows_lazily(tree_alloc, alloc_rows)
 
         # Mostrar Costo Total
-        ttk.Label(frame_alloc, text=f"Costo Total: {total_method_cost}").pack(pady=5)
+        ttk.Label(frame_alloc, text=f"Costo Total: {result['cost']}").pack(pady=5)
+        # Diferencia absorbida por el nodo ficticio en problemas no balanceados
+        unmet = [f"{destinations_labels[j]}: {q}" for j, q in enumerate(result.get("unmet_demand", ())) if q]
+        if unmet:
+            ttk.Label(frame_alloc, text="Demanda insatisfecha: " + ", ".join(unmet)).pack(pady=5)
+        unused = [f"{sources_labels[i]}: {q}" for i, q in enumerate(result.get("unused_supply", ())) if q]
+        if unused:
+            ttk.Label(frame_alloc, text="Oferta sin usar: " + ", ".join(unused)).pack(pady=5)
+        if "pivots" in result:
+            ttk.Label(frame_alloc, text=f"Pivotes MODI: {result['pivots']}").pack(pady=5)
 
         # Matriz de Costos
         frame_grid = ttk.LabelFrame(matrix_frame, text="Matriz de Costos")
         frame_grid.pack(side="left", padx=5, pady=5, fill="both", expand=True)
 
         # Compute allocation cost matrix
-        cost_matrix = [[0 for _ in range(self.num_demand_val)] for _ in range(self.num_supply_val)]
-        for ((i, j), alloc_qty) in self.methods_results[method_name]["alloc"]:
-            cost_matrix[i][j] = alloc_qty * float(self.costs_entries[i][j].get())
-        # Compute row sums
-        row_sums = [sum(row) for row in cost_matrix]
+        cost_matrix = [[0] * self.num_demand_val for _ in range(self.num_supply_val)]
+        for ((i, j), alloc_qty) in result["alloc"]:
+            cost_matrix[i][j] = alloc_qty * costs[i][j]
 
         # Crear Treeview para la tabla de asignaciones en formato de matriz
         tree_grid = ttk.Treeview(frame_grid, columns=['Proveedor'] + destinations_labels + ['Total'], show='headings', height=10)
@@ -427,10 +593,10 @@ class TransportationProblemGUI:
                 tree_grid.column(col, anchor=tk.CENTER, width=80)
         tree_grid.pack(padx=5, pady=5, fill="both", expand=True)
 
-        # Insertar filas
-        for i in range(self.num_supply_val):
-            row_values = [sources_labels[i]] + cost_matrix[i] + [row_sums[i]]
-            tree_grid.insert('', tk.END, values=row_values)
+        # Insertar filas (con la suma de cada fila)
+        grid_rows = ([sources_labels[i]] + row + [sum(row)] for i, row in enumerate(cost_matrix))
+        self.insert_rows_lazily(tree_grid, grid_rows)
+        return method_section
 
     def prompt_prior_method(self):
         """
@@ -1,20 +1,90 @@
 # minimum_cost.py
 
+import heapq
+from array import array
+
+from cost_matrix.cost_matrix import SparseCosts, complete_allocations
+from instrumentation.instrumentation import record_counters
+from transport_solution.transport_solution import TransportSolution
+
 def minimum_cost_method(costs, supply, demand):
+    """
+    Asigna primero a la celda de menor costo (desempates por fila y luego por
+    columna) entre las que aún tienen oferta y demanda.
+
+    Las celdas se recorren en orden mediante un heap con el siguiente candidato
+    de cada fila. Cada fila se ordena solo si necesita más de una celda, una fila
+    agotada sale del heap y el recorrido termina al agotarse la oferta o la demanda.
+    Los órdenes se guardan como arreglos int64, así que con una matriz en disco
+    (MappedCosts) o calculada a pedido (LazyCosts) la memoria depende de las filas
+    activas y no de la matriz; en esos casos cada fila se lee en bloque al buscar
+    su mínimo o al ordenarla.
+    """
     supply = supply.copy()
     demand = demand.copy()
-    allocations = []
+    allocations = TransportSolution.for_quantities(supply, demand)
     rows = len(supply)
     cols = len(demand)
-    cost_list = []
-    for i in range(rows):
-        for j in range(cols):
-            cost_list.append((costs[i][j], i, j))
-    cost_list.sort()
-    for cost, i, j in cost_list:
-        if supply[i] > 0 and demand[j] > 0:
+    if isinstance(costs, SparseCosts):
+        # Solo las rutas permitidas
+        lines = [costs.row(i) for i in range(rows)]
+    else:
+        lines = [(range(cols), costs[i]) for i in range(rows)]
+    out_of_core = getattr(costs, "out_of_core", False)
+
+    open_rows = sum(1 for s in supply if s > 0)
+    open_cols = sum(1 for d in demand if d > 0)
+    # Entradas (costo, fila, columna, posición en la fila)
+    heap = []
+    # Celdas leídas: filas completas al buscar su mínimo o al ordenarlas, más una por candidato
+    examined = 0
+    iterations = 0
+    for i, (columns, values) in enumerate(lines):
+        if supply[i] > 0 and len(values):
+            block = list(values) if out_of_core else values
+            examined += len(block)
+            k = min(range(len(block)), key=block.__getitem__)
+            heap.append((values[k], i, columns[k], k))
+    heapq.heapify(heap)
+    # orders[i]: posiciones de la fila i ordenadas por costo; cursors[i]: siguiente posición
+    orders = [None] * rows
+    cursors = [0] * rows
+
+    while heap and open_rows and open_cols:
+        cost, i, j, k = heapq.heappop(heap)
+        iterations += 1
+        if demand[j] > 0:
             alloc = min(supply[i], demand[j])
-            allocations.append(((i, j), alloc))
+            allocations.append(i, j, alloc)
             supply[i] -= alloc
             demand[j] -= alloc
-    return allocations
+            if not demand[j] > 0:
+                open_cols -= 1
+            if not supply[i] > 0:
+                open_rows -= 1
+                orders[i] = None
+                continue
+
+        # Siguiente celda de la fila con demanda pendiente
+        columns, values = lines[i]
+        order = orders[i]
+        if order is None:
+            # El orden estable conserva el desempate por columna
+            block = list(values) if out_of_core else values
+            examined += len(block)
+            order = orders[i] = array('q', sorted(range(len(block)), key=block.__getitem__))
+            position = order.index(k) + 1
+        else:
+            position = cursors[i]
+        while position < len(order) and not demand[columns[order[position]]] > 0:
+            position += 1
+        if position < len(order):
+            cursors[i] = position + 1
+            k = order[position]
+            examined += 1
+            heapq.heappush(heap, (values[k], i, columns[k], k))
+        else:
+            orders[i] = None
+    record_counters(iterations=iterations, cells_examined=examined)
+    # Si las rutas prohibidas bloquearon el recorrido se completa con caminos de aumento
+    return complete_allocations(costs, allocations, supply, demand)
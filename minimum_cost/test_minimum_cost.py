@@ -0,0 +1,62 @@
+# minimum_cost/test_minimum_cost.py
+
+import random
+
+import pytest
+
+from benchmarks.instance_generators import forbid_routes, small_instance
+from cost_matrix.cost_matrix import LazyCosts, MappedCosts, SparseCosts, write_mapped_costs
+from minimum_cost.minimum_cost import minimum_cost_method
+from transport_core.transport_core import prepare_instance
+
+
+def reference_minimum_cost(costs, supply, demand):
+    """El método de costo mínimo original: todas las celdas permitidas ordenadas de una vez."""
+    supply, demand = supply.copy(), demand.copy()
+    allocations = []
+    cells = sorted((c, i, j) for i, row in enumerate(costs) for j, c in enumerate(row) if c is not None)
+    for _, i, j in cells:
+        if supply[i] > 0 and demand[j] > 0:
+            alloc = min(supply[i], demand[j])
+            allocations.append(((i, j), alloc))
+            supply[i] -= alloc
+            demand[j] -= alloc
+    return allocations
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_reference(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        costs, supply, demand = small_instance(rng, max_size=7, max_cost=rng.choice([3, 9, 100]))
+        expected = reference_minimum_cost(costs, supply, demand)
+        assert list(minimum_cost_method(costs, supply, demand)) == expected
+        rows, int_supply, int_demand = prepare_instance(costs, supply, demand)
+        assert list(minimum_cost_method(rows, list(int_supply), list(int_demand))) == expected
+        lazy = LazyCosts(len(costs), len(costs[0]), lambda i, j: costs[i][j], cache_size=0)
+        assert list(minimum_cost_method(lazy, supply, demand)) == expected
+
+
+def test_mapped_costs_match_reference(tmp_path):
+    rng = random.Random(21)
+    for k in range(50):
+        costs, supply, demand = small_instance(rng, max_size=7, max_cost=9)
+        path = str(tmp_path / f"costs{k}.bin")
+        write_mapped_costs(path, costs, "q")
+        with MappedCosts(path) as mapped:
+            assert list(minimum_cost_method(mapped, supply, demand)) == reference_minimum_cost(costs, supply, demand)
+
+
+def test_sparse_matches_reference_when_not_blocked():
+    rng = random.Random(22)
+    compared = 0
+    for _ in range(500):
+        dense, supply, demand = small_instance(rng, max_size=7, max_cost=9)
+        rows = forbid_routes(rng, dense)
+        expected = reference_minimum_cost(rows, supply, demand)
+        if sum(q for _, q in expected) != sum(supply):
+            # Las rutas prohibidas bloquean el recorrido: lo completan caminos de aumento
+            continue
+        compared += 1
+        assert list(minimum_cost_method(SparseCosts.from_dense(rows), supply, demand)) == expected
+    assert compared > 200
@@ -1,56 +1,38 @@
 # modified_distribution/modified_distribution.py
 
+from collections import deque
+
+from cost_matrix.cost_matrix import SparseCosts, complete_flow
+from instrumentation.instrumentation import record_counters
+from minimum_cost.minimum_cost import minimum_cost_method
+from transport_solution.transport_solution import TransportSolution
+
+# Tolerancia para considerar negativo un costo reducido
+EPSILON = 1e-9
+
+
 def modified_distribution_method(costs, supply, demand):
     """
     Implementación del Método de Distribución Modificada (DIMO) para el Problema de Transporte.
-    
-    Este método es una variante del Método de Costo Mínimo que incluye modificaciones para mejorar la eficiencia.
-    
+
+    Parte de la solución del Método de Costo Mínimo y la mejora hasta el óptimo
+    con los potenciales u-v (ver modified_distribution_solve).
+
     Parámetros:
         costs (list of list of float): Matriz de costos.
         supply (list of float): Oferta de cada proveedor.
         demand (list of float): Demanda de cada consumidor.
-    
+
     Retorna:
         allocations (list of tuple): Lista de asignaciones en formato ((proveedor, consumidor), cantidad).
     """
-    allocations = []
-    num_supply = len(supply)
-    num_demand = len(demand)
-    
-    # Crear copias para no modificar las originales
-    supply_remaining = supply.copy()
-    demand_remaining = demand.copy()
-    
-    # Crear una lista de todas las celdas con sus costos
-    cells = []
-    for i in range(num_supply):
-        for j in range(num_demand):
-            cells.append((costs[i][j], i, j))
-    
-    # Ordenar las celdas por costo ascendente
-    cells.sort()
-    
-    for cost, i, j in cells:
-        if supply_remaining[i] == 0 or demand_remaining[j] == 0:
-            continue  # Pasar si la oferta o demanda es 0
-        
-        # Asignar la cantidad mínima entre oferta y demanda
-        allocation = min(supply_remaining[i], demand_remaining[j])
-        allocations.append(((i, j), allocation))
-        
-        # Actualizar las ofertas y demandas restantes
-        supply_remaining[i] -= allocation
-        demand_remaining[j] -= allocation
-    
-    return allocations
+    prior_allocations = minimum_cost_method(costs, supply, demand)
+    return modified_distribution_solve(costs, supply, demand, prior_allocations)["alloc"]
 
 def modified_distribution_method_with_prior(costs, supply, demand, prior_allocations):
     """
     Implementación del Método de Distribución Modificada (DIMO) para el Problema de Transporte,
-    utilizando las asignaciones de un método previo.
-
-    Este método es una variante del Método de Costo Mínimo que incluye modificaciones para mejorar la eficiencia.
+    utilizando las asignaciones de un método previo como solución inicial.
 
     Parámetros:
         costs (list of list of float): Matriz de costos.
@@ -61,43 +43,493 @@ def modified_distribution_method_with_prior(costs, supply, demand, prior_allocat
     Retorna:
         allocations (list of tuple): Lista de asignaciones en formato ((proveedor, consumidor), cantidad).
     """
-    allocations = []
+    return modified_distribution_solve(costs, supply, demand, prior_allocations)["alloc"]
+
+def modified_distribution_solve(costs, supply, demand, prior_allocations):
+    """
+    Optimiza una solución inicial con el método MODI (potenciales u-v).
+
+    La base se mantiene como un árbol de expansión sobre los nodos fila (0..m-1) y
+    columna (m..m+n-1) con índices de padre y profundidad, de modo que cada pivote
+    encuentra su ciclo y actualiza los potenciales en O(m+n). Las bases degeneradas
+    se completan con celdas de asignación cero hasta tener m+n-1 celdas básicas.
+    La celda entrante es la de costo reducido más negativo, salvo después de un
+    pivote degenerado, cuando se usa la regla de Bland para no ciclar.
+
+    Con una matriz SparseCosts solo se consideran las rutas permitidas; si estas no
+    conectan todos los nodos, la base es un bosque con un árbol por componente.
+
+    Parámetros:
+        costs (list of list of float o SparseCosts): Matriz de costos.
+        supply (list of float): Oferta de cada proveedor.
+        demand (list of float): Demanda de cada consumidor.
+        prior_allocations (list of tuple): Asignaciones previas en formato ((proveedor, consumidor), cantidad).
+
+    Retorna:
+        dict: "alloc" (TransportSolution con las asignaciones de cantidad positiva), "basis" (celdas básicas, incluidas
+        las degeneradas), "pivots" (número de pivotes), "reduced_costs" (matriz de costos
+        reducidos c_ij - u_i - v_j, dispersa si costs lo es), "u" y "v" (potenciales finales).
+    """
+    flow = _initial_flow(costs, supply, demand, prior_allocations)
+    return _optimize(costs, len(supply), len(demand), flow)
+
+def modified_distribution_resolve(costs, supply, demand, previous):
+    """
+    Re-optimiza desde la base de una solución anterior después de cambiar ofertas,
+    demandas o costos, sin volver a empezar desde una heurística.
+
+    La factibilidad se repara localmente: solo se tocan las filas y columnas cuya
+    oferta o demanda cambió (se recorta su envío, empezando por las celdas más caras,
+    y el faltante se reparte con Costo Mínimo sobre esas filas y columnas). Los ciclos
+    que aparezcan se cancelan y los potenciales se recalculan sobre el árbol con los
+    costos nuevos, así que un cambio de costos solo cuesta los pivotes que provoque.
+
+    Parámetros:
+        costs (list of list of float o SparseCosts): Matriz de costos actualizada.
+        supply (list of float): Oferta actualizada de cada proveedor.
+        demand (list of float): Demanda actualizada de cada consumidor.
+        previous (dict): Resultado anterior de modified_distribution_solve o de esta función.
+
+    Retorna:
+        dict: Igual que modified_distribution_solve.
+    """
     num_supply = len(supply)
     num_demand = len(demand)
-    
-    # Crear copias para no modificar las originales
+
+    # Base anterior: celdas degeneradas con cantidad cero
+    flow = dict.fromkeys(previous["basis"], 0)
+    flow.update(previous["alloc"])
+    if isinstance(costs, SparseCosts):
+        # Las rutas que ya no están permitidas salen de la base
+        flow = {(i, j): alloc for (i, j), alloc in flow.items() if costs.get(i, j) is not None}
+    row_cells = [[] for _ in range(num_supply)]
+    col_cells = [[] for _ in range(num_demand)]
+    row_total = [0] * num_supply
+    col_total = [0] * num_demand
+    for (i, j), alloc in flow.items():
+        row_cells[i].append((i, j))
+        col_cells[j].append((i, j))
+        row_total[i] += alloc
+        col_total[j] += alloc
+
+    # Recortar lo que ahora sobra, primero en las celdas más caras
+    for totals, targets, cells_by_line in ((row_total, supply, row_cells), (col_total, demand, col_cells)):
+        for k, target in enumerate(targets):
+            excess = totals[k] - target
+            if excess <= 0:
+                continue
+            for cell in sorted(cells_by_line[k], key=lambda c: costs[c[0]][c[1]], reverse=True):
+                cut = min(excess, flow[cell])
+                if cut > 0:
+                    flow[cell] -= cut
+                    row_total[cell[0]] -= cut
+                    col_total[cell[1]] -= cut
+                    excess -= cut
+                if excess <= 0:
+                    break
+
+    # Repartir lo que falta entre las filas y columnas afectadas
+    supply_remaining = [s - t for s, t in zip(supply, row_total)]
+    demand_remaining = [d - t for d, t in zip(demand, col_total)]
+    _apply_fill(costs, flow, supply_remaining, demand_remaining)
+
+    return _optimize(costs, num_supply, num_demand, flow)
+
+def _optimize(costs, num_supply, num_demand, flow):
+    """Construye la base desde una solución factible y pivota hasta el óptimo."""
+    _cancel_cycles(costs, num_supply, flow)
+    tree = _SpanningTree(num_supply, num_demand, flow, _cells(costs))
+    tree.compute_potentials(costs)
+
+    # Tras un pivote degenerado se sigue con la regla de Bland (la primera celda
+    # con costo reducido negativo) hasta el siguiente pivote que mueva cantidad:
+    # los ciclos solo pueden darse entre pivotes degenerados y Bland los evita
+    pivots = 0
+    degenerate = False
+    while True:
+        if degenerate:
+            entering = _first_negative_cell(costs, tree.potential, num_supply)
+        else:
+            entering = _most_negative_cell(costs, tree.potential, num_supply)
+        if entering is None:
+            break
+        degenerate = tree.pivot(costs, entering) <= EPSILON
+        pivots += 1
+    # Cada búsqueda de la celda entrante recorre todas las celdas candidatas
+    candidates = costs.nnz if isinstance(costs, SparseCosts) else num_supply * num_demand
+    record_counters(iterations=pivots + 1, pivots=pivots, cells_examined=(pivots + 1) * candidates)
+
+    u = tree.potential[:num_supply]
+    v = tree.potential[num_supply:]
+    if isinstance(costs, SparseCosts):
+        reduced_costs = costs.with_data(c - u[i] - v[j] for i, j, c in costs.arcs())
+    else:
+        reduced_costs = [
+            [c - u[i] - v[j] for j, c in enumerate(row)]
+            for i, row in enumerate(costs)
+        ]
+
+    basis = sorted(tree.flow)
+    allocations = TransportSolution.from_allocations(
+        (((i, j), tree.flow[(i, j)]) for (i, j) in basis if tree.flow[(i, j)] > EPSILON), num_supply, num_demand
+    )
+
+    return {
+        "alloc": allocations,
+        "basis": basis,
+        "pivots": pivots,
+        "reduced_costs": reduced_costs,
+        "u": u,
+        "v": v,
+    }
+
+def _initial_flow(costs, supply, demand, prior_allocations):
+    """
+    Aplica las asignaciones previas y completa con Costo Mínimo la oferta y demanda restantes.
+    Retorna un diccionario {(i, j): cantidad}.
+    """
     supply_remaining = supply.copy()
     demand_remaining = demand.copy()
-    
+    flow = {}
+
     # Aplicar asignaciones previas
     for ((i, j), alloc) in prior_allocations:
+        if alloc == 0 and not (0 <= i < len(supply) and 0 <= j < len(demand)):
+            continue  # Asignación nula fuera de la matriz (p. ej. índice -1 de Vogel)
+        if isinstance(costs, SparseCosts) and costs.get(i, j) is None:
+            raise ValueError(f"Asignación previa en una ruta no permitida ({i}, {j}).")
         if supply_remaining[i] >= alloc and demand_remaining[j] >= alloc:
-            allocations.append(((i, j), alloc))
+            flow[(i, j)] = flow.get((i, j), 0) + alloc
             supply_remaining[i] -= alloc
             demand_remaining[j] -= alloc
         else:
             raise ValueError(f"Asignación previa excede la oferta o demanda en ({i}, {j}).")
-    
-    # Crear una lista de todas las celdas con sus costos, excluyendo las ya asignadas
-    cells = []
-    for i in range(num_supply):
-        for j in range(num_demand):
-            if supply_remaining[i] > 0 and demand_remaining[j] > 0 and ((i, j), 0) not in allocations:
-                cells.append((costs[i][j], i, j))
-    
-    # Ordenar las celdas por costo ascendente
+
+    # Completar lo que falte con el método de Costo Mínimo
+    _apply_fill(costs, flow, supply_remaining, demand_remaining)
+    return flow
+
+def _apply_fill(costs, flow, supply_remaining, demand_remaining):
+    """
+    Agrega a flow el reparto de Costo Mínimo de lo pendiente. Si las rutas
+    prohibidas lo bloquean, termina con caminos de aumento (ver complete_flow),
+    porque el MODI solo optimiza soluciones factibles. Lanza ValueError si no
+    hay plan factible.
+    """
+    for ((i, j), alloc) in _fill_remaining(costs, supply_remaining, demand_remaining):
+        flow[(i, j)] = flow.get((i, j), 0) + alloc
+        supply_remaining[i] -= alloc
+        demand_remaining[j] -= alloc
+    if isinstance(costs, SparseCosts) and any(s > 0 for s in supply_remaining):
+        complete_flow(costs, flow, supply_remaining, demand_remaining)
+
+def _fill_remaining(costs, supply_remaining, demand_remaining):
+    """
+    Costo Mínimo restringido a las filas y columnas con oferta o demanda pendiente:
+    el trabajo es proporcional a esa submatriz y no a la matriz completa.
+    """
+    rows = [i for i, s in enumerate(supply_remaining) if s > 0]
+    cols = [j for j, d in enumerate(demand_remaining) if d > 0]
+    if not rows or not cols:
+        return []
+    if isinstance(costs, SparseCosts):
+        pending = set(cols)
+        cells = []
+        for i in rows:
+            indices, data = costs.row(i)
+            cells.extend((c, i, j) for j, c in zip(indices, data) if j in pending)
+    else:
+        cells = [(costs[i][j], i, j) for i in rows for j in cols]
     cells.sort()
-    
+    supply_remaining = supply_remaining.copy()
+    demand_remaining = demand_remaining.copy()
+    allocations = []
     for cost, i, j in cells:
-        if supply_remaining[i] == 0 or demand_remaining[j] == 0:
-            continue  # Pasar si la oferta o demanda es 0
-        
-        # Asignar la cantidad mínima entre oferta y demanda
-        allocation = min(supply_remaining[i], demand_remaining[j])
-        allocations.append(((i, j), allocation))
-        
-        # Actualizar las ofertas y demandas restantes
-        supply_remaining[i] -= allocation
-        demand_remaining[j] -= allocation
-    
+        if supply_remaining[i] > 0 and demand_remaining[j] > 0:
+            alloc = min(supply_remaining[i], demand_remaining[j])
+            allocations.append(((i, j), alloc))
+            supply_remaining[i] -= alloc
+            demand_remaining[j] -= alloc
     return allocations
+
+def _cancel_cycles(costs, num_supply, flow):
+    """
+    Elimina los ciclos entre las celdas con cantidad positiva moviendo cantidad a lo
+    largo de cada ciclo en la dirección que no aumenta el costo, hasta vaciar una
+    celda. Las asignaciones de las heurísticas no tienen ciclos; sí pueden aparecer
+    al reparar una solución anterior o con asignaciones previas arbitrarias.
+    """
+    adjacency = {}
+    for (i, j), alloc in flow.items():
+        if alloc > 0:
+            adjacency.setdefault(i, set()).add(num_supply + j)
+            adjacency.setdefault(num_supply + j, set()).add(i)
+
+    def cell(a, b):
+        return (a, b - num_supply) if a < num_supply else (b, a - num_supply)
+
+    while True:
+        cycle = _find_cycle(adjacency)
+        if cycle is None:
+            return
+        edges = [cell(cycle[k], cycle[(k + 1) % len(cycle)]) for k in range(len(cycle))]
+        # Signos alternos; si esa dirección encarece la solución, se invierte
+        delta_cost = sum(costs[i][j] if k % 2 == 0 else -costs[i][j] for k, (i, j) in enumerate(edges))
+        first_sign = 1 if delta_cost <= 0 else -1
+        decreasing = [e for k, e in enumerate(edges) if (k % 2 == 0) != (first_sign == 1)]
+        theta = min(flow[e] for e in decreasing)
+        for k, e in enumerate(edges):
+            flow[e] += theta if (k % 2 == 0) == (first_sign == 1) else -theta
+        for e in decreasing:
+            if flow[e] <= EPSILON:
+                flow[e] = 0
+                i, j = e
+                adjacency[i].discard(num_supply + j)
+                adjacency[num_supply + j].discard(i)
+
+def _find_cycle(adjacency):
+    """Busca un ciclo con DFS iterativa. Retorna la lista de nodos del ciclo o None."""
+    parent = {}
+    active = set()
+    for start in adjacency:
+        if start in parent:
+            continue
+        parent[start] = None
+        active.add(start)
+        stack = [(start, iter(adjacency[start]))]
+        while stack:
+            node, neighbors = stack[-1]
+            for neighbor in neighbors:
+                if neighbor == parent[node]:
+                    continue
+                if neighbor in active:
+                    # Arista de retroceso: el ciclo sube desde node hasta neighbor
+                    cycle = [node]
+                    while cycle[-1] != neighbor:
+                        cycle.append(parent[cycle[-1]])
+                    return cycle
+                if neighbor not in parent:
+                    parent[neighbor] = node
+                    active.add(neighbor)
+                    stack.append((neighbor, iter(adjacency[neighbor])))
+                    break
+            else:
+                active.discard(node)
+                stack.pop()
+    return None
+
+def _cells(costs):
+    """Celdas (i, j) candidatas a entrar en la base: las rutas permitidas si costs es disperso."""
+    if isinstance(costs, SparseCosts):
+        return ((i, j) for i, j, _ in costs.arcs())
+    return ((i, j) for i, row in enumerate(costs) for j in range(len(row)))
+
+def _most_negative_cell(costs, potential, num_supply):
+    """
+    Busca la celda no básica con el costo reducido más negativo (regla de Dantzig).
+    Las celdas básicas tienen costo reducido cero, así que no hace falta excluirlas.
+    """
+    v = potential[num_supply:]
+    best = -EPSILON
+    entering = None
+    if isinstance(costs, SparseCosts):
+        for i, j, c in costs.arcs():
+            d = c - potential[i] - v[j]
+            if d < best:
+                best = d
+                entering = (i, j)
+        return entering
+    for i, row in enumerate(costs):
+        ui = potential[i]
+        for j, c in enumerate(row):
+            d = c - ui - v[j]
+            if d < best:
+                best = d
+                entering = (i, j)
+    return entering
+
+def _first_negative_cell(costs, potential, num_supply):
+    """
+    Busca la primera celda, en orden de filas, con costo reducido negativo (regla
+    de Bland, con el mismo orden que el desempate de la celda saliente).
+    """
+    v = potential[num_supply:]
+    if isinstance(costs, SparseCosts):
+        for i, j, c in costs.arcs():
+            if c - potential[i] - v[j] < -EPSILON:
+                return (i, j)
+        return None
+    for i, row in enumerate(costs):
+        ui = potential[i]
+        for j, c in enumerate(row):
+            if c - ui - v[j] < -EPSILON:
+                return (i, j)
+    return None
+
+
+class _SpanningTree:
+    """
+    Base del problema de transporte representada como árbol de expansión.
+
+    Los nodos 0..m-1 son proveedores y m..m+n-1 consumidores. Cada arista del árbol
+    es una celda básica; parent y depth permiten recorrer el ciclo de un pivote
+    subiendo desde ambos extremos de la celda entrante hasta su ancestro común.
+    """
+    def __init__(self, num_supply, num_demand, flow, cells):
+        self.num_supply = num_supply
+        num_nodes = num_supply + num_demand
+        self.flow = {}
+        self.adjacency = [set() for _ in range(num_nodes)]
+        self.parent = [-1] * num_nodes
+        self.depth = [0] * num_nodes
+        self.potential = [0] * num_nodes
+
+        union_find = list(range(num_nodes))
+
+        def find(x):
+            while union_find[x] != x:
+                union_find[x] = union_find[union_find[x]]
+                x = union_find[x]
+            return x
+
+        def add_cell(i, j, alloc):
+            a, b = find(i), find(num_supply + j)
+            if a == b:
+                return False
+            union_find[a] = b
+            self.flow[(i, j)] = alloc
+            self.adjacency[i].add(num_supply + j)
+            self.adjacency[num_supply + j].add(i)
+            return True
+
+        # Primero las celdas con asignación positiva (sin ciclos), luego las degeneradas
+        for (i, j), alloc in sorted(flow.items(), key=lambda item: item[1] <= 0):
+            add_cell(i, j, alloc)
+
+        # Completar la base degenerada con celdas de asignación cero
+        if len(self.flow) < num_nodes - 1:
+            for i, j in cells:
+                add_cell(i, j, 0)
+                if len(self.flow) == num_nodes - 1:
+                    break
+
+    def _cell(self, node):
+        """Celda (i, j) de la arista que une un nodo con su padre."""
+        parent = self.parent[node]
+        if node < self.num_supply:
+            return (node, parent - self.num_supply)
+        return (parent, node - self.num_supply)
+
+    def _hang(self, root, costs):
+        """
+        Recorre el subárbol de root (cuyo padre ya está fijado) recalculando
+        padres, profundidades y potenciales. Costo O(tamaño del subárbol).
+        Retorna los nodos visitados.
+        """
+        num_supply = self.num_supply
+        parent = self.parent
+        depth = self.depth
+        potential = self.potential
+        visited = [root]
+        queue = deque(visited)
+        while queue:
+            node = queue.popleft()
+            for child in self.adjacency[node]:
+                if child == parent[node]:
+                    continue
+                parent[child] = node
+                depth[child] = depth[node] + 1
+                if node < num_supply:
+                    potential[child] = costs[node][child - num_supply] - potential[node]
+                else:
+                    potential[child] = costs[child][node - num_supply] - potential[node]
+                queue.append(child)
+                visited.append(child)
+        return visited
+
+    def compute_potentials(self, costs):
+        """
+        Calcula u y v resolviendo u_i + v_j = c_ij sobre el árbol, con potencial
+        cero en la raíz de cada componente (el nodo de menor índice).
+        """
+        seen = [False] * len(self.parent)
+        for node in range(len(self.parent)):
+            if seen[node]:
+                continue
+            self.parent[node] = -1
+            self.depth[node] = 0
+            self.potential[node] = 0
+            for visited in self._hang(node, costs):
+                seen[visited] = True
+
+    def pivot(self, costs, entering):
+        """
+        Introduce la celda entrante en la base y saca la celda bloqueante del ciclo;
+        entre varias bloqueantes sale la menor (i, j). Retorna la cantidad movida.
+        """
+        num_supply = self.num_supply
+        parent = self.parent
+        depth = self.depth
+        flow = self.flow
+
+        i, j = entering
+        row_node, col_node = i, num_supply + j
+
+        # Subir desde ambos extremos hasta el ancestro común. En cada lado, las aristas
+        # a distancia par del extremo pierden cantidad y las de distancia impar la ganan.
+        row_path, col_path = [], []
+        a, b = row_node, col_node
+        while depth[a] > depth[b]:
+            row_path.append(a)
+            a = parent[a]
+        while depth[b] > depth[a]:
+            col_path.append(b)
+            b = parent[b]
+        while a != b:
+            row_path.append(a)
+            col_path.append(b)
+            a = parent[a]
+            b = parent[b]
+
+        theta = None
+        leaving = None
+        leaving_cell = None
+        leaving_on_row_side = False
+        for on_row_side, path in ((False, col_path), (True, row_path)):
+            for node in path[0::2]:
+                cell = self._cell(node)
+                alloc = flow[cell]
+                if theta is None or alloc < theta or (alloc == theta and cell < leaving_cell):
+                    theta = alloc
+                    leaving = node
+                    leaving_cell = cell
+                    leaving_on_row_side = on_row_side
+
+        # Ajustar las cantidades a lo largo del ciclo
+        for path in (row_path, col_path):
+            for k, node in enumerate(path):
+                cell = self._cell(node)
+                if k % 2 == 0:
+                    flow[cell] -= theta
+                else:
+                    flow[cell] += theta
+        flow[entering] = theta
+
+        # Cambiar la estructura del árbol: sale la arista (leaving, padre) y entra (i, j)
+        leaving_parent = parent[leaving]
+        del flow[self._cell(leaving)]
+        self.adjacency[leaving].discard(leaving_parent)
+        self.adjacency[leaving_parent].discard(leaving)
+        self.adjacency[row_node].add(col_node)
+        self.adjacency[col_node].add(row_node)
+
+        # El extremo que quedó en el subárbol desprendido se cuelga del otro extremo
+        if leaving_on_row_side:
+            inner, outer = row_node, col_node
+        else:
+            inner, outer = col_node, row_node
+        parent[inner] = outer
+        depth[inner] = depth[outer] + 1
+        self.potential[inner] = costs[i][j] - self.potential[outer]
+        self._hang(inner, costs)
+        return theta
@@ -0,0 +1,146 @@
+# modified_distribution/test_modified_distribution.py
+
+import random
+
+import pytest
+
+from benchmarks.instance_generators import degenerate_instance, forbid_routes, small_instance
+from cost_matrix.cost_matrix import SparseCosts
+from modified_distribution import modified_distribution
+from modified_distribution.modified_distribution import (
+    modified_distribution_method, modified_distribution_resolve, modified_distribution_solve)
+from northwest_corner.northwest_corner import northwest_corner_method
+from transport_core.transport_core import build_costs, calculate_cost, get_method
+from vogel_approximation.vogel_approximation import vogel_approximation_method
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_network_simplex(seed):
+    rng = random.Random(seed)
+    network_simplex = get_method("network_simplex")
+    for _ in range(150):
+        costs, supply, demand = small_instance(rng)
+        expected = calculate_cost(network_simplex(costs, supply, demand), costs)
+        for prior in ([], northwest_corner_method(costs, supply, demand), vogel_approximation_method(costs, supply, demand)):
+            result = modified_distribution_solve(costs, supply, demand, prior)
+            assert result["alloc"].row_totals() == supply
+            assert result["alloc"].col_totals() == demand
+            assert calculate_cost(result["alloc"], costs) == expected
+            assert len(result["basis"]) == len(supply) + len(demand) - 1
+            assert min(min(row) for row in result["reduced_costs"]) >= -1e-9
+
+
+def test_degenerate_bases_terminate(monkeypatch):
+    calls = []
+    first_negative_cell = modified_distribution._first_negative_cell
+
+    def counted(*args):
+        calls.append(args)
+        return first_negative_cell(*args)
+
+    monkeypatch.setattr(modified_distribution, "_first_negative_cell", counted)
+    network_simplex = get_method("network_simplex")
+    rng = random.Random(17)
+    instances = [degenerate_instance(m, n, seed) for m, n in ((4, 6), (6, 6), (8, 12), (15, 10)) for seed in range(5)]
+    instances += [small_instance(rng, max_size=7, max_cost=2) for _ in range(200)]
+    for costs, supply, demand in instances:
+        result = modified_distribution_solve(costs, supply, demand, northwest_corner_method(costs, supply, demand))
+        assert calculate_cost(result["alloc"], costs) == calculate_cost(network_simplex(costs, supply, demand), costs)
+    # Hubo pivotes degenerados, seguidos con la regla de Bland
+    assert calls
+
+
+def test_blocked_sparse_instance():
+    costs = build_costs([[1, 1], [1, None]])
+    alloc = modified_distribution_method(costs, [5, 5], [5, 5])
+    assert sorted(alloc) == [((0, 1), 5), ((1, 0), 5)]
+
+
+def test_sparse_matches_network_simplex():
+    rng = random.Random(6)
+    network_simplex = get_method("network_simplex")
+    for _ in range(300):
+        dense, supply, demand = small_instance(rng)
+        costs = SparseCosts.from_dense(forbid_routes(rng, dense, 0.6))
+        try:
+            expected = calculate_cost(network_simplex(costs, supply, demand), costs)
+        except ValueError:
+            with pytest.raises(ValueError):
+                modified_distribution_method(costs, supply, demand)
+            continue
+        alloc = modified_distribution_method(costs, supply, demand)
+        assert alloc.row_totals() == supply
+        assert alloc.col_totals() == demand
+        assert all(costs.get(i, j) is not None for (i, j), _ in alloc)
+        assert calculate_cost(alloc, costs) == expected
+
+
+def test_resolve_repairs_infeasible_basis():
+    costs = [[4, 6, 9], [5, 3, 8], [7, 4, 2]]
+    previous = modified_distribution_solve(costs, [20, 30, 25], [15, 35, 25], [])
+    # Menos oferta en 1 y menos demanda en 1: el envío anterior ya no es factible
+    supply, demand = [20, 10, 25], [15, 15, 25]
+    result = modified_distribution_resolve(costs, supply, demand, previous)
+    assert result["alloc"].row_totals() == supply
+    assert result["alloc"].col_totals() == demand
+    expected = get_method("network_simplex")(costs, supply, demand)
+    assert calculate_cost(result["alloc"], costs) == calculate_cost(expected, costs)
+
+
+def test_resolve_keeps_basis_after_small_cost_change():
+    costs = [[4, 6, 9], [5, 3, 8], [7, 4, 2]]
+    supply, demand = [20, 30, 25], [15, 35, 25]
+    previous = modified_distribution_solve(costs, supply, demand, [])
+    # Subir un costo no básico sigue siendo óptimo con la misma base: ningún pivote
+    i, j = next((i, j) for i in range(3) for j in range(3) if (i, j) not in previous["basis"])
+    changed = [row.copy() for row in costs]
+    changed[i][j] += 5
+    result = modified_distribution_resolve(changed, supply, demand, previous)
+    assert result["pivots"] == 0
+    assert result["basis"] == previous["basis"]
+    assert list(result["alloc"]) == list(previous["alloc"])
+    # Abaratar una celda no básica por debajo de u_i + v_j la hace entrar
+    changed[i][j] = previous["u"][i] + previous["v"][j] - 1
+    result = modified_distribution_resolve(changed, supply, demand, previous)
+    assert result["pivots"] > 0
+    expected = get_method("network_simplex")(changed, supply, demand)
+    assert calculate_cost(result["alloc"], changed) == calculate_cost(expected, changed)
+
+
+def test_resolve_after_changes_is_optimal():
+    rng = random.Random(13)
+    network_simplex = get_method("network_simplex")
+    for _ in range(200):
+        costs, supply, demand = small_instance(rng, zeros=False)
+        previous = modified_distribution_solve(costs, supply, demand, [])
+        costs = [[c + rng.choice([-3, 0, 0, 4]) for c in row] for row in costs]
+        # Cambiar la oferta de i y la demanda de j en lo mismo, sin dejar cantidades negativas
+        i, j = rng.randrange(len(supply)), rng.randrange(len(demand))
+        change = rng.randint(-min(supply[i], demand[j]), 5)
+        supply, demand = supply.copy(), demand.copy()
+        supply[i] += change
+        demand[j] += change
+        result = modified_distribution_resolve(costs, supply, demand, previous)
+        assert result["alloc"].row_totals() == supply
+        assert result["alloc"].col_totals() == demand
+        assert calculate_cost(result["alloc"], costs) == calculate_cost(network_simplex(costs, supply, demand), costs)
+
+
+def test_resolve_on_sparse_costs():
+    rng = random.Random(14)
+    network_simplex = get_method("network_simplex")
+    for _ in range(200):
+        dense, supply, demand = small_instance(rng, zeros=False)
+        try:
+            previous = modified_distribution_solve(SparseCosts.from_dense(forbid_routes(rng, dense)), supply, demand, [])
+        except ValueError:
+            continue
+        # Se prohíben otras rutas: las celdas básicas que ya no existen salen de la base
+        costs = SparseCosts.from_dense(forbid_routes(rng, dense, 0.8))
+        try:
+            expected = calculate_cost(network_simplex(costs, supply, demand), costs)
+        except ValueError:
+            continue
+        result = modified_distribution_resolve(costs, supply, demand, previous)
+        assert all(costs.get(i, j) is not None for (i, j), _ in result["alloc"])
+        assert calculate_cost(result["alloc"], costs) == expected
@@ -0,0 +1,415 @@
+# network_simplex/network_simplex.py
+
+from array import array
+from collections import deque
+from math import sqrt
+
+from cost_matrix.cost_matrix import SparseCosts
+from instrumentation.instrumentation import record_counters
+from transport_solution.transport_solution import TransportSolution
+
+# Estados de los arcos
+STATE_UPPER = -1
+STATE_TREE = 0
+STATE_LOWER = 1
+
+# Dirección del arco que une un nodo con su padre
+DIR_UP = 1     # nodo -> padre
+DIR_DOWN = -1  # padre -> nodo
+
+# Tolerancia para considerar negativo un costo reducido
+EPSILON = 1e-9
+
+INF = float('inf')
+
+
+def network_simplex_method(costs, supply, demand, capacities=None, warm_start=None, block_size=None):
+    """
+    Implementación del Método Simplex de Red para el Problema de Transporte.
+
+    Parámetros:
+        costs (list of list of float o SparseCosts): Matriz de costos; si es dispersa
+            solo las rutas permitidas son arcos del problema.
+        supply (list of float): Oferta de cada proveedor.
+        demand (list of float): Demanda de cada consumidor.
+        capacities (list of list of float, opcional): Capacidad máxima de cada ruta
+            (se consulta como capacities[i][j], también para costos dispersos).
+        warm_start (list of tuple o función, opcional): Asignaciones iniciales o un método
+            heurístico (p. ej. vogel_approximation_method) que las calcule.
+        block_size (int, opcional): Tamaño de bloque para la búsqueda del arco entrante.
+
+    Retorna:
+        allocations (TransportSolution): Asignaciones; se itera como tuplas ((proveedor, consumidor), cantidad).
+    """
+    return network_simplex_solve(costs, supply, demand, capacities, warm_start, block_size)["alloc"]
+
+def network_simplex_solve(costs, supply, demand, capacities=None, warm_start=None, block_size=None):
+    """
+    Resuelve el problema de transporte hasta el óptimo con el simplex de red acotado.
+
+    Los proveedores son los nodos 0..m-1, los consumidores m..m+n-1 y el nodo m+n es
+    una raíz artificial unida a todos los demás. El árbol inicial (artificial o
+    construido desde warm_start) es fuertemente factible y la regla de salida lo
+    conserva así, lo que evita ciclos en pivotes degenerados. El arco entrante se
+    elige con búsqueda por bloques: se recorren los arcos en bloques de tamaño
+    ~sqrt(arcos) y se toma el más negativo del primer bloque que tenga alguno.
+
+    Retorna:
+        dict: "alloc" (asignaciones con cantidad positiva), "pivots" (número de pivotes),
+        "u" y "v" (potenciales finales, con costo reducido c_ij - u_i - v_j).
+    """
+    total_supply = sum(supply)
+    if abs(total_supply - sum(demand)) > EPSILON * max(1, abs(total_supply)):
+        raise ValueError("La oferta y la demanda no están balanceadas.")
+
+    simplex = _NetworkSimplex(costs, supply, demand, capacities, block_size)
+    if warm_start is None:
+        simplex.init_artificial()
+    else:
+        if callable(warm_start):
+            warm_start = warm_start(costs, supply, demand)
+        simplex.init_warm_start(warm_start)
+    simplex.run()
+    return simplex.result()
+
+
+class _NetworkSimplex:
+    """
+    Estado del simplex de red: arcos en arreglos tipados y árbol con padre,
+    arco al padre, dirección, profundidad y vecinos en el árbol.
+    """
+    def __init__(self, costs, supply, demand, capacities, block_size):
+        self.num_supply = num_supply = len(supply)
+        self.num_demand = num_demand = len(demand)
+        self.root = root = num_supply + num_demand
+        self.integral = all(isinstance(x, int) for x in supply) and all(isinstance(x, int) for x in demand)
+
+        # Arcos reales: en una matriz densa el arco i*n + j va del proveedor i al
+        # consumidor m + j; en una dispersa los arcos siguen el orden CSR
+        self.costs = costs
+        self.sparse = isinstance(costs, SparseCosts)
+        self.source = source = array('i')
+        self.target = target = array('i')
+        self.cost = cost = array('d')
+        max_cost = 0
+        for i in range(num_supply):
+            if self.sparse:
+                indices, row = costs.row(i)
+            else:
+                indices, row = range(num_demand), costs[i]
+            source.extend([i] * len(indices))
+            target.extend(num_supply + j for j in indices)
+            if isinstance(row, array) and row.typecode != 'd':
+                # Filas enteras del modo entero (ver transport_core.prepare_instance)
+                row = row.tolist()
+            cost.extend(row)
+            max_cost = max(max_cost, max(row, default=0), -min(row, default=0))
+        self.arc_num = arc_num = len(cost)
+        if capacities is None:
+            self.cap = None
+        else:
+            self.cap = array('d', (capacities[source[e]][target[e] - num_supply] for e in range(arc_num)))
+
+        # Arcos artificiales: el arco arc_num + u une el nodo u con la raíz
+        self.art_cost = (max_cost + 1) * (root + 1)
+        source.extend([root] * root)
+        target.extend(range(root))
+        cost.extend([self.art_cost] * root)
+
+        self.flow = array('d', bytes(8 * len(cost)))
+        self.state = array('b', [STATE_LOWER]) * len(cost)
+        self.balance = list(supply) + [-d for d in demand]
+
+        num_nodes = root + 1
+        self.parent = [-1] * num_nodes
+        self.pred = [-1] * num_nodes
+        self.pred_dir = [0] * num_nodes
+        self.depth = [0] * num_nodes
+        self.pi = [0.0] * num_nodes
+        self.tree = [dict() for _ in range(num_nodes)]
+
+        if block_size is None:
+            block_size = max(int(sqrt(arc_num)), 10)
+        self.block_size = block_size
+        self.next_arc = 0
+        self.pivots = 0
+        self.arcs_examined = 0  # Arcos recorridos en la búsqueda del arco entrante
+
+    def _capacity(self, e):
+        if self.cap is None or e >= self.arc_num:
+            return INF
+        return self.cap[e]
+
+    def _link(self, u, v, e):
+        self.tree[u][v] = e
+        self.tree[v][u] = e
+        self.state[e] = STATE_TREE
+
+    def _unlink(self, u, v):
+        del self.tree[u][v]
+        del self.tree[v][u]
+
+    def init_artificial(self):
+        """Árbol inicial: cada nodo colgado de la raíz con su oferta o demanda en el arco artificial."""
+        root = self.root
+        for u in range(root):
+            e = self.arc_num + u
+            b = self.balance[u]
+            if b >= 0:
+                # Oferta o balance nulo: el arco va del nodo a la raíz, así los arcos
+                # de flujo cero apuntan hacia la raíz y el árbol es fuertemente factible
+                self.source[e], self.target[e] = u, root
+                self.flow[e] = b
+            else:
+                self.flow[e] = -b
+            self._link(u, root, e)
+        self._hang(root)
+
+    def init_warm_start(self, allocations):
+        """
+        Árbol inicial desde una solución factible: las celdas con cantidad estrictamente
+        entre 0 y la capacidad forman un bosque y cada componente se cuelga de la raíz
+        con un arco artificial de flujo cero dirigido hacia la raíz (así el árbol
+        inicial es fuertemente factible).
+        """
+        num_demand = self.num_demand
+        num_supply = self.num_supply
+        root = self.root
+        residual = list(self.balance)
+        union_find = list(range(root))
+
+        def find(x):
+            while union_find[x] != x:
+                union_find[x] = union_find[union_find[x]]
+                x = union_find[x]
+            return x
+
+        for ((i, j), alloc) in allocations:
+            if alloc == 0:
+                continue
+            if not (0 <= i < num_supply and 0 <= j < num_demand) or alloc < 0:
+                raise ValueError(f"Asignación inicial inválida en ({i}, {j}).")
+            e = self.costs.position(i, j) if self.sparse else i * num_demand + j
+            if e < 0:
+                raise ValueError(f"Asignación inicial en una ruta no permitida ({i}, {j}).")
+            self.flow[e] += alloc
+            residual[i] -= alloc
+            residual[num_supply + j] += alloc
+
+        for u in range(root):
+            if abs(residual[u]) > EPSILON * max(1, abs(self.balance[u])):
+                raise ValueError("Las asignaciones iniciales no cubren exactamente la oferta y la demanda.")
+
+        for e in range(self.arc_num):
+            alloc = self.flow[e]
+            if alloc == 0:
+                continue
+            capacity = self._capacity(e)
+            if alloc > capacity:
+                raise ValueError(f"Asignación inicial excede la capacidad en ({self.source[e]}, {self.target[e] - num_supply}).")
+            if alloc == capacity:
+                self.state[e] = STATE_UPPER
+                continue
+            u, v = self.source[e], self.target[e]
+            a, b = find(u), find(v)
+            if a == b:
+                raise ValueError(f"Las asignaciones iniciales forman un ciclo en ({u}, {v - num_supply}).")
+            union_find[a] = b
+            self._link(u, v, e)
+
+        for u in range(root):
+            if find(u) == u:
+                e = self.arc_num + u
+                self.source[e], self.target[e] = u, root
+                self._link(u, root, e)
+        self._hang(root)
+
+    def _hang(self, node):
+        """
+        Recorre el subárbol de node (cuyo padre ya está fijado) recalculando padre,
+        arco al padre, dirección, profundidad y potencial de cada nodo.
+        """
+        parent = self.parent
+        pred = self.pred
+        pred_dir = self.pred_dir
+        depth = self.depth
+        pi = self.pi
+        source = self.source
+        cost = self.cost
+        queue = deque([node])
+        while queue:
+            u = queue.popleft()
+            for v, e in self.tree[u].items():
+                if v == parent[u]:
+                    continue
+                parent[v] = u
+                pred[v] = e
+                depth[v] = depth[u] + 1
+                # Costo reducido nulo en el árbol: cost + pi[origen] - pi[destino] = 0
+                if source[e] == v:
+                    pred_dir[v] = DIR_UP
+                    pi[v] = pi[u] - cost[e]
+                else:
+                    pred_dir[v] = DIR_DOWN
+                    pi[v] = pi[u] + cost[e]
+                queue.append(v)
+
+    def find_entering_arc(self):
+        """Búsqueda por bloques del arco entrante entre los arcos reales."""
+        state = self.state
+        cost = self.cost
+        source = self.source
+        target = self.target
+        pi = self.pi
+        arc_num = self.arc_num
+        block_size = self.block_size
+
+        best = -EPSILON
+        in_arc = -1
+        count = block_size
+        blocks = 0
+        for start, stop in ((self.next_arc, arc_num), (0, self.next_arc)):
+            for e in range(start, stop):
+                s = state[e]
+                if s:
+                    c = s * (cost[e] + pi[source[e]] - pi[target[e]])
+                    if c < best:
+                        best = c
+                        in_arc = e
+                count -= 1
+                if count == 0:
+                    if in_arc >= 0:
+                        self.next_arc = e + 1 if e + 1 < arc_num else 0
+                        self.arcs_examined += (blocks + 1) * block_size
+                        return in_arc
+                    count = block_size
+                    blocks += 1
+        self.arcs_examined += blocks * block_size + block_size - count
+        return in_arc if in_arc >= 0 else None
+
+    def pivot(self, in_arc):
+        parent = self.parent
+        pred = self.pred
+        pred_dir = self.pred_dir
+        depth = self.depth
+        flow = self.flow
+
+        # Nodo de unión del ciclo
+        u, v = self.source[in_arc], self.target[in_arc]
+        while u != v:
+            if depth[u] > depth[v]:
+                u = parent[u]
+            elif depth[v] > depth[u]:
+                v = parent[v]
+            else:
+                u = parent[u]
+                v = parent[v]
+        join = u
+
+        # Arco saliente: el último arco bloqueante en la dirección del ciclo
+        if self.state[in_arc] == STATE_LOWER:
+            first, second = self.source[in_arc], self.target[in_arc]
+        else:
+            first, second = self.target[in_arc], self.source[in_arc]
+        delta = self._capacity(in_arc)
+        u_out = -1
+        to_upper = False
+        result = 0
+        u = first
+        while u != join:
+            e = pred[u]
+            if pred_dir[u] == DIR_DOWN:
+                d, upper = self._capacity(e) - flow[e], True
+            else:
+                d, upper = flow[e], False
+            if d < delta:
+                delta, u_out, to_upper, result = d, u, upper, 1
+            u = parent[u]
+        u = second
+        while u != join:
+            e = pred[u]
+            if pred_dir[u] == DIR_UP:
+                d, upper = self._capacity(e) - flow[e], True
+            else:
+                d, upper = flow[e], False
+            if d <= delta:
+                delta, u_out, to_upper, result = d, u, upper, 2
+            u = parent[u]
+        if delta == INF:
+            raise ValueError("El problema no está acotado.")
+
+        # Cambiar el flujo a lo largo del ciclo
+        if delta > 0:
+            value = self.state[in_arc] * delta
+            flow[in_arc] += value
+            u = self.source[in_arc]
+            while u != join:
+                flow[pred[u]] -= pred_dir[u] * value
+                u = parent[u]
+            u = self.target[in_arc]
+            while u != join:
+                flow[pred[u]] += pred_dir[u] * value
+                u = parent[u]
+
+        if result == 0:
+            # El propio arco entrante alcanza su otra cota
+            self.state[in_arc] = -self.state[in_arc]
+            return
+
+        # Actualizar el árbol: sale el arco de u_out a su padre y entra in_arc
+        out_arc = pred[u_out]
+        if to_upper:
+            flow[out_arc] = self._capacity(out_arc)
+            self.state[out_arc] = STATE_UPPER
+        else:
+            flow[out_arc] = 0
+            self.state[out_arc] = STATE_LOWER
+        self._unlink(u_out, parent[u_out])
+
+        if result == 1:
+            u_in, v_in = first, second
+        else:
+            u_in, v_in = second, first
+        self._link(u_in, v_in, in_arc)
+        parent[u_in] = v_in
+        pred[u_in] = in_arc
+        depth[u_in] = depth[v_in] + 1
+        if self.source[in_arc] == u_in:
+            pred_dir[u_in] = DIR_UP
+            self.pi[u_in] = self.pi[v_in] - self.cost[in_arc]
+        else:
+            pred_dir[u_in] = DIR_DOWN
+            self.pi[u_in] = self.pi[v_in] + self.cost[in_arc]
+        self._hang(u_in)
+
+    def run(self):
+        while True:
+            in_arc = self.find_entering_arc()
+            if in_arc is None:
+                break
+            self.pivot(in_arc)
+            self.pivots += 1
+        record_counters(iterations=self.pivots + 1, pivots=self.pivots, cells_examined=self.arcs_examined)
+
+        for u in range(self.root):
+            if self.flow[self.arc_num + u] > EPSILON * max(1, abs(self.balance[u])):
+                raise ValueError("El problema no es factible con las capacidades dadas.")
+
+    def result(self):
+        num_demand = self.num_demand
+        num_supply = self.num_supply
+        source = self.source
+        target = self.target
+        allocations = TransportSolution(num_supply, num_demand, self.integral)
+        for e in range(self.arc_num):
+            alloc = self.flow[e]
+            if alloc > EPSILON:
+                if self.integral:
+                    alloc = int(round(alloc))
+                allocations.append(source[e], target[e] - num_supply, alloc)
+        return {
+            "alloc": allocations,
+            "pivots": self.pivots,
+            "u": [-p for p in self.pi[:num_supply]],
+            "v": self.pi[num_supply:num_supply + num_demand],
+        }
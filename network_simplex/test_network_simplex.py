@@ -0,0 +1,72 @@
+# network_simplex/test_network_simplex.py
+
+import random
+
+import pytest
+
+from assignment.assignment import assignment_method
+from benchmarks.instance_generators import forbid_routes, small_instance
+from cost_matrix.cost_matrix import SparseCosts
+from network_simplex.network_simplex import DIR_UP, _NetworkSimplex, network_simplex_method, network_simplex_solve
+from northwest_corner.northwest_corner import northwest_corner_method
+from transport_core.transport_core import calculate_cost
+from vogel_approximation.vogel_approximation import vogel_approximation_method
+
+
+def assert_strongly_feasible(simplex):
+    # Todo arco del árbol con flujo cero tiene que apuntar hacia la raíz
+    for u in range(simplex.root):
+        if simplex.flow[simplex.pred[u]] == 0:
+            assert simplex.pred_dir[u] == DIR_UP, u
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_initial_trees_are_strongly_feasible(seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        costs, supply, demand = small_instance(rng)
+        simplex = _NetworkSimplex(costs, supply, demand, None, None)
+        simplex.init_artificial()
+        assert_strongly_feasible(simplex)
+        simplex = _NetworkSimplex(costs, supply, demand, None, None)
+        simplex.init_warm_start(northwest_corner_method(costs, supply, demand))
+        assert_strongly_feasible(simplex)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_assignment(seed):
+    rng = random.Random(seed)
+    for _ in range(150):
+        costs, supply, demand = small_instance(rng)
+        expected = calculate_cost(assignment_method(costs, supply, demand), costs)
+        for warm_start in (None, vogel_approximation_method, northwest_corner_method(costs, supply, demand)):
+            alloc = network_simplex_method(costs, supply, demand, warm_start=warm_start)
+            assert alloc.row_totals() == supply
+            assert alloc.col_totals() == demand
+            assert calculate_cost(alloc, costs) == expected
+
+
+def test_sparse_matches_assignment():
+    rng = random.Random(5)
+    for _ in range(300):
+        dense, supply, demand = small_instance(rng)
+        costs = SparseCosts.from_dense(forbid_routes(rng, dense))
+        try:
+            expected = calculate_cost(assignment_method(costs, supply, demand), costs)
+        except ValueError:
+            with pytest.raises(ValueError):
+                network_simplex_method(costs, supply, demand)
+            continue
+        alloc = network_simplex_method(costs, supply, demand)
+        assert all(costs.get(i, j) is not None for (i, j), _ in alloc)
+        assert calculate_cost(alloc, costs) == expected
+
+
+def test_optimal_potentials():
+    rng = random.Random(9)
+    for _ in range(100):
+        costs, supply, demand = small_instance(rng, zeros=False)
+        result = network_simplex_solve(costs, supply, demand)
+        u, v = result["u"], result["v"]
+        assert all(c - u[i] - v[j] >= -1e-9 for i, row in enumerate(costs) for j, c in enumerate(row))
+        assert all(costs[i][j] - u[i] - v[j] == pytest.approx(0) for (i, j), _ in result["alloc"])
@@ -1,20 +1,80 @@
 # northwest_corner.py
 
+from cost_matrix.cost_matrix import SparseCosts, complete_allocations
+from instrumentation.instrumentation import record_counters
+from transport_solution.transport_solution import TransportSolution
+
 def northwest_corner_method(costs, supply, demand):
-    supply = supply.copy()
-    demand = demand.copy()
+    if isinstance(costs, SparseCosts):
+        return _northwest_corner_sparse(costs, supply, demand)
+    allocations = TransportSolution.for_quantities(supply, demand)
+    for (i, j), alloc in northwest_corner_stream(supply, demand):
+        allocations.append(i, j, alloc)
+    return allocations
+
+def northwest_corner_stream(supply, demand):
+    """
+    Versión generadora de la esquina noroeste en una matriz densa: consume supply y
+    demand de iterables (listas, generadores o read_quantities) y produce las
+    asignaciones ((proveedor, consumidor), cantidad) a medida que las calcula,
+    las mismas y en el mismo orden que northwest_corner_method. Los costos no
+    intervienen, así que quien necesite el costo total lo acumula al recibirlas.
+
+    Es un recorrido de dos punteros en O(m + n) con memoria constante: de cada
+    iterable solo se guarda la cantidad actual y la siguiente (para saber si la
+    fila o la columna es la última).
+    """
+    supply = iter(supply)
+    demand = iter(demand)
+    s = next(supply, None)
+    d = next(demand, None)
+    if s is None or d is None:
+        return
+    next_s = next(supply, None)
+    next_d = next(demand, None)
     i, j = 0, 0
-    allocations = []
-    while i < len(supply) and j < len(demand):
-        alloc = min(supply[i], demand[j])
-        allocations.append(((i, j), alloc))
-        supply[i] -= alloc
-        demand[j] -= alloc
-        if supply[i] == 0 and i < len(supply)-1:
+    steps = 0
+    while True:
+        alloc = min(s, d)
+        steps += 1
+        yield (i, j), alloc
+        s -= alloc
+        d -= alloc
+        if s == 0 and next_s is not None:
             i += 1
-        elif demand[j] == 0 and j < len(demand)-1:
+            s, next_s = next_s, next(supply, None)
+        elif d == 0 and next_d is not None:
             j += 1
+            d, next_d = next_d, next(demand, None)
+        elif next_s is None or next_d is None:
+            break
         else:
             i += 1
             j += 1
-    return allocations
+            s, next_s = next_s, next(supply, None)
+            d, next_d = next_d, next(demand, None)
+    # Cada paso examina una celda y asigna en ella
+    record_counters(iterations=steps, cells_examined=steps)
+
+def _northwest_corner_sparse(costs, supply, demand):
+    # Con rutas prohibidas la esquina noroeste avanza por las rutas permitidas de
+    # cada fila, de izquierda a derecha, saltando los consumidores ya satisfechos.
+    supply = supply.copy()
+    demand = demand.copy()
+    allocations = TransportSolution.for_quantities(supply, demand)
+    examined = 0
+    for i in range(len(supply)):
+        indices, _ = costs.row(i)
+        for j in indices:
+            if supply[i] == 0:
+                break
+            examined += 1
+            if demand[j] == 0:
+                continue
+            alloc = min(supply[i], demand[j])
+            allocations.append(i, j, alloc)
+            supply[i] -= alloc
+            demand[j] -= alloc
+    record_counters(iterations=len(allocations), cells_examined=examined)
+    # Si las rutas prohibidas bloquearon el recorrido se completa con caminos de aumento
+    return complete_allocations(costs, allocations, supply, demand)
@@ -0,0 +1,52 @@
+# northwest_corner/test_northwest_corner.py
+
+import random
+
+import pytest
+
+from benchmarks.instance_generators import small_instance
+from northwest_corner.northwest_corner import northwest_corner_method, northwest_corner_stream
+from table_io.table_io import read_quantities
+
+
+def reference_northwest_corner(supply, demand):
+    """La esquina noroeste original sobre listas."""
+    supply, demand = supply.copy(), demand.copy()
+    i, j = 0, 0
+    allocations = []
+    while i < len(supply) and j < len(demand):
+        alloc = min(supply[i], demand[j])
+        allocations.append(((i, j), alloc))
+        supply[i] -= alloc
+        demand[j] -= alloc
+        if supply[i] == 0 and i < len(supply) - 1:
+            i += 1
+        elif demand[j] == 0 and j < len(demand) - 1:
+            j += 1
+        else:
+            i += 1
+            j += 1
+    return allocations
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_stream_matches_the_list_version(seed):
+    costs, supply, demand = small_instance(random.Random(seed))
+    expected = reference_northwest_corner(supply, demand)
+    assert list(northwest_corner_stream(supply, demand)) == expected
+    assert list(northwest_corner_stream(iter(supply), (d for d in demand))) == expected
+    assert northwest_corner_method(costs, supply, demand) == expected
+
+
+def test_stream_from_files(tmp_path):
+    supply, demand = [7, 0, 6, 2], [4, 5, 0, 6]
+    (tmp_path / "supply.txt").write_text("7\n0\n6\n2\n")
+    (tmp_path / "demand.txt").write_text("4, 5; 0\t6\n")
+    stream = northwest_corner_stream(read_quantities(tmp_path / "supply.txt"),
+                                     read_quantities(tmp_path / "demand.txt"))
+    assert list(stream) == reference_northwest_corner(supply, demand)
+
+
+def test_stream_of_empty_quantities():
+    assert list(northwest_corner_stream([], [1])) == []
+    assert list(northwest_corner_stream([1], iter(()))) == []
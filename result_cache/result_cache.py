@@ -0,0 +1,319 @@
+# result_cache/result_cache.py
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+
+from cost_matrix.cost_matrix import DummyCosts, MappedCosts, SparseCosts
+from transport_core.transport_core import solve_method
+from transport_solution.transport_solution import TransportSolution
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+# Variable de entorno con el directorio del nivel en disco de default_cache()
+CACHE_DIR_ENV = "TRANSPORT_CACHE_DIR"
+
+# El nivel en disco guarda JSON y no pickle: el directorio puede ser compartido y
+# leer un pickle ajeno permitiría ejecutar código
+_CACHE_SUFFIX = ".json"
+
+# Versión del formato de los resultados guardados y de los métodos que los
+# calculan; entra en instance_key, así que hay que subirla cuando cambie lo que
+# retorna algún método para que los archivos viejos del disco dejen de coincidir
+CACHE_VERSION = 1
+
+
+def instance_key(costs, supply, demand, shortage_costs=None, surplus_costs=None):
+    """
+    Huella (BLAKE2b, en hexadecimal) del contenido de una instancia, o None si la
+    matriz no se puede resumir (p. ej. LazyCosts, que se calcula con una función).
+    Los números se resumen como bytes de arreglos int64 o float64, así que una
+    instancia entera y la misma con valores float tienen huellas distintas, como
+    también son distintos sus resultados (ver prepare_instance). La huella
+    incluye CACHE_VERSION.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(struct.pack("<cQ", b"V", CACHE_VERSION))
+    if not _update_costs(digest, costs):
+        return None
+    for values in (supply, demand, shortage_costs, surplus_costs):
+        if values is None:
+            digest.update(b"-")
+        else:
+            _update_values(digest, values)
+    return digest.hexdigest()
+
+def _update_costs(digest, costs):
+    if isinstance(costs, SparseCosts):
+        digest.update(struct.pack("<cQQ", b"S", costs.num_rows, costs.num_cols))
+        for values in (costs.indptr, costs.indices, costs.data):
+            _update_values(digest, values)
+        return True
+    if isinstance(costs, DummyCosts):
+        digest.update(b"D" + costs.dummy.encode("ascii"))
+        _update_values(digest, costs.penalties)
+        return _update_costs(digest, costs.costs)
+    if isinstance(costs, MappedCosts):
+        digest.update(struct.pack("<c1sQQ", b"M", costs.typecode.encode("ascii"), costs.num_rows, costs.num_cols))
+        digest.update(costs._view)
+        return True
+    if not isinstance(costs, list):
+        return False
+    digest.update(struct.pack("<cQ", b"L", len(costs)))
+    for row in costs:
+        _update_values(digest, row)
+    return True
+
+def _update_values(digest, values):
+    """Agrega una secuencia de números con su tipo y longitud (para que no se confundan al concatenar)."""
+    if isinstance(values, array):
+        packed = values
+    else:
+        values = list(values)
+        try:
+            packed = array('q', values)
+        except (TypeError, OverflowError):
+            try:
+                packed = array('d', values)
+            except TypeError:
+                packed = None
+    if packed is None:
+        data = repr(values).encode("utf-8")
+        digest.update(struct.pack("<cQ", b"r", len(data)))
+    else:
+        data = packed.tobytes()
+        digest.update(struct.pack("<cQ", packed.typecode.encode("ascii"), len(data)))
+    digest.update(data)
+
+
+class ResultCache:
+    """
+    Caché de resultados de los métodos indexada por el contenido de la instancia
+    (ver instance_key): un nivel en memoria LRU de a lo sumo max_entries
+    resultados y, si se da directory, un nivel en disco (un archivo JSON por
+    resultado, ver _encode) de a lo sumo max_disk_bytes, del que se descartan primero los
+    archivos usados hace más tiempo. Un acierto en disco vuelve a la memoria.
+    Se puede compartir entre hilos.
+
+    Los resultados se guardan tal cual; quien los recibe no debe modificarlos.
+    """
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, directory=None, max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._disk_bytes = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+
+    def get(self, method, key):
+        """Resultado guardado del método para la instancia con huella key, o None."""
+        name = f"{method}-{key}"
+        with self._lock:
+            result = self._memory.get(name)
+            if result is not None:
+                self._memory.move_to_end(name)
+                self.memory_hits += 1
+                return result
+            result = self._read_disk(name)
+            if result is not None:
+                self.disk_hits += 1
+                self._remember(name, result)
+                return result
+            self.misses += 1
+            return None
+
+    def put(self, method, key, result):
+        name = f"{method}-{key}"
+        with self._lock:
+            self._remember(name, result)
+            if self.directory is not None:
+                self._write_disk(name, result)
+
+    def solve(self, method, costs, supply, demand, shortage_costs=None, surplus_costs=None,
+              key=None, solver=solve_method, variant=None):
+        """
+        Igual que solver(method, costs, supply, demand, shortage_costs, surplus_costs)
+        (solve_method por defecto), pero retorna el resultado guardado si la misma
+        instancia ya se resolvió con ese método. key es la huella de la instancia
+        si ya se calculó (ver instance_key); variant distingue los resultados de
+        solvers que para el mismo método dan soluciones distintas.
+        """
+        if key is None:
+            key = instance_key(costs, supply, demand, shortage_costs, surplus_costs)
+        if key is None:
+            return solver(method, costs, supply, demand, shortage_costs, surplus_costs)
+        entry = method if variant is None else f"{method}.{variant}"
+        result = self.get(entry, key)
+        if result is None:
+            result = solver(method, costs, supply, demand, shortage_costs, surplus_costs)
+            self.put(entry, key, result)
+        return result
+
+    def stats(self):
+        """Aciertos por nivel, fallos y ocupación de la caché."""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "entries": len(self._memory),
+                "disk_bytes": self._disk_bytes,
+            }
+
+    def clear(self):
+        """Vacía ambos niveles (los contadores se conservan)."""
+        with self._lock:
+            self._memory.clear()
+            for path, _, _ in self._disk_entries():
+                _remove(path)
+            self._disk_bytes = 0
+
+    def _remember(self, name, result):
+        self._memory[name] = result
+        self._memory.move_to_end(name)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name + _CACHE_SUFFIX)
+
+    def _read_disk(self, name):
+        if self.directory is None:
+            return None
+        path = self._path(name)
+        try:
+            with open(path, "rb") as f:
+                result = json.loads(f.read(), object_hook=_decode)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError):
+            # Archivo dañado o de otra versión: se descarta
+            self._disk_bytes -= _remove(path)
+            return None
+        try:
+            os.utime(path)  # La fecha de modificación ordena el descarte por uso
+        except OSError:
+            pass
+        return result
+
+    def _write_disk(self, name, result):
+        try:
+            data = json.dumps(result, default=_encode, separators=(",", ":")).encode("utf-8")
+        except (TypeError, ValueError):
+            # Resultado con datos que no son JSON: solo queda en memoria
+            return
+        if len(data) > self.max_disk_bytes:
+            return
+        path = self._path(name)
+        previous = _size(path)
+        # Escritura atómica: otro proceso que comparta el directorio nunca lee un archivo a medias
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                f.write(data)
+            os.replace(temporary, path)
+        except OSError:
+            _remove(temporary)
+            return
+        self._disk_bytes += len(data) - previous
+        if self._disk_bytes > self.max_disk_bytes:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        # Otros procesos pueden haber escrito en el directorio: se vuelve a medir
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_disk_bytes:
+                break
+            total -= _remove(path)
+        self._disk_bytes = total
+
+    def _disk_entries(self):
+        """(ruta, fecha de modificación, tamaño) de los archivos de la caché en disco."""
+        if self.directory is None:
+            return []
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(_CACHE_SUFFIX):
+                    try:
+                        info = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((entry.path, info.st_mtime, info.st_size))
+        return entries
+
+
+def _encode(value):
+    """
+    Tipos de los resultados que JSON no tiene, como objetos de una sola clave
+    ("__solution__" o "__array__") que _decode reconstruye. Las tuplas vuelven
+    como listas.
+    """
+    if isinstance(value, TransportSolution):
+        return {"__solution__": [value.num_supply, value.num_demand, value.quantities.typecode,
+                                 value.rows.tolist(), value.cols.tolist(), value.quantities.tolist()]}
+    if isinstance(value, array):
+        return {"__array__": [value.typecode, value.tolist()]}
+    raise TypeError(f"No se puede guardar en la caché un {type(value).__name__}")
+
+def _decode(obj):
+    if len(obj) != 1:
+        return obj
+    if "__solution__" in obj:
+        num_supply, num_demand, typecode, rows, cols, quantities = obj["__solution__"]
+        solution = TransportSolution(num_supply, num_demand, typecode == 'q')
+        solution.rows.extend(rows)
+        solution.cols.extend(cols)
+        solution.quantities.extend(quantities)
+        return solution
+    if "__array__" in obj:
+        typecode, values = obj["__array__"]
+        return array(typecode, values)
+    return obj
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def _remove(path):
+    """Borra path si existe. Retorna los bytes liberados."""
+    size = _size(path)
+    try:
+        os.remove(path)
+    except OSError:
+        return 0
+    return size
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+def default_cache():
+    """
+    Caché compartida del proceso (interfaz gráfica, línea de comandos y lotes). Tiene
+    nivel en disco si la variable de entorno TRANSPORT_CACHE_DIR indica un directorio.
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResultCache(directory=os.environ.get(CACHE_DIR_ENV) or None)
+        return _default_cache
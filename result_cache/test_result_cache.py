@@ -0,0 +1,74 @@
+# result_cache/test_result_cache.py
+
+import json
+import pickle
+from array import array
+
+from result_cache import result_cache
+from result_cache.result_cache import ResultCache, instance_key
+
+
+def test_key_depends_on_cache_version(monkeypatch):
+    instance = ([[1, 2], [3, 4]], [3, 2], [1, 4])
+    key = instance_key(*instance)
+    assert key == instance_key(*instance)
+    monkeypatch.setattr(result_cache, "CACHE_VERSION", result_cache.CACHE_VERSION + 1)
+    assert instance_key(*instance) != key
+
+
+def test_stale_disk_entries_are_not_served(monkeypatch, tmp_path):
+    instance = ([[1, 2], [3, 4]], [3, 2], [1, 4])
+    cache = ResultCache(directory=str(tmp_path))
+    stale = cache.solve("vogel", *instance)
+    monkeypatch.setattr(result_cache, "CACHE_VERSION", result_cache.CACHE_VERSION + 1)
+    cache = ResultCache(directory=str(tmp_path))
+    assert cache.solve("vogel", *instance) == stale
+    assert cache.stats()["disk_hits"] == 0
+    assert cache.stats()["misses"] == 1
+
+
+def test_disk_entries_round_trip_as_json(tmp_path):
+    instance = ([[4, 6, 9], [5, 3, 8]], [7, 6], [4, 5, 4])
+    result = ResultCache(directory=str(tmp_path)).solve("vogel", *instance)
+    (path,) = tmp_path.iterdir()
+    assert path.suffix == ".json"
+    json.loads(path.read_text())
+    cache = ResultCache(directory=str(tmp_path))
+    restored = cache.solve("vogel", *instance)
+    assert cache.stats()["disk_hits"] == 1
+    assert restored == result
+    assert list(restored["alloc"]) == list(result["alloc"])
+    assert restored["alloc"].quantities.typecode == result["alloc"].quantities.typecode
+
+
+def test_arrays_round_trip_from_disk(tmp_path):
+    result = {"alloc": array('d', [1.5, 2.0]), "cost": 3.5}
+    ResultCache(directory=str(tmp_path)).put("m", "k", result)
+    restored = ResultCache(directory=str(tmp_path)).get("m", "k")
+    assert restored == result
+    assert restored["alloc"].typecode == 'd'
+
+
+def test_pickled_entries_are_never_loaded(tmp_path):
+    calls = []
+
+    class Payload:
+        def __reduce__(self):
+            return (calls.append, ("loaded",))
+
+    cache = ResultCache(directory=str(tmp_path))
+    path = tmp_path / "m-k.json"
+    path.write_bytes(pickle.dumps(Payload()))
+    (tmp_path / "m-old.pickle").write_bytes(pickle.dumps(Payload()))
+    assert cache.get("m", "k") is None
+    assert cache.get("m", "old") is None
+    assert calls == []
+    assert not path.exists()
+
+
+def test_results_that_are_not_json_stay_in_memory(tmp_path):
+    cache = ResultCache(directory=str(tmp_path))
+    result = {"alloc": object(), "cost": 1}
+    cache.put("m", "k", result)
+    assert list(tmp_path.iterdir()) == []
+    assert cache.get("m", "k") is result
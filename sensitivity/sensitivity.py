@@ -0,0 +1,183 @@
+# sensitivity/sensitivity.py
+
+from array import array
+from collections import deque
+from itertools import repeat
+from operator import add, sub
+
+from cost_matrix.cost_matrix import SparseCosts
+
+# Tolerancia para considerar negativo un costo reducido (la misma que el MODI)
+EPSILON = 1e-9
+
+INF = float('inf')
+
+
+def sensitivity_analysis(costs, basis):
+    """
+    Análisis de sensibilidad de una base óptima, por ejemplo result["basis"] de
+    modified_distribution_solve (celdas básicas, incluidas las degeneradas).
+
+    Los potenciales se obtienen resolviendo u_i + v_j = c_ij sobre el árbol de la
+    base, con potencial cero en el nodo de menor índice de cada componente (como el
+    MODI), y los costos reducidos c_ij - u_i - v_j de todas las celdas en una sola
+    pasada por filas hecha con map. u_i + v_j es lo que cuesta enviar una unidad
+    más de i a j, y u_i - u_k lo que cambia el costo si esa unidad sale de i en
+    lugar de k.
+
+    Rango de costos de una celda básica: sube o baja su costo solo cambia los
+    costos reducidos de las celdas no básicas cuyo ciclo la contiene, en +delta si
+    la celda gana cantidad al entrar la no básica y en -delta si la pierde. La base
+    sigue siendo óptima mientras ninguno se vuelva negativo. Para cada proveedor i
+    se cuelga el árbol de i: el ciclo de (i, j) es el camino de i a j, así que el
+    mínimo de los costos reducidos de la fila en el subárbol de cada nodo da la
+    cota de la arista que lo une con su padre (pierde si el nodo es un consumidor
+    y gana si es un proveedor). En total es O(m·(m + n)) en lugar de rehacer la
+    solución por cada celda. Con una base degenerada los rangos son los de la base
+    y pueden ser más estrechos que los de la solución.
+
+    Parámetros:
+        costs (list of list of float o SparseCosts): Matriz de costos.
+        basis (list of tuple): Celdas básicas (i, j), sin ciclos.
+
+    Retorna:
+        dict: "u" y "v" (potenciales), "reduced_costs" (filas array de costos
+        reducidos, o SparseCosts si costs lo es; cero en las celdas básicas),
+        "basis" (las celdas básicas en orden), "cost_lower" y "cost_upper" (arrays
+        alineados con basis: costo mínimo y máximo de cada celda básica con el que
+        la base sigue siendo óptima; infinito si no hay cota). El costo de una celda
+        no básica puede bajar hasta u_i + v_j antes de que convenga usarla.
+    """
+    sparse = isinstance(costs, SparseCosts)
+    num_supply = len(costs)
+    if sparse:
+        num_demand = costs.num_cols
+    else:
+        num_demand = len(costs[0]) if num_supply else 0
+    basis = sorted(basis)
+    adjacency = _basis_tree(basis, num_supply, num_demand)
+    potential = _potentials(costs, adjacency, num_supply)
+    u = potential[:num_supply]
+    v = potential[num_supply:]
+    # Enteros solo si lo son todos los costos (y con ellos los potenciales), no solo los de la base
+    typecode = 'q' if _integer_costs(costs, sparse) and all(isinstance(p, int) for p in potential) else 'd'
+
+    # Costos reducidos de todas las celdas, fila por fila
+    if sparse:
+        reduced_costs = costs.with_data(c - u[i] - v[j] for i, j, c in costs.arcs())
+        lines = [reduced_costs.row(i) for i in range(num_supply)]
+    else:
+        reduced_costs = [array(typecode, map(sub, row, map(add, v, repeat(ui)))) for ui, row in zip(u, costs)]
+        lines = [(range(num_demand), row) for row in reduced_costs]
+    for columns, values in lines:
+        if len(values) and min(values) < -EPSILON:
+            raise ValueError("La base no es óptima: hay costos reducidos negativos.")
+
+    # Cuánto puede subir (upper) o bajar (lower) el costo de cada celda básica
+    position = {cell: k for k, cell in enumerate(basis)}
+    upper = array('d', repeat(INF, len(basis)))
+    lower = array('d', repeat(INF, len(basis)))
+    for i, (columns, values) in enumerate(lines):
+        if not adjacency[i]:
+            continue
+        # subtree_min[node]: menor costo reducido de (i, j) no básica con j en el subárbol de node
+        subtree_min = {}
+        for j, d in zip(columns, values):
+            if (i, j) not in position:
+                subtree_min[num_supply + j] = d
+        order, parent = _hang(adjacency, i)
+        for node in reversed(order):
+            if node == i:
+                continue
+            bound = subtree_min.get(node, INF)
+            if bound == INF:
+                continue
+            up = parent[node]
+            if node < num_supply:
+                k = position[(node, up - num_supply)]
+                if bound < lower[k]:
+                    lower[k] = bound
+            else:
+                k = position[(up, node - num_supply)]
+                if bound < upper[k]:
+                    upper[k] = bound
+            if bound < subtree_min.get(up, INF):
+                subtree_min[up] = bound
+
+    base_costs = [costs[i][j] for i, j in basis]
+    return {
+        "u": array(typecode, u),
+        "v": array(typecode, v),
+        "reduced_costs": reduced_costs,
+        "basis": basis,
+        "cost_lower": array('d', map(sub, base_costs, lower)),
+        "cost_upper": array('d', map(add, base_costs, upper)),
+    }
+
+def _integer_costs(costs, sparse):
+    if sparse:
+        rows = [costs.data]
+    else:
+        rows = costs
+    for row in rows:
+        if isinstance(row, array):
+            if row.typecode in 'fd':
+                return False
+        elif not all(isinstance(c, int) for c in row):
+            return False
+    return True
+
+def _basis_tree(basis, num_supply, num_demand):
+    """Listas de adyacencia del bosque de la base; falla si las celdas forman un ciclo."""
+    num_nodes = num_supply + num_demand
+    adjacency = [[] for _ in range(num_nodes)]
+    union_find = list(range(num_nodes))
+
+    def find(x):
+        while union_find[x] != x:
+            union_find[x] = union_find[union_find[x]]
+            x = union_find[x]
+        return x
+
+    for i, j in basis:
+        if not (0 <= i < num_supply and 0 <= j < num_demand):
+            raise ValueError(f"Celda básica fuera de la matriz ({i}, {j}).")
+        a, b = find(i), find(num_supply + j)
+        if a == b:
+            raise ValueError(f"La base tiene un ciclo en ({i}, {j}).")
+        union_find[a] = b
+        adjacency[i].append(num_supply + j)
+        adjacency[num_supply + j].append(i)
+    return adjacency
+
+def _potentials(costs, adjacency, num_supply):
+    potential = [0] * len(adjacency)
+    seen = [False] * len(adjacency)
+    for root in range(len(adjacency)):
+        if seen[root]:
+            continue
+        seen[root] = True
+        queue = deque([root])
+        while queue:
+            node = queue.popleft()
+            for other in adjacency[node]:
+                if seen[other]:
+                    continue
+                seen[other] = True
+                if node < num_supply:
+                    potential[other] = costs[node][other - num_supply] - potential[node]
+                else:
+                    potential[other] = costs[other][node - num_supply] - potential[node]
+                queue.append(other)
+    return potential
+
+def _hang(adjacency, root):
+    """Orden BFS y padres de los nodos del árbol de root, colgado de root."""
+    parent = {root: -1}
+    order = [root]
+    for node in order:
+        for other in adjacency[node]:
+            if other != parent[node]:
+                parent[other] = node
+                order.append(other)
+    return order, parent
@@ -0,0 +1,61 @@
+# sensitivity/test_sensitivity.py
+
+import random
+from array import array
+
+import pytest
+
+from benchmarks.instance_generators import small_instance
+from modified_distribution.modified_distribution import modified_distribution_solve
+from sensitivity.sensitivity import sensitivity_analysis
+from transport_core.transport_core import calculate_cost, get_method
+
+
+def test_mixed_integer_and_float_costs():
+    result = sensitivity_analysis([[1, 2.5], [3, 1]], [(0, 0), (1, 0), (1, 1)])
+    assert result["u"].typecode == 'd'
+    assert list(result["reduced_costs"][0]) == [0, 3.5]
+    assert list(result["cost_lower"]) == [-float('inf'), -0.5, -float('inf')]
+    assert list(result["cost_upper"]) == [4.5, float('inf'), 4.5]
+    # Sin base los potenciales son cero, pero los costos siguen siendo float
+    assert list(sensitivity_analysis([[1.5, 2], [3, 1]], [])["reduced_costs"][0]) == [1.5, 2]
+
+
+def test_integer_costs_stay_integer():
+    result = sensitivity_analysis([array('q', [1, 2]), array('q', [3, 1])], [(0, 0), (1, 0), (1, 1)])
+    assert result["u"].typecode == result["reduced_costs"][0].typecode == 'q'
+
+
+def _with_cost(costs, cell, value):
+    changed = [list(row) for row in costs]
+    changed[cell[0]][cell[1]] = value
+    return changed
+
+
+@pytest.mark.parametrize("fractional", (False, True))
+def test_ranges_match_resolving(fractional):
+    rng = random.Random(24)
+    network_simplex = get_method("network_simplex")
+    step = 0.01
+    for _ in range(60):
+        costs, supply, demand = small_instance(rng, zeros=False)
+        if fractional:
+            costs = [[c + 0.25 if rng.random() < 0.5 else c for c in row] for row in costs]
+        solution = modified_distribution_solve(costs, supply, demand, [])
+        ranges = sensitivity_analysis(costs, solution["basis"])
+        for cell, lower, upper in zip(ranges["basis"], ranges["cost_lower"], ranges["cost_upper"]):
+            cost = costs[cell[0]][cell[1]]
+            for bound, outside in ((upper, upper + step), (lower, lower - step)):
+                if abs(bound) == float('inf'):
+                    inside = cost + (100 if bound > 0 else -100)
+                else:
+                    inside = (cost + bound) / 2
+                # Dentro del rango la base sigue siendo óptima y el mismo envío también
+                changed = _with_cost(costs, cell, inside)
+                sensitivity_analysis(changed, solution["basis"])
+                optimum = calculate_cost(network_simplex(changed, supply, demand), changed)
+                assert calculate_cost(solution["alloc"], changed) == pytest.approx(optimum)
+                # Fuera del rango algún costo reducido se vuelve negativo
+                if abs(bound) != float('inf'):
+                    with pytest.raises(ValueError):
+                        sensitivity_analysis(_with_cost(costs, cell, outside), solution["basis"])
@@ -1,39 +1,91 @@
 # sequential_steps/sequential_steps.py
 
+from cost_matrix.cost_matrix import SparseCosts, complete_allocations
+from instrumentation.instrumentation import record_counters
+from transport_solution.transport_solution import TransportSolution
+
 def sequential_steps_method(costs, supply, demand):
     """
     Implementación del Método de Pasos Secuenciales (Banquillo) para el Problema de Transporte.
     
     Parámetros:
-        costs (list of list of float): Matriz de costos.
+        costs (list of list of float o SparseCosts): Matriz de costos.
         supply (list of float): Oferta de cada proveedor.
         demand (list of float): Demanda de cada consumidor.
     
     Retorna:
-        allocations (list of tuple): Lista de asignaciones en formato ((proveedor, consumidor), cantidad).
+        allocations (TransportSolution): Asignaciones; se itera como tuplas ((proveedor, consumidor), cantidad).
     """
-    allocations = []
+    allocations = TransportSolution.for_quantities(supply, demand)
+    if not isinstance(costs, SparseCosts):
+        for (i, j), allocation in sequential_steps_stream(supply, demand):
+            allocations.append(i, j, allocation)
+        return allocations
     num_supply = len(supply)
-    num_demand = len(demand)
     
     # Crear copias para no modificar las originales
     supply_remaining = supply.copy()
     demand_remaining = demand.copy()
     
-    # Iterar sobre cada celda de la matriz en orden secuencial (fila por fila)
+    # Iterar sobre las rutas permitidas de cada fila en orden secuencial (fila por fila)
+    examined = 0
     for i in range(num_supply):
-        for j in range(num_demand):
+        for j in costs.row(i)[0]:
             if supply_remaining[i] == 0:
                 break  # Pasar al siguiente proveedor si la oferta es 0
+            examined += 1
             if demand_remaining[j] == 0:
                 continue  # Pasar al siguiente consumidor si la demanda es 0
             
             # Asignar la cantidad mínima entre oferta y demanda
             allocation = min(supply_remaining[i], demand_remaining[j])
-            allocations.append(((i, j), allocation))
+            allocations.append(i, j, allocation)
             
             # Actualizar las ofertas y demandas restantes
             supply_remaining[i] -= allocation
             demand_remaining[j] -= allocation
     
-    return allocations
+    record_counters(iterations=len(allocations), cells_examined=examined)
+    # Si las rutas prohibidas bloquearon el recorrido se completa con caminos de aumento
+    return complete_allocations(costs, allocations, supply_remaining, demand_remaining)
+
+def sequential_steps_stream(supply, demand):
+    """
+    Versión generadora de los pasos secuenciales en una matriz densa: consume
+    supply y demand de iterables (listas, generadores o read_quantities) y produce
+    las asignaciones ((proveedor, consumidor), cantidad) a medida que las calcula.
+    
+    En una matriz densa, cuando una fila se agota todas las columnas anteriores a
+    la actual ya lo están, así que en lugar de volver a recorrerlas basta un
+    puntero por fila y otro por columna: el recorrido es O(m + n) con memoria
+    constante y da las mismas asignaciones que sequential_steps_method. Termina
+    en cuanto se agota la demanda, sin leer el resto de la oferta.
+    """
+    supply = enumerate(supply)
+    demand = iter(demand)
+    i, s = -1, 0
+    j, d = -1, 0
+    steps = 0
+    # Celdas visitadas: las asignaciones más las de consumidores sin demanda que se saltan
+    skipped = 0
+    while True:
+        if d == 0:
+            # Siguiente consumidor, antes de leer más oferta
+            d = next(demand, None)
+            if d is None:
+                break
+            j += 1
+            if d == 0:
+                skipped += 1
+            continue
+        if s == 0:
+            i, s = next(supply, (None, None))
+            if s is None:
+                break
+            continue
+        allocation = min(s, d)
+        steps += 1
+        yield (i, j), allocation
+        s -= allocation
+        d -= allocation
+    record_counters(iterations=steps, cells_examined=steps + skipped)
@@ -0,0 +1,46 @@
+# sequential_steps/test_sequential_steps.py
+
+import random
+
+import pytest
+
+from benchmarks.instance_generators import small_instance
+from cost_matrix.cost_matrix import SparseCosts
+from sequential_steps.sequential_steps import sequential_steps_method, sequential_steps_stream
+
+
+def reference_sequential_steps(supply, demand):
+    """Los pasos secuenciales originales: cada fila vuelve a recorrer todas las columnas."""
+    supply, demand = supply.copy(), demand.copy()
+    allocations = []
+    for i in range(len(supply)):
+        for j in range(len(demand)):
+            if supply[i] == 0:
+                break
+            if demand[j] == 0:
+                continue
+            alloc = min(supply[i], demand[j])
+            allocations.append(((i, j), alloc))
+            supply[i] -= alloc
+            demand[j] -= alloc
+    return allocations
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_stream_matches_the_list_version(seed):
+    costs, supply, demand = small_instance(random.Random(seed))
+    expected = reference_sequential_steps(supply, demand)
+    assert list(sequential_steps_stream(supply, demand)) == expected
+    assert list(sequential_steps_stream(iter(supply), (d for d in demand))) == expected
+    assert sequential_steps_method(costs, supply, demand) == expected
+    # Con todas las rutas permitidas la versión dispersa recorre las mismas celdas
+    assert sequential_steps_method(SparseCosts.from_dense(costs), supply, demand) == expected
+
+
+def test_stream_stops_when_demand_runs_out():
+    def supply():
+        yield 3
+        yield 2
+        raise AssertionError("Se leyó oferta después de agotar la demanda")
+
+    assert list(sequential_steps_stream(supply(), [1, 0, 4])) == [((0, 0), 1), ((0, 2), 2), ((1, 2), 2)]
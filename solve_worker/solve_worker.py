@@ -0,0 +1,61 @@
+# solve_worker/solve_worker.py
+
+import queue
+import threading
+
+
+class SolveWorker(threading.Thread):
+    """
+    Ejecuta una lista de tareas (nombre, función, argumentos) en un hilo aparte y
+    publica el avance en una cola, para que la interfaz gráfica la lea con after()
+    sin bloquear el bucle de Tk.
+
+    Mensajes de la cola:
+        ("started", nombre, índice, total)
+        ("done", nombre, resultado)
+        ("error", nombre, excepción)
+        ("finished", cancelado)
+
+    cancel() detiene el trabajo entre una tarea y la siguiente: la tarea en curso
+    no se interrumpe (los métodos no revisan ninguna señal mientras calculan), así
+    que un método largo sigue ocupando el hilo hasta terminar, aunque su resultado
+    ya no se publica. Después de cancelar se puede lanzar otro SolveWorker sin
+    esperar; los dos corren a la vez hasta que el primero termina su tarea.
+    """
+    def __init__(self, tasks):
+        super().__init__(daemon=True)
+        self.tasks = list(tasks)
+        self.messages = queue.Queue()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self):
+        total = len(self.tasks)
+        for index, (name, function, args) in enumerate(self.tasks):
+            if self.cancelled:
+                break
+            self.messages.put(("started", name, index, total))
+            try:
+                result = function(*args)
+            except Exception as error:
+                if not self.cancelled:
+                    self.messages.put(("error", name, error))
+                continue
+            if not self.cancelled:
+                self.messages.put(("done", name, result))
+        self.messages.put(("finished", self.cancelled))
+
+    def poll(self):
+        """Retorna los mensajes pendientes sin bloquear."""
+        pending = []
+        while True:
+            try:
+                pending.append(self.messages.get_nowait())
+            except queue.Empty:
+                return pending
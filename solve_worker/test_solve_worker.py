@@ -0,0 +1,47 @@
+# solve_worker/test_solve_worker.py
+
+import threading
+
+from solve_worker.solve_worker import SolveWorker
+
+
+def wait(worker):
+    worker.join(timeout=10)
+    assert not worker.is_alive()
+    return worker.poll()
+
+
+def test_messages_in_order():
+    def fail():
+        raise ValueError("sin solución")
+
+    worker = SolveWorker([("a", lambda x: x + 1, (1,)), ("b", fail, ()), ("c", lambda: "ok", ())])
+    worker.start()
+    messages = wait(worker)
+    assert messages[0] == ("started", "a", 0, 3)
+    assert messages[1] == ("done", "a", 2)
+    assert messages[2] == ("started", "b", 1, 3)
+    assert messages[3][:2] == ("error", "b") and isinstance(messages[3][2], ValueError)
+    assert messages[4:] == [("started", "c", 2, 3), ("done", "c", "ok"), ("finished", False)]
+
+
+def test_cancel_waits_for_the_running_task():
+    running, release = threading.Event(), threading.Event()
+    finished = []
+
+    def long_task():
+        running.set()
+        release.wait(timeout=10)
+        finished.append(True)
+        return "tarde"
+
+    worker = SolveWorker([("largo", long_task, ()), ("siguiente", lambda: "nunca", ())])
+    worker.start()
+    running.wait(timeout=10)
+    worker.cancel()
+    # La tarea en curso no se interrumpe: el hilo sigue vivo hasta que termina
+    assert worker.is_alive()
+    release.set()
+    messages = wait(worker)
+    assert finished == [True]
+    assert messages == [("started", "largo", 0, 2), ("finished", True)]
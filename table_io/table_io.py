@@ -0,0 +1,165 @@
+# table_io/table_io.py
+
+import csv
+import os
+import re
+import zipfile
+from xml.etree import ElementTree
+
+from transport_core.transport_core import parse_number
+
+# Separadores de read_quantities: tabuladores, comas, punto y coma y espacios
+_QUANTITY_SEPARATORS = re.compile(r"[\s,;]+")
+
+# Espacios de nombres de SpreadsheetML (XLSX)
+_MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+def parse_delimited(text):
+    """
+    Convierte texto tabular en filas de celdas (texto). Acepta lo que copia una hoja
+    de cálculo (separado por tabuladores) y CSV separado por comas o por punto y
+    coma (el que más aparezca). Las filas vacías se omiten.
+    """
+    lines = text.splitlines()
+    if "\t" in text:
+        rows = [line.split("\t") for line in lines]
+    else:
+        delimiter = ";" if text.count(";") > text.count(",") else ","
+        rows = list(csv.reader(lines, delimiter=delimiter))
+    return [[cell.strip() for cell in row] for row in rows if any(cell.strip() for cell in row)]
+
+def read_xlsx(path):
+    """
+    Lee la primera hoja de un archivo XLSX como filas de celdas (texto), sin
+    dependencias externas. Las celdas ausentes quedan como "".
+    """
+    with zipfile.ZipFile(path) as archive:
+        shared = _shared_strings(archive)
+        sheet = _first_sheet(archive)
+        rows = {}
+        width = 0
+        # El atributo r de filas y celdas es opcional: sin él la fila o celda sigue a la anterior
+        i, j = -1, -1
+        with archive.open(sheet) as f:
+            for event, element in ElementTree.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if element.tag == _MAIN_NS + "row":
+                        reference = element.get("r")
+                        i = int(reference) - 1 if reference else i + 1
+                        j = -1
+                    continue
+                if element.tag != _MAIN_NS + "c":
+                    continue
+                reference = element.get("r")
+                if reference:
+                    i, j = _cell_position(reference)
+                else:
+                    j += 1
+                kind = element.get("t")
+                if kind == "inlineStr":
+                    value = "".join(t.text or "" for t in element.iter(_MAIN_NS + "t"))
+                else:
+                    v = element.find(_MAIN_NS + "v")
+                    value = "" if v is None or v.text is None else v.text
+                    if kind == "s" and value:
+                        value = shared[int(value)]
+                rows.setdefault(i, {})[j] = value
+                width = max(width, j + 1)
+                element.clear()
+    if not rows:
+        return []
+    table = []
+    for i in range(max(rows) + 1):
+        cells = rows.get(i, {})
+        table.append([cells.get(j, "").strip() for j in range(width)])
+    return [row for row in table if any(row)]
+
+def read_table(path):
+    """Lee un archivo CSV, TSV o XLSX (según la extensión) como filas de celdas."""
+    if os.path.splitext(path)[1].lower() == ".xlsx":
+        return read_xlsx(path)
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return parse_delimited(f.read())
+
+def read_quantities(path):
+    """
+    Lee las cantidades de un archivo de texto (una por línea o separadas por
+    tabuladores, comas, punto y coma o espacios) como números (ver parse_number),
+    una por una y sin cargar el archivo entero. Sirve de oferta o demanda para
+    northwest_corner_stream y sequential_steps_stream.
+    """
+    with open(path, encoding="utf-8-sig") as f:
+        for line in f:
+            for cell in _QUANTITY_SEPARATORS.split(line):
+                if cell:
+                    yield parse_number(cell)
+
+def split_table(rows):
+    """
+    Separa filas con la disposición de la tabla de la interfaz: una fila por
+    proveedor con sus costos y la oferta al final, y una última fila con las
+    demandas. Retorna (filas de costos, ofertas, demandas), todo como texto.
+
+    El número de consumidores sale de las filas de proveedores (una celda de costo
+    vacía es una ruta prohibida, pero la oferta no puede faltar). Las celdas vacías
+    al final de una fila se ignoran; en la fila de demanda no puede haber huecos.
+    """
+    if len(rows) < 2:
+        raise ValueError("La tabla necesita al menos una fila de proveedor y la fila de demanda.")
+    provider_rows = [_trim_row(row) for row in rows[:-1]]
+    num_demand = len(provider_rows[0]) - 1
+    if num_demand < 1 or any(len(row) != num_demand + 1 for row in provider_rows):
+        raise ValueError("Las dimensiones de costos, oferta y demanda no coinciden.")
+    demand = _trim_row(rows[-1])
+    if len(demand) != num_demand:
+        raise ValueError("Las dimensiones de costos, oferta y demanda no coinciden.")
+    for j, cell in enumerate(demand):
+        if not cell.strip():
+            raise ValueError(f"Falta la demanda del consumidor {j + 1}.")
+    return [row[:num_demand] for row in provider_rows], [row[num_demand] for row in provider_rows], demand
+
+def _trim_row(row):
+    """La fila sin las celdas vacías del final."""
+    end = len(row)
+    while end and not row[end - 1].strip():
+        end -= 1
+    return list(row[:end])
+
+def _shared_strings(archive):
+    try:
+        f = archive.open("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    strings = []
+    with f:
+        for _, element in ElementTree.iterparse(f):
+            if element.tag == _MAIN_NS + "si":
+                strings.append("".join(t.text or "" for t in element.iter(_MAIN_NS + "t")))
+                element.clear()
+    return strings
+
+def _first_sheet(archive):
+    """Ruta dentro del ZIP de la primera hoja del libro."""
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    sheet = workbook.find(f"{_MAIN_NS}sheets/{_MAIN_NS}sheet")
+    relation_id = sheet.get(_REL_NS + "id")
+    relations = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    for relation in relations.iter(_PACKAGE_REL_NS + "Relationship"):
+        if relation.get("Id") == relation_id:
+            target = relation.get("Target")
+            return target.lstrip("/") if target.startswith("/") else "xl/" + target
+    raise ValueError("El archivo XLSX no tiene hojas.")
+
+def _cell_position(reference):
+    """Convierte una referencia como "AB12" en (fila, columna) desde 0."""
+    match = re.fullmatch(r"([A-Z]+)(\d+)", reference)
+    if match is None:
+        raise ValueError(f"Referencia de celda inválida en el archivo XLSX: {reference}")
+    letters, number = match.groups()
+    j = 0
+    for letter in letters:
+        j = j * 26 + ord(letter) - ord("A") + 1
+    return int(number) - 1, j - 1
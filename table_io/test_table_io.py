@@ -0,0 +1,87 @@
+# table_io/test_table_io.py
+
+import zipfile
+
+import pytest
+
+from table_io.table_io import parse_delimited, read_xlsx, split_table
+
+WORKBOOK = (
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Hoja1" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+RELATIONS = (
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/></Relationships>'
+)
+SHARED_STRINGS = (
+    '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<si><t>-</t></si><si><t>20</t></si></sst>'
+)
+
+
+def write_xlsx(path, sheet_data):
+    """Libro mínimo con una hoja cuyo sheetData es el XML dado."""
+    sheet = ('<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+             f'<sheetData>{sheet_data}</sheetData></worksheet>')
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("xl/workbook.xml", WORKBOOK)
+        archive.writestr("xl/_rels/workbook.xml.rels", RELATIONS)
+        archive.writestr("xl/sharedStrings.xml", SHARED_STRINGS)
+        archive.writestr("xl/worksheets/sheet1.xml", sheet)
+    return str(path)
+
+
+@pytest.mark.parametrize("text", (
+    "1\t2\t10\n\n3\t4\t20\n15\t15\n",
+    "1;2;10\n3;4;20\n15;15\n",
+    "1,2,10\n 3 , 4 ,20\n,,\n15,15\n",
+))
+def test_parse_delimited(text):
+    assert parse_delimited(text) == [["1", "2", "10"], ["3", "4", "20"], ["15", "15"]]
+
+
+def test_parse_delimited_keeps_quoted_commas():
+    assert parse_delimited('"1,5";2;3\n4;5;6\n') == [["1,5", "2", "3"], ["4", "5", "6"]]
+
+
+def test_split_table():
+    rows = [["1", "", "3", "10"], ["4", "5", "6", "20"], ["10", "5", "15", ""]]
+    assert split_table(rows) == ([["1", "", "3"], ["4", "5", "6"]], ["10", "20"], ["10", "5", "15"])
+
+
+@pytest.mark.parametrize("rows", (
+    # Un hueco en la demanda no corre las columnas
+    [["1", "2", "3", "10"], ["4", "5", "6", "20"], ["10", "", "20", ""]],
+    # Falta una demanda, sobra una o falta la oferta de un proveedor
+    [["1", "2", "3", "10"], ["4", "5", "6", "20"], ["10", "20"]],
+    [["1", "2", "10"], ["4", "5", "20"], ["10", "10", "10"]],
+    [["1", "2", "10"], ["4", "5", ""], ["10", "20"]],
+    [["1", "2", "10"]],
+))
+def test_split_table_rejects_misaligned_tables(rows):
+    with pytest.raises(ValueError):
+        split_table(rows)
+
+
+def test_read_xlsx(tmp_path):
+    path = write_xlsx(tmp_path / "tabla.xlsx", (
+        '<row r="1"><c r="A1"><v>1</v></c><c r="B1" t="s"><v>0</v></c><c r="C1"><v>10</v></c></row>'
+        '<row r="3"><c r="A3"><v>3</v></c><c r="B3" t="inlineStr"><is><t>4</t></is></c>'
+        '<c r="C3" t="s"><v>1</v></c></row>'
+        '<row r="4"><c r="A4"><v>15</v></c><c r="B4"><v>15</v></c></row>'
+    ))
+    assert read_xlsx(path) == [["1", "-", "10"], ["3", "4", "20"], ["15", "15", ""]]
+
+
+def test_read_xlsx_without_cell_references(tmp_path):
+    # r es opcional en filas y celdas: cada una sigue a la anterior
+    path = write_xlsx(tmp_path / "tabla.xlsx", (
+        '<row><c><v>1</v></c><c><v>2</v></c><c><v>10</v></c></row>'
+        '<row><c><v>3</v></c><c r="C2"><v>20</v></c></row>'
+        '<row r="3"><c><v>15</v></c><c><v>15</v></c></row>'
+    ))
+    rows = read_xlsx(path)
+    assert rows == [["1", "2", "10"], ["3", "", "20"], ["15", "15", ""]]
+    assert split_table(rows) == ([["1", "2"], ["3", ""]], ["10", "20"], ["15", "15"])
@@ -0,0 +1,38 @@
+# test_cli.py
+
+import json
+import subprocess
+import sys
+
+# Módulos que solo deben cargarse con --portfolio, --decompose, --cache-dir o entrada XLSX
+HEAVY_MODULES = ("multiprocessing", "concurrent.futures.process", "multiprocessing.shared_memory",
+                 "zipfile", "batch_solve.batch_solve", "result_cache.result_cache")
+
+
+def run_cli(tmp_path, *args):
+    """Ejecuta cli.main en otro intérprete; retorna (líneas de salida, módulos pesados cargados)."""
+    path = tmp_path / "instancia.json"
+    path.write_text(json.dumps({"costs": [[1, 2], [3, 1]], "supply": [5, 5], "demand": [5, 5]}))
+    code = (
+        "import io, json, sys, contextlib, cli\n"
+        "out = io.StringIO()\n"
+        "with contextlib.redirect_stdout(out):\n"
+        f"    cli.main({[str(path), *args]!r})\n"
+        f"print(json.dumps([out.getvalue().splitlines(), [m for m in {HEAVY_MODULES!r} if m in sys.modules]]))\n"
+    )
+    done = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    lines, loaded = json.loads(done.stdout)
+    return [json.loads(line) for line in lines], loaded
+
+
+def test_heuristics_do_not_load_heavy_modules(tmp_path):
+    records, loaded = run_cli(tmp_path, "--methods", "vogel,minimum_cost")
+    assert [record["cost"] for record in records] == [10, 10]
+    assert loaded == []
+
+
+def test_cache_loads_on_demand(tmp_path):
+    records, loaded = run_cli(tmp_path, "--methods", "vogel", "--cache-dir", str(tmp_path / "cache"))
+    assert records[0]["cost"] == 10
+    assert "result_cache.result_cache" in loaded
+    assert "batch_solve.batch_solve" not in loaded
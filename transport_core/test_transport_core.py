@@ -0,0 +1,100 @@
+# transport_core/test_transport_core.py
+
+import random
+from array import array
+
+import pytest
+
+from benchmarks.instance_generators import small_instance
+from transport_core.transport_core import METHODS, is_balanced, parse_number, prepare_instance, solve_method
+
+
+def test_parse_number_is_exact():
+    assert parse_number("12") == 12 and isinstance(parse_number("12.0"), int)
+    assert parse_number("1e3") == 1000 and isinstance(parse_number("1e3"), int)
+    assert parse_number("0.1") == 0.1
+
+
+def test_is_balanced():
+    assert is_balanced([0.1, 0.2], [0.3])
+    assert is_balanced([2 ** 62, 1], [2 ** 62 + 1])
+    # Con enteros la comparación es exacta, sin tolerancia
+    assert not is_balanced([10 ** 12, 1], [10 ** 12])
+    assert not is_balanced([1.0, 2.0], [3.5])
+
+
+def test_prepare_instance_types():
+    costs, supply, demand = prepare_instance([[1, 2.0], [3, 4]], [5.0, 5], [4, 6])
+    assert supply == [5, 5] and demand == [4, 6]
+    assert all(type(x) is int for x in supply + demand)
+    assert all(isinstance(row, array) and row.typecode == 'q' for row in costs)
+    # Un costo o una cantidad fraccionaria dejan ese dato como está
+    costs, supply, demand = prepare_instance([[1, 2.5], [3, 4]], [4.5, 5.5], [4, 6])
+    assert costs == [[1, 2.5], [3, 4]] and supply == [4.5, 5.5]
+
+
+@pytest.mark.parametrize("method", [m for m in METHODS if m != "assignment"])
+def test_integer_mode_matches_float_input(method):
+    rng = random.Random(10)
+    for _ in range(40):
+        costs, supply, demand = small_instance(rng)
+        float_result = solve_method(method, [[float(c) for c in row] for row in costs],
+                                    [float(s) for s in supply], [float(d) for d in demand])
+        result = solve_method(method, *prepare_instance(costs, supply, demand))
+        assert type(result["cost"]) is int
+        assert all(type(q) is int for _, q in result["alloc"])
+        assert result["cost"] == float_result["cost"]
+        if method != "auction":
+            assert list(result["alloc"]) == list(float_result["alloc"])
+
+
+def unbalanced_instance(rng):
+    """Instancia chica con un faltante o un sobrante y penalizaciones por nodo."""
+    costs, supply, demand = small_instance(rng, zeros=False)
+    if rng.random() < 0.5:
+        demand[rng.randrange(len(demand))] += rng.randint(1, 9)
+    else:
+        supply[rng.randrange(len(supply))] += rng.randint(1, 9)
+    shortage_costs = [rng.randint(0, 30) for _ in demand]
+    surplus_costs = [rng.randint(0, 30) for _ in supply]
+    return costs, supply, demand, shortage_costs, surplus_costs
+
+
+@pytest.mark.parametrize("method", [m for m in METHODS if m != "assignment"])
+def test_dummy_node_split(method):
+    rng = random.Random(11)
+    for _ in range(30):
+        costs, supply, demand, shortage_costs, surplus_costs = unbalanced_instance(rng)
+        result = solve_method(method, costs, supply, demand, shortage_costs, surplus_costs)
+        alloc = result["alloc"]
+        assert all(i < len(supply) and j < len(demand) for (i, j), _ in alloc)
+        assert [a + b for a, b in zip(alloc.row_totals(), result["unused_supply"])] == supply
+        assert [a + b for a, b in zip(alloc.col_totals(), result["unmet_demand"])] == demand
+        # Solo hay faltante o sobrante, y solo se penaliza el que hay
+        assert not (any(result["unmet_demand"]) and any(result["unused_supply"]))
+        assert result["penalty_cost"] == (
+            sum(q * c for q, c in zip(result["unmet_demand"], shortage_costs))
+            + sum(q * c for q, c in zip(result["unused_supply"], surplus_costs)))
+        assert result["cost"] == alloc.total_cost(costs)
+
+
+@pytest.mark.parametrize("method", ["modified_distribution", "network_simplex", "auction"])
+def test_dummy_node_matches_an_explicit_dummy(method):
+    rng = random.Random(12)
+    for _ in range(30):
+        costs, supply, demand, shortage_costs, surplus_costs = unbalanced_instance(rng)
+        difference = sum(demand) - sum(supply)
+        if difference > 0:
+            padded = (costs + [shortage_costs], supply + [difference], demand)
+        else:
+            padded = ([row + [c] for row, c in zip(costs, surplus_costs)], supply, demand + [-difference])
+        result = solve_method(method, costs, supply, demand, shortage_costs, surplus_costs)
+        optimum = solve_method("network_simplex", *padded)["cost"]
+        assert result["cost"] + result["penalty_cost"] == optimum
+
+
+def test_balanced_instance_has_no_dummy_quantities():
+    result = solve_method("vogel", [[1, 2], [3, 4]], [3, 2], [1, 4], shortage_costs=[5, 5], surplus_costs=[5, 5])
+    assert result["unmet_demand"] == [0, 0]
+    assert result["unused_supply"] == [0, 0]
+    assert result["penalty_cost"] == 0
@@ -0,0 +1,270 @@
+# transport_core/transport_core.py
+
+import importlib
+import math
+import string
+from array import array
+from fractions import Fraction
+
+from transport_solution.transport_solution import TransportSolution
+
+# Métodos disponibles fuera de la interfaz gráfica, por identificador. Cada método
+# se importa la primera vez que se usa (ver get_method), así que importar este
+# módulo no carga ningún paquete de solución.
+METHODS = {
+    "northwest_corner": ("northwest_corner.northwest_corner", "northwest_corner_method"),
+    "vogel": ("vogel_approximation.vogel_approximation", "vogel_approximation_method"),
+    "minimum_cost": ("minimum_cost.minimum_cost", "minimum_cost_method"),
+    "sequential_steps": ("sequential_steps.sequential_steps", "sequential_steps_method"),
+    "modified_distribution": ("modified_distribution.modified_distribution", "modified_distribution_method"),
+    "network_simplex": ("network_simplex.network_simplex", "network_simplex_method"),
+    "auction": ("auction.auction", "auction_method"),
+    "assignment": ("assignment.assignment", "assignment_method"),
+}
+
+# Nombres que muestra la interfaz gráfica
+METHOD_LABELS = {
+    "northwest_corner": "Esquina Noroeste",
+    "vogel": "Vogel",
+    "minimum_cost": "Costo Mínimo",
+    "sequential_steps": "Pasos Secuenciales",
+    "modified_distribution": "Distribución Modificada",
+    "network_simplex": "Simplex de Red",
+    "auction": "Subasta",
+    "assignment": "Asignación (Húngaro)",
+}
+
+# Heurísticas que se resuelven al pulsar "Resolver" en la interfaz gráfica
+HEURISTIC_METHODS = ("northwest_corner", "vogel", "minimum_cost", "sequential_steps")
+
+# Métodos exactos: con una instancia de asignación (ver is_assignment_instance)
+# solve_method usa en su lugar el método "assignment", que da el mismo costo óptimo
+EXACT_METHODS = ("modified_distribution", "network_simplex")
+# Una instancia se expande a asignación si la oferta total no pasa de este
+# múltiplo del número de proveedores o consumidores (el mayor)
+ASSIGNMENT_MAX_EXPANSION = 2
+
+# Tolerancia relativa del balance cuando hay cantidades fraccionarias
+BALANCE_TOLERANCE = 1e-9
+
+_loaded_methods = {}
+
+def get_method(method):
+    """Retorna la función del método con el identificador dado, importándola si hace falta."""
+    function = _loaded_methods.get(method)
+    if function is None:
+        if method not in METHODS:
+            raise ValueError(f"Método desconocido: {method}")
+        module_name, function_name = METHODS[method]
+        function = getattr(importlib.import_module(module_name), function_name)
+        _loaded_methods[method] = function
+    return function
+
+def is_assignment_instance(supply, demand):
+    """
+    Indica si una instancia balanceada es un problema de asignación o se expande
+    a uno barato: ofertas y demandas enteras no negativas con una oferta total de
+    a lo sumo ASSIGNMENT_MAX_EXPANSION veces max(m, n) (todas iguales a 1 en el
+    caso de conductores y cargas).
+    """
+    if not all(isinstance(x, int) and x >= 0 for x in supply):
+        return False
+    if not all(isinstance(x, int) and x >= 0 for x in demand):
+        return False
+    total = sum(supply)
+    return 0 < total == sum(demand) and total <= ASSIGNMENT_MAX_EXPANSION * max(len(supply), len(demand))
+
+def dispatch_method(method, supply, demand):
+    """
+    Identificador del método que resuelve method en la instancia balanceada:
+    "assignment" si method es exacto y la instancia es de asignación, o el propio
+    method. La función se obtiene con get_method.
+    """
+    if method in EXACT_METHODS and is_assignment_instance(supply, demand):
+        return "assignment"
+    return method
+
+def calculate_cost(allocations, costs):
+    if isinstance(allocations, TransportSolution):
+        return allocations.total_cost(costs)
+    total = 0
+    for ((i, j), alloc) in allocations:
+        total += alloc * costs[i][j]
+    return total
+
+def index_to_letter(index):
+    if index < 26:
+        return string.ascii_uppercase[index]
+    else:
+        # Para índices >=26, usar letras dobles como AA, AB, etc. (y triples desde ZZ)
+        return index_to_letter(index // 26 - 1) + string.ascii_uppercase[index % 26]
+
+def parse_number(text):
+    """
+    Convierte texto a int si representa un entero exacto ("12", "12.0", "1e3") o a
+    float en otro caso. El texto se lee en decimal exacto, sin pasar por float.
+    """
+    text = text.strip()
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    value = Fraction(text)
+    if value.denominator == 1:
+        return int(value)
+    return float(value)
+
+def parse_cost(text):
+    """Convierte el texto de una celda de costo; vacío o "-" es una ruta prohibida (None)."""
+    text = text.strip()
+    if text in ("", "-"):
+        return None
+    return parse_number(text)
+
+def as_integer_array(values):
+    """
+    Retorna array('q') (int64 contiguo) con values si todos son enteros exactos
+    representables en 64 bits, o None si alguno es fraccionario.
+    """
+    result = array('q')
+    try:
+        for value in values:
+            if isinstance(value, float):
+                if not value.is_integer():
+                    return None
+                value = int(value)
+            elif not isinstance(value, int):
+                return None
+            result.append(value)
+    except OverflowError:
+        return None
+    return result
+
+def prepare_instance(costs, supply, demand):
+    """
+    Modo entero exacto: si la oferta y la demanda son enteras (también 5.0) se
+    convierten en listas de int, de modo que las restas y las pruebas de
+    agotamiento de los métodos son exactas y las asignaciones salen enteras. Las
+    filas de una matriz densa de costos enteros se guardan como array('q'), que
+    ocupa 8 bytes por costo y es lo que batch_solve comparte entre procesos; los
+    métodos las leen celda por celda como int. Las cantidades fraccionarias se
+    conservan como float (camino de punto flotante).
+    Retorna (costs, supply, demand).
+    """
+    integer_supply = as_integer_array(supply)
+    integer_demand = as_integer_array(demand)
+    if integer_supply is not None and integer_demand is not None:
+        supply, demand = integer_supply.tolist(), integer_demand.tolist()
+    if isinstance(costs, list):
+        integer_rows = []
+        for row in costs:
+            integer_row = as_integer_array(row)
+            if integer_row is None:
+                break
+            integer_rows.append(integer_row)
+        else:
+            costs = integer_rows
+    return costs, supply, demand
+
+def is_balanced(supply, demand):
+    """
+    Compara la oferta y la demanda totales: exactamente si todas las cantidades son
+    enteras y, si no, con math.fsum y una tolerancia relativa BALANCE_TOLERANCE.
+    """
+    if all(isinstance(x, int) for x in supply) and all(isinstance(x, int) for x in demand):
+        return sum(supply) == sum(demand)
+    return math.isclose(math.fsum(supply), math.fsum(demand),
+                        rel_tol=BALANCE_TOLERANCE, abs_tol=BALANCE_TOLERANCE)
+
+def build_costs(rows):
+    """
+    Retorna la matriz de costos tal cual si todas las rutas están permitidas, o una
+    SparseCosts si alguna celda es None (ruta prohibida).
+    """
+    if any(c is None for row in rows for c in row):
+        from cost_matrix.cost_matrix import SparseCosts
+        return SparseCosts.from_dense(rows)
+    return rows
+
+def balance_instance(costs, supply, demand, shortage_costs=None, surplus_costs=None):
+    """
+    Balancea una instancia con un nodo ficticio virtual (ver cost_matrix.with_dummy).
+
+    Si la demanda supera a la oferta se agrega un origen ficticio con la diferencia;
+    su costo hacia el consumidor j es shortage_costs[j] (0 por defecto), el costo de
+    dejar demanda insatisfecha. Si la oferta supera a la demanda se agrega un destino
+    ficticio; surplus_costs[i] (0 por defecto) es el costo de la oferta sin usar.
+
+    Retorna (costs, supply, demand, dummy), con dummy None si ya estaba balanceada,
+    "row" (origen ficticio) o "column" (destino ficticio).
+    """
+    if is_balanced(supply, demand):
+        return costs, supply, demand, None
+    from cost_matrix.cost_matrix import with_dummy
+    if all(isinstance(x, int) for x in supply) and all(isinstance(x, int) for x in demand):
+        difference = sum(demand) - sum(supply)
+    else:
+        difference = math.fsum(demand) - math.fsum(supply)
+    if difference > 0:
+        penalties = list(shortage_costs) if shortage_costs is not None else [0] * len(demand)
+        return with_dummy(costs, "row", penalties), list(supply) + [difference], list(demand), "row"
+    penalties = list(surplus_costs) if surplus_costs is not None else [0] * len(supply)
+    return with_dummy(costs, "column", penalties), list(supply), list(demand) + [-difference], "column"
+
+def split_dummy(allocations, dummy, num_supply, num_demand):
+    """
+    Separa las asignaciones del nodo ficticio. Retorna (asignaciones reales,
+    demanda insatisfecha por consumidor, oferta sin usar por proveedor).
+    """
+    unmet_demand = [0] * num_demand
+    unused_supply = [0] * num_supply
+    if dummy is None:
+        return allocations, unmet_demand, unused_supply
+    real = TransportSolution(num_supply, num_demand, all(isinstance(alloc, int) for _, alloc in allocations))
+    for ((i, j), alloc) in allocations:
+        if i == num_supply:
+            unmet_demand[j] += alloc
+        elif j == num_demand:
+            unused_supply[i] += alloc
+        else:
+            real.append(i, j, alloc)
+    return real, unmet_demand, unused_supply
+
+def solve_method(method, costs, supply, demand, shortage_costs=None, surplus_costs=None):
+    """
+    Ejecuta un método por su identificador. Las instancias no balanceadas se
+    resuelven con un nodo ficticio (ver balance_instance) y los métodos exactos
+    resuelven las instancias de asignación con el método húngaro (ver dispatch_method).
+    Retorna un diccionario con "alloc" y "cost" (solo rutas reales),
+    "unmet_demand" y "unused_supply" (por nodo) y "penalty_cost".
+    """
+    num_supply, num_demand = len(supply), len(demand)
+    costs, supply, demand, dummy = balance_instance(costs, supply, demand, shortage_costs, surplus_costs)
+    alloc = get_method(dispatch_method(method, supply, demand))(costs, list(supply), list(demand))
+    return solution_result(alloc, costs, dummy, num_supply, num_demand, shortage_costs, surplus_costs)
+
+def solution_result(alloc, costs, dummy, num_supply, num_demand, shortage_costs=None, surplus_costs=None):
+    """
+    Resultado de solve_method a partir de las asignaciones de la instancia
+    balanceada (costs y dummy como los retorna balance_instance).
+    """
+    alloc, unmet_demand, unused_supply = split_dummy(alloc, dummy, num_supply, num_demand)
+    penalty_cost = 0
+    if dummy == "row" and shortage_costs is not None:
+        penalty_cost = sum(q * c for q, c in zip(unmet_demand, shortage_costs))
+    elif dummy == "column" and surplus_costs is not None:
+        penalty_cost = sum(q * c for q, c in zip(unused_supply, surplus_costs))
+    return {
+        "alloc": alloc,
+        "cost": calculate_cost(alloc, costs),
+        "unmet_demand": unmet_demand,
+        "unused_supply": unused_supply,
+        "penalty_cost": penalty_cost,
+    }
+
+def solve_methods(methods, costs, supply, demand, shortage_costs=None, surplus_costs=None):
+    """Ejecuta varios métodos sobre la misma instancia. Retorna {método: resultado}."""
+    return {
+        method: solve_method(method, costs, supply, demand, shortage_costs, surplus_costs)
+        for method in methods
+    }
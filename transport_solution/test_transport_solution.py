@@ -0,0 +1,54 @@
+# transport_solution/test_transport_solution.py
+
+import pickle
+
+from transport_solution.transport_solution import TransportSolution
+
+ALLOCATIONS = [((0, 0), 4), ((0, 2), 3), ((1, 1), 5), ((1, 2), 1)]
+COSTS = [[4, 6, 9], [5, 3, 8]]
+
+
+def test_append_and_iteration_match_the_tuple_list():
+    solution = TransportSolution(2, 3, integral=True)
+    for ((i, j), alloc) in ALLOCATIONS:
+        solution.append(i, j, alloc)
+    assert len(solution) == len(ALLOCATIONS)
+    assert list(solution) == ALLOCATIONS
+    assert solution[1] == ALLOCATIONS[1]
+    assert solution[1:3] == ALLOCATIONS[1:3]
+    assert solution == ALLOCATIONS
+    assert solution == TransportSolution.from_allocations(ALLOCATIONS, 2, 3)
+
+
+def test_total_cost_and_totals():
+    solution = TransportSolution.from_allocations(ALLOCATIONS, 2, 3)
+    assert solution.total_cost(COSTS) == 4 * 4 + 3 * 9 + 5 * 3 + 1 * 8
+    assert solution.row_totals() == [7, 6]
+    assert solution.col_totals() == [4, 5, 4]
+    assert solution.to_dense() == [[4, 0, 3], [0, 5, 1]]
+
+
+def test_for_quantities_picks_the_typecode():
+    assert TransportSolution.for_quantities([3, 2], [4, 1]).quantities.typecode == 'q'
+    assert TransportSolution.for_quantities([3, 2.5], [4, 1.5]).quantities.typecode == 'd'
+    assert TransportSolution.from_allocations(ALLOCATIONS, 2, 3).quantities.typecode == 'q'
+    fractional = TransportSolution.from_allocations([((0, 0), 1.5)], 1, 1)
+    assert fractional.quantities.typecode == 'd'
+    assert fractional.total_cost([[2]]) == 3.0
+
+
+def test_integer_and_float_solutions_compare_by_value():
+    integral = TransportSolution.from_allocations(ALLOCATIONS, 2, 3)
+    real = TransportSolution(2, 3)
+    for ((i, j), alloc) in ALLOCATIONS:
+        real.append(i, j, float(alloc))
+    assert integral == real
+    real.append(1, 0, 0.5)
+    assert integral != real
+
+
+def test_pickle_round_trip():
+    solution = TransportSolution.from_allocations(ALLOCATIONS, 2, 3)
+    restored = pickle.loads(pickle.dumps(solution))
+    assert restored == solution
+    assert (restored.num_supply, restored.num_demand) == (2, 3)
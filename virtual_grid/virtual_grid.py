@@ -0,0 +1,283 @@
+# virtual_grid/virtual_grid.py
+
+import tkinter as tk
+from tkinter import ttk
+
+from table_io.table_io import parse_delimited
+from transport_core.transport_core import index_to_letter
+
+
+class VirtualGrid(ttk.Frame):
+    """
+    Tabla editable de costos, oferta y demanda que solo dibuja las celdas visibles.
+
+    Los valores viven en self.cells, una matriz de textos de (proveedores + 1) filas
+    por (consumidores + 1) columnas: la última columna es la oferta y la última
+    fila la demanda. Las celdas se dibujan en un Canvas y un único Entry se
+    superpone a la celda en edición, así que el número de widgets no depende del
+    tamaño de la instancia.
+
+    Teclado: flechas, Tab y Enter mueven la selección; escribir o doble clic
+    editan la celda; Supr la vacía; Ctrl+V pega un bloque copiado de una hoja de
+    cálculo a partir de la celda seleccionada (la tabla crece si hace falta).
+    """
+    CELL_WIDTH = 80
+    CELL_HEIGHT = 24
+    HEADER_WIDTH = 90
+
+    def __init__(self, container, num_supply, num_demand, width=800, height=360):
+        super().__init__(container)
+        self.canvas = tk.Canvas(self, width=width, height=height, background="white",
+                                highlightthickness=1, takefocus=1)
+        self.vbar = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.hbar = ttk.Scrollbar(self, orient="horizontal", command=self.xview)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.vbar.grid(row=0, column=1, sticky="ns")
+        self.hbar.grid(row=1, column=0, sticky="ew")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+
+        self.top = 0  # Primera fila visible
+        self.left = 0  # Primera columna visible
+        self.selected = (0, 0)
+        self.editor = None  # (Entry, fila, columna) de la celda en edición
+        self.cells = [[""]]
+        self.num_supply = 0
+        self.num_demand = 0
+        self.set_table([[""] * num_demand for _ in range(num_supply)], [""] * num_supply, [""] * num_demand)
+
+        canvas = self.canvas
+        canvas.bind("<Configure>", lambda event: self.redraw())
+        canvas.bind("<Button-1>", self._on_click)
+        canvas.bind("<Double-Button-1>", lambda event: self.edit(*self.selected))
+        canvas.bind("<Key>", self._on_key)
+        canvas.bind("<Control-v>", self._on_paste)
+        canvas.bind("<Command-v>", self._on_paste)
+        canvas.bind("<MouseWheel>", self._on_mousewheel)
+        canvas.bind("<Shift-MouseWheel>", self._on_shift_mousewheel)
+        canvas.bind("<Button-4>", lambda event: self.yview("scroll", -1, "units"))
+        canvas.bind("<Button-5>", lambda event: self.yview("scroll", 1, "units"))
+
+    # Datos
+
+    def set_table(self, cost_rows, supply, demand):
+        """Reemplaza todo el contenido (textos) y redimensiona la tabla."""
+        self.finish_edit()
+        self.num_supply = len(supply)
+        self.num_demand = len(demand)
+        self.cells = [list(row) + [s] for row, s in zip(cost_rows, supply)]
+        self.cells.append(list(demand) + [""])
+        self.top = min(self.top, self.num_supply)
+        self.left = min(self.left, self.num_demand)
+        i, j = self.selected
+        self.selected = (min(i, self.num_supply), min(j, self.num_demand))
+        self.redraw()
+
+    def resize(self, num_supply, num_demand):
+        """Cambia las dimensiones conservando los costos, ofertas y demandas que sigan dentro."""
+        def fit(values, size):
+            return list(values[:size]) + [""] * (size - len(values))
+
+        cost_rows = [fit(row, num_demand) for row in self.cost_rows()[:num_supply]]
+        cost_rows += [[""] * num_demand for _ in range(num_supply - len(cost_rows))]
+        self.set_table(cost_rows, fit(self.supply(), num_supply), fit(self.demand(), num_demand))
+
+    def cost_rows(self):
+        n = self.num_demand
+        return [row[:n] for row in self.cells[:self.num_supply]]
+
+    def supply(self):
+        n = self.num_demand
+        return [row[n] for row in self.cells[:self.num_supply]]
+
+    def demand(self):
+        return self.cells[self.num_supply][:self.num_demand]
+
+    def paste(self, text):
+        """Pega un bloque de texto tabular a partir de la celda seleccionada."""
+        block = parse_delimited(text)
+        if not block:
+            return
+        i0, j0 = self.selected
+        rows = max(self.num_supply + 1, i0 + len(block))
+        cols = max(self.num_demand + 1, j0 + max(len(row) for row in block))
+        if (rows, cols) != (self.num_supply + 1, self.num_demand + 1):
+            self.resize(rows - 1, cols - 1)
+        for di, row in enumerate(block):
+            target = self.cells[i0 + di]
+            target[j0:j0 + len(row)] = row
+        self.redraw()
+        self.event_generate("<<GridResized>>")
+
+    # Dibujo y desplazamiento
+
+    def _visible(self):
+        width = max(self.canvas.winfo_width(), 1)
+        height = max(self.canvas.winfo_height(), 1)
+        rows = max(1, (height - self.CELL_HEIGHT) // self.CELL_HEIGHT)
+        cols = max(1, (width - self.HEADER_WIDTH) // self.CELL_WIDTH)
+        return rows, cols
+
+    def redraw(self):
+        canvas = self.canvas
+        canvas.delete("grid")
+        total_rows, total_cols = self.num_supply + 1, self.num_demand + 1
+        visible_rows, visible_cols = self._visible()
+        last_row = min(total_rows, self.top + visible_rows + 1)
+        last_col = min(total_cols, self.left + visible_cols + 1)
+        w, h, hw = self.CELL_WIDTH, self.CELL_HEIGHT, self.HEADER_WIDTH
+
+        for j in range(self.left, last_col):
+            x = hw + (j - self.left) * w
+            label = "Oferta" if j == self.num_demand else index_to_letter(j)
+            canvas.create_rectangle(x, 0, x + w, h, fill="#e8e8e8", outline="#b0b0b0", tags="grid")
+            canvas.create_text(x + w / 2, h / 2, text=label, tags="grid")
+        for i in range(self.top, last_row):
+            y = h + (i - self.top) * h
+            label = "Demanda" if i == self.num_supply else index_to_letter(i)
+            canvas.create_rectangle(0, y, hw, y + h, fill="#e8e8e8", outline="#b0b0b0", tags="grid")
+            canvas.create_text(6, y + h / 2, text=label, anchor="w", tags="grid")
+            row = self.cells[i]
+            for j in range(self.left, last_col):
+                x = hw + (j - self.left) * w
+                if i == self.num_supply and j == self.num_demand:
+                    fill = "#d0d0d0"
+                elif i == self.num_supply or j == self.num_demand:
+                    fill = "#f4f4f4"
+                else:
+                    fill = "white"
+                canvas.create_rectangle(x, y, x + w, y + h, fill=fill, outline="#d0d0d0", tags="grid")
+                if row[j]:
+                    canvas.create_text(x + w - 4, y + h / 2, text=row[j], anchor="e", tags="grid")
+        i, j = self.selected
+        if self.top <= i < last_row and self.left <= j < last_col:
+            x = hw + (j - self.left) * w
+            y = h + (i - self.top) * h
+            canvas.create_rectangle(x, y, x + w, y + h, outline="#1f6fd1", width=2, tags="grid")
+        canvas.tag_raise("editor")
+
+        self.vbar.set(self.top / total_rows, min(1.0, (self.top + visible_rows) / total_rows))
+        self.hbar.set(self.left / total_cols, min(1.0, (self.left + visible_cols) / total_cols))
+
+    def yview(self, *args):
+        self._scroll("top", self.num_supply + 1, self._visible()[0], args)
+
+    def xview(self, *args):
+        self._scroll("left", self.num_demand + 1, self._visible()[1], args)
+
+    def _scroll(self, attribute, total, visible, args):
+        self.finish_edit()
+        position = getattr(self, attribute)
+        if args[0] == "moveto":
+            position = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            position += amount * visible if args[2] == "pages" else amount
+        setattr(self, attribute, max(0, min(position, total - visible)))
+        self.redraw()
+
+    def _on_mousewheel(self, event):
+        delta = event.delta if abs(event.delta) < 120 else event.delta // 120
+        self.yview("scroll", -delta, "units")
+
+    def _on_shift_mousewheel(self, event):
+        delta = event.delta if abs(event.delta) < 120 else event.delta // 120
+        self.xview("scroll", -delta, "units")
+
+    def _ensure_visible(self, i, j):
+        visible_rows, visible_cols = self._visible()
+        if i < self.top:
+            self.top = i
+        elif i >= self.top + visible_rows:
+            self.top = i - visible_rows + 1
+        if j < self.left:
+            self.left = j
+        elif j >= self.left + visible_cols:
+            self.left = j - visible_cols + 1
+
+    # Selección y edición
+
+    def select(self, i, j):
+        i = max(0, min(i, self.num_supply))
+        j = max(0, min(j, self.num_demand))
+        if (i, j) == (self.num_supply, self.num_demand):
+            # La esquina oferta/demanda no es editable
+            return
+        self.finish_edit()
+        self.selected = (i, j)
+        self._ensure_visible(i, j)
+        self.redraw()
+
+    def _on_click(self, event):
+        self.canvas.focus_set()
+        if event.x < self.HEADER_WIDTH or event.y < self.CELL_HEIGHT:
+            return
+        i = self.top + (event.y - self.CELL_HEIGHT) // self.CELL_HEIGHT
+        j = self.left + (event.x - self.HEADER_WIDTH) // self.CELL_WIDTH
+        if i <= self.num_supply and j <= self.num_demand:
+            self.select(i, j)
+
+    def _on_key(self, event):
+        i, j = self.selected
+        moves = {"Up": (-1, 0), "Down": (1, 0), "Left": (0, -1), "Right": (0, 1),
+                 "Return": (1, 0), "Tab": (0, 1)}
+        if event.keysym in moves:
+            di, dj = moves[event.keysym]
+            self.select(i + di, j + dj)
+            return "break"
+        if event.keysym in ("Delete", "BackSpace"):
+            self.cells[i][j] = ""
+            self.redraw()
+            return "break"
+        if event.char and event.char.isprintable() and not event.state & 0x4:
+            self.edit(i, j, event.char)
+            return "break"
+
+    def _on_paste(self, event):
+        try:
+            text = self.clipboard_get()
+        except tk.TclError:
+            return "break"
+        self.paste(text)
+        return "break"
+
+    def edit(self, i, j, text=None):
+        """Abre el editor sobre la celda (i, j); text reemplaza el contenido actual."""
+        self.select(i, j)
+        if self.selected != (i, j):
+            return
+        self.redraw()
+        entry = ttk.Entry(self.canvas)
+        entry.insert(0, self.cells[i][j] if text is None else text)
+        x = self.HEADER_WIDTH + (j - self.left) * self.CELL_WIDTH
+        y = self.CELL_HEIGHT + (i - self.top) * self.CELL_HEIGHT
+        self.canvas.create_window(x, y, anchor="nw", width=self.CELL_WIDTH, height=self.CELL_HEIGHT,
+                                  window=entry, tags="editor")
+        self.editor = (entry, i, j)
+        entry.bind("<Return>", lambda event: self._move_after_edit(1, 0))
+        entry.bind("<Tab>", lambda event: self._move_after_edit(0, 1))
+        entry.bind("<Escape>", lambda event: self.finish_edit(save=False))
+        entry.bind("<FocusOut>", lambda event: self.finish_edit())
+        entry.focus_set()
+        entry.icursor(tk.END)
+
+    def _move_after_edit(self, di, dj):
+        i, j = self.selected
+        self.finish_edit()
+        self.select(i + di, j + dj)
+        self.canvas.focus_set()
+        return "break"
+
+    def finish_edit(self, save=True):
+        """Guarda (o descarta) la celda en edición, si la hay."""
+        if self.editor is None:
+            return
+        entry, i, j = self.editor
+        self.editor = None
+        if save:
+            self.cells[i][j] = entry.get().strip()
+        self.canvas.delete("editor")
+        entry.destroy()
+        self.redraw()
+        if not save:
+            self.canvas.focus_set()
@@ -0,0 +1,97 @@
+# vogel_approximation/test_vogel_approximation.py
+
+import math
+import random
+
+import pytest
+
+from benchmarks.instance_generators import small_instance
+from cost_matrix.cost_matrix import LazyCosts, MappedCosts, write_mapped_costs
+from transport_core.transport_core import prepare_instance
+from vogel_approximation.vogel_approximation import vogel_approximation_method
+
+
+def reference_vogel(costs, supply, demand):
+    """
+    El método de Vogel original, que recalculaba todas las penalizaciones en cada
+    paso. La única diferencia conocida: cuando a una línea ya no le quedaban
+    celdas cruzadas sin cubrir agregaba una asignación nula con índice -1, que
+    aquí se omite.
+    """
+    supply, demand = supply.copy(), demand.copy()
+    rows, cols = len(supply), len(demand)
+    row_covered, col_covered = [False] * rows, [False] * cols
+    allocations = []
+
+    def penalty(values):
+        values = sorted(values)
+        if len(values) >= 2:
+            return values[1] - values[0]
+        return values[0] if values else 0
+
+    while True:
+        row_penalties = [(penalty([costs[i][j] for j in range(cols) if not col_covered[j]]), i)
+                         for i in range(rows) if not row_covered[i]]
+        col_penalties = [(penalty([costs[i][j] for i in range(rows) if not row_covered[i]]), j)
+                         for j in range(cols) if not col_covered[j]]
+        if not row_penalties and not col_penalties:
+            return allocations
+        max_row = max(row_penalties, key=lambda x: x[0], default=None)
+        max_col = max(col_penalties, key=lambda x: x[0], default=None)
+        if max_col is None or (max_row is not None and max_row[0] >= max_col[0]):
+            i = max_row[1]
+            j = min((j for j in range(cols) if not col_covered[j]), key=lambda j: costs[i][j], default=-1)
+        else:
+            j = max_col[1]
+            i = min((i for i in range(rows) if not row_covered[i]), key=lambda i: costs[i][j], default=-1)
+        alloc = min(supply[i], demand[j])
+        if i >= 0 and j >= 0:
+            allocations.append(((i, j), alloc))
+        supply[i] -= alloc
+        demand[j] -= alloc
+        if supply[i] == 0:
+            row_covered[i] = True
+        if demand[j] == 0:
+            col_covered[j] = True
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_reference(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        costs, supply, demand = small_instance(rng, max_size=7, max_cost=rng.choice([3, 9, 100]))
+        expected = reference_vogel(costs, supply, demand)
+        assert list(vogel_approximation_method(costs, supply, demand)) == expected
+        # Modo entero: filas array y cantidades enteras
+        rows, supply, demand = prepare_instance(costs, supply, demand)
+        assert list(vogel_approximation_method(rows, list(supply), list(demand))) == expected
+
+
+def test_scanning_variant_matches_reference(tmp_path):
+    rng = random.Random(12)
+    for k in range(50):
+        costs, supply, demand = small_instance(rng, max_size=7, max_cost=9)
+        path = str(tmp_path / f"costs{k}.bin")
+        write_mapped_costs(path, costs, "q")
+        with MappedCosts(path) as mapped:
+            assert list(vogel_approximation_method(mapped, supply, demand)) == reference_vogel(costs, supply, demand)
+
+
+@pytest.mark.parametrize("column_function", (True, False))
+def test_lazy_costs_match_dense(column_function):
+    rng = random.Random(4)
+    sources = [(rng.random(), rng.random()) for _ in range(40)]
+    destinations = [(rng.random(), rng.random()) for _ in range(30)]
+    supply = [rng.randint(1, 20) for _ in sources]
+    demand = [0] * len(destinations)
+    for _ in range(sum(supply)):
+        demand[rng.randrange(len(demand))] += 1
+    costs = LazyCosts.from_coordinates(sources, destinations)
+    if not column_function:
+        costs.column_function = None
+    dense = [[math.dist(p, q) for q in destinations] for p in sources]
+    expected = list(vogel_approximation_method(dense, supply, demand))
+    assert list(vogel_approximation_method(costs, supply, demand)) == expected
+    if column_function:
+        # Las columnas se leen en bloque: ninguna celda suelta desde las filas
+        assert costs.cache_info()["hits"] < 2 * (len(sources) + len(destinations))
@@ -1,93 +1,277 @@
 # vogel_approximation.py
 
-import copy
+import heapq
+
+from cost_matrix.cost_matrix import SparseCosts, complete_allocations
+from instrumentation.instrumentation import record_counters
+from transport_solution.transport_solution import TransportSolution
 
 def vogel_approximation_method(costs, supply, demand):
+    """
+    Método de Aproximación de Vogel con penalizaciones incrementales.
+
+    Cada fila y columna ordena sus costos una sola vez y mantiene dos punteros a
+    sus dos costos mínimos no cubiertos. Al cubrir una fila o columna solo se
+    recalculan las líneas cuyo par mínimo la incluía, y la máxima penalización
+    se obtiene de una cola de prioridad. Los desempates son los del método
+    clásico: gana la fila frente a la columna, el índice menor entre líneas y
+    la celda de índice menor entre costos iguales.
+
+    Con una matriz SparseCosts cada línea solo contiene sus rutas permitidas.
+    Con una matriz en disco (MappedCosts) las líneas no se ordenan: sus dos
+    mínimos se recalculan leyendo la matriz por filas (ver _ScanningLines).
+    """
     supply = supply.copy()
     demand = demand.copy()
-    costs = copy.deepcopy(costs)
-    allocations = []
+    allocations = TransportSolution.for_quantities(supply, demand)
     rows = len(supply)
     cols = len(demand)
-    row_covered = [False] * rows
-    col_covered = [False] * cols
-
-    while True:
-        # Calcular penalizaciones para filas
-        row_penalties = []
-        for i in range(rows):
-            if not row_covered[i]:
-                sorted_costs = sorted([costs[i][j] for j in range(cols) if not col_covered[j]])
-                if len(sorted_costs) >= 2:
-                    penalty = sorted_costs[1] - sorted_costs[0]
-                elif len(sorted_costs) == 1:
-                    penalty = sorted_costs[0]
-                else:
-                    penalty = 0
-                row_penalties.append((penalty, i))
-        # Calcular penalizaciones para columnas
-        col_penalties = []
-        for j in range(cols):
-            if not col_covered[j]:
-                sorted_costs = sorted([costs[i][j] for i in range(rows) if not row_covered[i]])
-                if len(sorted_costs) >= 2:
-                    penalty = sorted_costs[1] - sorted_costs[0]
-                elif len(sorted_costs) == 1:
-                    penalty = sorted_costs[0]
-                else:
-                    penalty = 0
-                col_penalties.append((penalty, j))
-        if not row_penalties and not col_penalties:
-            break
-        # Encontrar la máxima penalización
-        if row_penalties and col_penalties:
-            max_row = max(row_penalties, key=lambda x: x[0])
-            max_col = max(col_penalties, key=lambda x: x[0])
-            if max_row[0] >= max_col[0]:
-                penalty, row = max_row
-                # Encontrar la columna con el costo mínimo en esta fila
-                min_cost = float('inf')
-                min_col = -1
-                for j in range(cols):
-                    if not col_covered[j] and costs[row][j] < min_cost:
-                        min_cost = costs[row][j]
-                        min_col = j
-                selected = (row, min_col)
-            else:
-                penalty, col = max_col
-                # Encontrar la fila con el costo mínimo en esta columna
-                min_cost = float('inf')
-                min_row = -1
-                for i in range(rows):
-                    if not row_covered[i] and costs[i][col] < min_cost:
-                        min_cost = costs[i][col]
-                        min_row = i
-                selected = (min_row, col)
-        elif row_penalties:
-            penalty, row = max(row_penalties, key=lambda x: x[0])
-            min_cost = float('inf')
-            min_col = -1
-            for j in range(cols):
-                if not col_covered[j] and costs[row][j] < min_cost:
-                    min_cost = costs[row][j]
-                    min_col = j
-            selected = (row, min_col)
+
+    heap = []
+    if getattr(costs, "out_of_core", False):
+        # Matriz en disco: sin órdenes precalculados, memoria O(m + n)
+        row_lines = _ScanningLines(costs, heap, 0, rows, cols)
+        col_lines = _ScanningLines(costs, heap, 1, cols, rows)
+    else:
+        if isinstance(costs, SparseCosts):
+            row_entries = [costs.row(i) for i in range(rows)]
+            col_entries = [costs.column(j) for j in range(cols)]
+        else:
+            row_entries = [(range(cols), row) for row in costs]
+            col_entries = [(range(rows), column) for column in zip(*costs)]
+        row_lines = _PenaltyLines(row_entries, heap, 0, cols)
+        col_lines = _PenaltyLines(col_entries, heap, 1, rows)
+    row_lines.init(col_lines.covered)
+    col_lines.init(row_lines.covered)
+
+    iterations = 0
+    while heap:
+        neg_penalty, kind, k = heap[0]
+        if kind == 0:
+            lines, crossing = row_lines, col_lines
         else:
-            penalty, col = max(col_penalties, key=lambda x: x[0])
-            min_cost = float('inf')
-            min_row = -1
-            for i in range(rows):
-                if not row_covered[i] and costs[i][col] < min_cost:
-                    min_cost = costs[i][col]
-                    min_row = i
-            selected = (min_row, col)
-        i, j = selected
+            lines, crossing = col_lines, row_lines
+        if lines.covered[k] or lines.penalty[k] != -neg_penalty:
+            heapq.heappop(heap)  # Entrada obsoleta
+            continue
+
+        other = lines.cheapest(k)
+        if other is None:
+            # No quedan celdas en esta línea (oferta y demanda no balanceadas)
+            lines.cover(k, crossing)
+            continue
+        i, j = (k, other) if kind == 0 else (other, k)
+
+        iterations += 1
         alloc = min(supply[i], demand[j])
-        allocations.append(((i, j), alloc))
+        allocations.append(i, j, alloc)
         supply[i] -= alloc
         demand[j] -= alloc
         if supply[i] == 0:
-            row_covered[i] = True
+            row_lines.cover(i, col_lines)
         if demand[j] == 0:
-            col_covered[j] = True
-    return allocations
+            col_lines.cover(j, row_lines)
+    record_counters(iterations=iterations, cells_examined=row_lines.examined + col_lines.examined)
+    # Si las rutas prohibidas bloquearon el recorrido se completa con caminos de aumento
+    return complete_allocations(costs, allocations, supply, demand)
+
+class _PenaltyLines:
+    """
+    Filas (kind 0) o columnas (kind 1) con sus dos costos mínimos no cubiertos.
+
+    first[k] y second[k] son punteros a order[k], la lista de índices de la
+    dimensión cruzada ordenada por (costo, índice), y sorted_costs[k] guarda los
+    costos en ese mismo orden. Los punteros solo avanzan, así que el
+    trabajo total de mantenimiento es O(m·n). watchers[x] lista las líneas cuyo
+    par mínimo apuntó alguna vez a x en la dimensión cruzada.
+    """
+    def __init__(self, entries, heap, kind, size_other):
+        self.heap = heap
+        self.kind = kind
+        self.order = []
+        self.sorted_costs = []
+        self.examined = 0  # Celdas leídas al ordenar las líneas
+        for indices, values in entries:
+            self.examined += len(values)
+            # Orden estable: a igual costo queda primero el índice menor
+            positions = sorted(range(len(values)), key=values.__getitem__)
+            if isinstance(indices, range):
+                self.order.append(positions)
+            else:
+                self.order.append(list(map(indices.__getitem__, positions)))
+            self.sorted_costs.append(list(map(values.__getitem__, positions)))
+        count = len(entries)
+        self.covered = [False] * count
+        self.first = [0] * count
+        self.second = [1] * count
+        self.penalty = [None] * count
+        self.watchers = [[] for _ in range(size_other)]
+
+    def init(self, crossing_covered):
+        """Enlaza las marcas de cobertura de la dimensión cruzada y calcula las penalizaciones iniciales."""
+        self.crossing_covered = crossing_covered
+        for k in range(len(self.order)):
+            self.refresh(k)
+
+    def refresh(self, k):
+        order = self.order[k]
+        size = len(order)
+        crossing_covered = self.crossing_covered
+        first = self.first[k]
+        while first < size and crossing_covered[order[first]]:
+            first += 1
+        second = max(self.second[k], first + 1)
+        while second < size and crossing_covered[order[second]]:
+            second += 1
+        if first != self.first[k] or self.penalty[k] is None:
+            if first < size:
+                self.watchers[order[first]].append(k)
+        if second != self.second[k] or self.penalty[k] is None:
+            if second < size:
+                self.watchers[order[second]].append(k)
+        self.first[k] = first
+        self.second[k] = second
+
+        line = self.sorted_costs[k]
+        if second < size:
+            penalty = line[second] - line[first]
+        elif first < size:
+            penalty = line[first]
+        else:
+            penalty = 0
+        if penalty != self.penalty[k]:
+            self.penalty[k] = penalty
+            heapq.heappush(self.heap, (-penalty, self.kind, k))
+
+    def cheapest(self, k):
+        """Índice cruzado del costo mínimo no cubierto de la línea k, o None."""
+        first = self.first[k]
+        if first < len(self.order[k]):
+            return self.order[k][first]
+        return None
+
+    def cover(self, k, crossing):
+        """Cubre la línea k y recalcula las líneas cruzadas que la tenían entre sus dos mínimos."""
+        self.covered[k] = True
+        for x in crossing.watchers[k]:
+            if not crossing.covered[x]:
+                crossing.refresh(x)
+        crossing.watchers[k] = []
+
+
+class _ScanningLines:
+    """
+    Variante de _PenaltyLines para matrices en disco, con memoria O(m + n): en
+    lugar de órdenes precalculados guarda solo los dos mínimos no cubiertos de
+    cada línea y, cuando alguno queda cubierto, los recalcula leyendo la matriz.
+    Las columnas se recalculan juntas en una sola pasada por filas, que es el
+    orden en que está guardada la matriz, salvo que la matriz las calcule en
+    bloque (LazyCosts con column_function, ver LazyCosts.column_values). Las penalizaciones y los desempates
+    son los mismos que los de _PenaltyLines.
+    """
+    def __init__(self, costs, heap, kind, count, size_other):
+        self.costs = costs
+        self.heap = heap
+        self.kind = kind
+        self.size_other = size_other
+        self.covered = [False] * count
+        self.first = [None] * count  # Índice cruzado del mínimo
+        self.second = [None] * count  # Índice cruzado del segundo mínimo
+        self.first_cost = [0] * count
+        self.second_cost = [0] * count
+        self.penalty = [None] * count
+        self.watchers = [[] for _ in range(size_other)]
+        self.examined = 0  # Celdas leídas en los recálculos
+
+    def init(self, crossing_covered):
+        """Enlaza las marcas de cobertura de la dimensión cruzada y calcula las penalizaciones iniciales."""
+        self.crossing_covered = crossing_covered
+        self.refresh_lines(range(len(self.covered)))
+
+    def refresh(self, k):
+        self.refresh_lines([k])
+
+    def refresh_lines(self, lines):
+        crossing_covered = self.crossing_covered
+        stale = []
+        for k in dict.fromkeys(lines):
+            first, second = self.first[k], self.second[k]
+            if (self.penalty[k] is None or (first is not None and crossing_covered[first])
+                    or (second is not None and crossing_covered[second])):
+                stale.append(k)
+        if not stale:
+            return
+        if self.kind == 0:
+            for k in stale:
+                self.examined += self.size_other
+                self._set_minimums(k, *_two_smallest(enumerate(self.costs[k]), crossing_covered))
+        else:
+            self._scan_columns(stale)
+
+    def _scan_columns(self, columns):
+        """Dos mínimos no cubiertos de varias columnas en una sola pasada por filas."""
+        crossing_covered = self.crossing_covered
+        if getattr(self.costs, "column_function", None) is not None:
+            # Matriz calculada a pedido (LazyCosts) con columnas en bloque: cada columna
+            # se evalúa de una vez en lugar de celda por celda desde las filas. Sin
+            # column_function las celdas de las filas en caché salen más baratas.
+            for j in columns:
+                self.examined += self.size_other
+                self._set_minimums(j, *_two_smallest(enumerate(self.costs.column_values(j)), crossing_covered))
+            return
+        best = {j: [None, 0, None, 0] for j in columns}
+        for i in range(self.size_other):
+            if crossing_covered[i]:
+                continue
+            self.examined += len(best)
+            row = self.costs[i]
+            for j, b in best.items():
+                c = row[j]
+                if b[0] is None or c < b[1]:
+                    b[2], b[3] = b[0], b[1]
+                    b[0], b[1] = i, c
+                elif b[2] is None or c < b[3]:
+                    b[2], b[3] = i, c
+        for j, b in best.items():
+            self._set_minimums(j, *b)
+
+    def _set_minimums(self, k, first, first_cost, second, second_cost):
+        if first is not None and first != self.first[k]:
+            self.watchers[first].append(k)
+        if second is not None and second != self.second[k]:
+            self.watchers[second].append(k)
+        self.first[k], self.first_cost[k] = first, first_cost
+        self.second[k], self.second_cost[k] = second, second_cost
+        if second is not None:
+            penalty = second_cost - first_cost
+        elif first is not None:
+            penalty = first_cost
+        else:
+            penalty = 0
+        if penalty != self.penalty[k]:
+            self.penalty[k] = penalty
+            heapq.heappush(self.heap, (-penalty, self.kind, k))
+
+    def cheapest(self, k):
+        """Índice cruzado del costo mínimo no cubierto de la línea k, o None."""
+        return self.first[k]
+
+    def cover(self, k, crossing):
+        """Cubre la línea k y recalcula las líneas cruzadas que la tenían entre sus dos mínimos."""
+        self.covered[k] = True
+        crossing.refresh_lines([x for x in crossing.watchers[k] if not crossing.covered[x]])
+        crossing.watchers[k] = []
+
+def _two_smallest(entries, covered):
+    """Los dos pares (índice, costo) menores por (costo, índice) entre los índices no cubiertos."""
+    first = second = None
+    first_cost = second_cost = 0
+    for x, c in entries:
+        if covered[x]:
+            continue
+        if first is None or c < first_cost:
+            second, second_cost = first, first_cost
+            first, first_cost = x, c
+        elif second is None or c < second_cost:
+            second, second_cost = x, c
+    return first, first_cost, second, second_cost